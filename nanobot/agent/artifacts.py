@@ -0,0 +1,146 @@
+"""Per-session store for large tool outputs."""
+
+import re
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir, safe_filename
+
+# Artifact IDs are generated as "<tool>-<hex>"; anything else is rejected
+_ARTIFACT_ID = re.compile(r"^[A-Za-z0-9_]+-[0-9a-f]{8}$")
+
+
+class ArtifactStore:
+    """
+    Keeps tool outputs that are too large to inline in the conversation.
+
+    A large result is written to a file under the current session's
+    directory and replaced in the transcript by a handle with a head/tail
+    preview; the model pages through the rest with the read_artifact tool.
+
+    The session is held in a context variable (set once per turn), so
+    concurrent turns each see their own artifacts.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        threshold: int = 8000,
+        preview_chars: int = 1500,
+        max_per_session: int = 50,
+    ):
+        """
+        Args:
+            root: Directory holding one subdirectory per session.
+            threshold: Results longer than this (in chars) are spilled; 0 disables.
+            preview_chars: Characters of head and of tail shown inline.
+            max_per_session: Artifacts kept per session (oldest are deleted).
+        """
+        self.root = root
+        self.threshold = threshold
+        self.preview_chars = preview_chars
+        self.max_per_session = max_per_session
+        self._session: ContextVar[str] = ContextVar("artifact_session", default="default")
+
+    def set_session(self, session_key: str) -> None:
+        """Scope artifacts of the current task to a session."""
+        self._session.set(session_key)
+
+    def spill(self, tool_name: str, result: str) -> str:
+        """
+        Store a tool result if it exceeds the threshold.
+
+        Args:
+            tool_name: Tool that produced the result.
+            result: The full tool result.
+
+        Returns:
+            The result itself if small enough, otherwise a handle with a preview.
+        """
+        if self.threshold <= 0 or len(result) <= self.threshold:
+            return result
+
+        artifact_id = f"{re.sub(r'[^A-Za-z0-9_]', '_', tool_name)}-{uuid.uuid4().hex[:8]}"
+        session_dir = ensure_dir(self.root / safe_filename(self._session.get().replace(":", "_")))
+        try:
+            (session_dir / f"{artifact_id}.txt").write_text(result, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to store artifact for {tool_name}: {e}")
+            return result
+        self._prune(session_dir)
+
+        lines = result.count("\n") + 1
+        size = len(result.encode("utf-8"))
+        head = result[:self.preview_chars]
+        tail = result[-self.preview_chars:]
+        return (
+            f"[Output too large to show in full: stored as artifact '{artifact_id}' "
+            f"({len(result)} chars, {size} bytes, {lines} lines)]\n\n"
+            f"--- head ---\n{head}\n\n"
+            f"--- tail ---\n{tail}\n\n"
+            f"Use read_artifact with id '{artifact_id}' and a line range "
+            f"(start_line/end_line) or byte range (offset/length) to read more."
+        )
+
+    def read(
+        self,
+        artifact_id: str,
+        start_line: int | None = None,
+        end_line: int | None = None,
+        offset: int | None = None,
+        length: int | None = None,
+    ) -> str:
+        """
+        Read part of an artifact of the current session.
+
+        Args:
+            artifact_id: Handle returned by ``spill``.
+            start_line: First line to return (1-based).
+            end_line: Last line to return (inclusive).
+            offset: Byte offset to start at (used if no line range is given).
+            length: Maximum bytes to return.
+
+        Returns:
+            The requested part, capped at the spill threshold, or an error message.
+        """
+        path = self._path(artifact_id)
+        if path is None or not path.is_file():
+            return f"Error: Artifact not found: {artifact_id}"
+
+        limit = self.threshold if self.threshold > 0 else None
+        if start_line is not None or end_line is not None:
+            lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+            start = max(start_line or 1, 1)
+            end = min(end_line or len(lines), len(lines))
+            if start > len(lines):
+                return f"Error: Artifact has only {len(lines)} lines"
+            text = "".join(lines[start - 1:end])
+            header = f"[{artifact_id} lines {start}-{end} of {len(lines)}]\n"
+        else:
+            data = path.read_bytes()
+            start = max(offset or 0, 0)
+            if start >= len(data) and data:
+                return f"Error: Artifact has only {len(data)} bytes"
+            end = min(start + (length or limit or len(data)), len(data))
+            text = data[start:end].decode("utf-8", errors="replace")
+            header = f"[{artifact_id} bytes {start}-{end} of {len(data)}]\n"
+
+        if limit and len(text) > limit:
+            text = text[:limit] + f"\n... (truncated to {limit} chars, request a smaller range)"
+        return header + text
+
+    def _path(self, artifact_id: str) -> Path | None:
+        """Resolve an artifact ID within the current session."""
+        if not _ARTIFACT_ID.match(artifact_id):
+            return None
+        session_dir = self.root / safe_filename(self._session.get().replace(":", "_"))
+        return session_dir / f"{artifact_id}.txt"
+
+    def _prune(self, session_dir: Path) -> None:
+        """Delete the oldest artifacts beyond the per-session limit."""
+        files = sorted(session_dir.glob("*.txt"), key=lambda p: p.stat().st_mtime)
+        for path in files[:-self.max_per_session]:
+            path.unlink(missing_ok=True)
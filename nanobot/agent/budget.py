@@ -0,0 +1,122 @@
+"""Token budgeting for the context window."""
+
+import json
+from collections import OrderedDict
+from typing import Any, Callable
+
+# Rough per-message overhead (role, separators) added by chat templates
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Flat estimate for one image attachment
+IMAGE_TOKENS = 1600
+
+
+class ContextBudget:
+    """
+    Fits conversation history into a model's context window.
+
+    Token counts are cached per text, so unchanged history messages are not
+    re-tokenized on every turn.
+    """
+
+    def __init__(
+        self,
+        count_tokens: Callable[[str], int],
+        context_window: int | Callable[[], int],
+        reserve_tokens: int = 4096,
+        cache_size: int = 4096,
+    ):
+        """
+        Args:
+            count_tokens: Function returning the token count of a text.
+            context_window: Maximum input + output tokens of the model, or a
+                function returning it for the current call (e.g. per route).
+            reserve_tokens: Tokens kept free for the model's response.
+            cache_size: Number of per-text token counts to keep.
+        """
+        self._count_tokens = count_tokens
+        self._context_window = context_window
+        self.reserve_tokens = reserve_tokens
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, int] = OrderedDict()
+
+    @property
+    def context_window(self) -> int:
+        """Context window of the model the current call goes to."""
+        if callable(self._context_window):
+            return self._context_window()
+        return self._context_window
+
+    def count_text(self, text: str) -> int:
+        """Count tokens of a text, using the cache when possible."""
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+
+        count = self._count_tokens(text)
+        self._cache[text] = count
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return count
+
+    def count_message(self, message: dict[str, Any]) -> int:
+        """Count tokens of a chat message (text parts and image attachments)."""
+        content = message.get("content")
+        tokens = MESSAGE_OVERHEAD_TOKENS
+        if isinstance(content, str):
+            tokens += self.count_text(content)
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "text":
+                    tokens += self.count_text(part.get("text", ""))
+                elif part.get("type") == "image_url":
+                    tokens += IMAGE_TOKENS
+        if message.get("tool_calls"):
+            tokens += self.count_text(json.dumps(message["tool_calls"]))
+        return tokens
+
+    def count_tools(self, tools: list[dict[str, Any]] | None) -> int:
+        """Count tokens of the tools schema."""
+        if not tools:
+            return 0
+        return self.count_text(json.dumps(tools))
+
+    def fit_history(self, history: list[dict[str, Any]], available: int) -> list[dict[str, Any]]:
+        """
+        Select the newest history messages that fit in the available tokens.
+
+        Leading system messages (e.g. a conversation summary) are pinned and
+        kept if they fit at all; the rest is filled newest-first.
+
+        Args:
+            history: History messages, oldest first.
+            available: Tokens available for history.
+
+        Returns:
+            The selected messages, oldest first.
+        """
+        pinned_count = 0
+        while pinned_count < len(history) and history[pinned_count].get("role") == "system":
+            pinned_count += 1
+
+        pinned: list[dict[str, Any]] = []
+        for msg in history[:pinned_count]:
+            tokens = self.count_message(msg)
+            if tokens <= available:
+                pinned.append(msg)
+                available -= tokens
+
+        selected: list[dict[str, Any]] = []
+        for msg in reversed(history[pinned_count:]):
+            tokens = self.count_message(msg)
+            if tokens > available:
+                break
+            selected.append(msg)
+            available -= tokens
+
+        selected.reverse()
+        # Don't start the conversation with an assistant reply
+        while selected and selected[0].get("role") == "assistant":
+            selected.pop(0)
+        return pinned + selected
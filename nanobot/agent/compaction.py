@@ -0,0 +1,133 @@
+"""Background compaction of long sessions into a rolling summary."""
+
+import asyncio
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider
+from nanobot.providers.router import set_route
+from nanobot.session.manager import Session, SessionManager
+from nanobot.tracing import tracer
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and an AI assistant.
+Merge the existing summary with the new conversation excerpt into one updated summary.
+
+Keep: facts about the user, decisions, open tasks and promises, file paths, names, numbers
+and anything the assistant may need later. Drop small talk and details that were superseded.
+Write concise bullet points, at most about 400 words. Reply with the summary only."""
+
+# Characters kept per message when building the excerpt to summarize
+MAX_EXCERPT_CHARS_PER_MESSAGE = 2000
+
+
+class SessionCompactor:
+    """
+    Folds older turns of a session into a summary stored in its metadata.
+
+    Once more than ``threshold`` messages are not covered by the summary,
+    everything except the newest ``keep_recent`` messages is summarized in
+    the background. ``Session.get_history`` then returns the summary plus
+    the recent tail. The full message log stays on disk.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        sessions: SessionManager,
+        model: str | None = None,
+        threshold: int = 60,
+        keep_recent: int = 20,
+        max_batch: int = 200,
+    ):
+        """
+        Args:
+            provider: LLM provider used for summarization.
+            sessions: Session manager used to persist the summary.
+            model: Model for summarization (defaults to the provider's).
+            threshold: Unsummarized messages that trigger a compaction.
+            keep_recent: Newest messages always kept verbatim.
+            max_batch: Maximum messages folded in per compaction run.
+        """
+        self.provider = provider
+        self.sessions = sessions
+        self.model = model or provider.get_default_model()
+        self.threshold = threshold
+        self.keep_recent = keep_recent
+        self.max_batch = max_batch
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+
+    def needs_compaction(self, session: Session) -> bool:
+        """Check if a session has crossed the compaction threshold."""
+        if self.threshold <= 0:
+            return False
+        upto = session.metadata.get("summarized_upto", 0)
+        return session.message_count - upto > self.threshold
+
+    def schedule(self, session: Session) -> None:
+        """Start a background compaction for the session if it needs one."""
+        if session.key in self._tasks or not self.needs_compaction(session):
+            return
+        task = asyncio.create_task(self._compact(session))
+        self._tasks[session.key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(session.key, None))
+
+    async def _compact(self, session: Session) -> None:
+        """Summarize the oldest unsummarized messages of a session."""
+        upto = session.metadata.get("summarized_upto", 0)
+        # Indices are absolute; the session may be loaded from ``offset`` on.
+        # Unsummarized messages before it were past the history window and
+        # are skipped.
+        offset = session.offset
+        start = max(upto, offset)
+        cut = min(session.message_count - self.keep_recent, start + self.max_batch)
+        # Keep the verbatim tail starting at a user message
+        while cut > start and session.messages[cut - 1 - offset]["role"] == "user":
+            cut -= 1
+        if cut <= start:
+            return
+
+        excerpt = self._format_excerpt(session.messages[start - offset:cut - offset])
+        previous = session.metadata.get("summary") or "(none yet)"
+        messages: list[dict[str, Any]] = [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": f"## Existing Summary\n\n{previous}\n\n## New Conversation Excerpt\n\n{excerpt}"},
+        ]
+
+        set_route("compaction")
+        try:
+            with tracer.span("llm.chat", model=self.model, session=session.key) as span:
+                response = await self.provider.chat(
+                    messages=messages,
+                    model=self.model,
+                    max_tokens=1024,
+                    temperature=0.2,
+                )
+                span.set(finish_reason=response.finish_reason, **response.usage)
+        except Exception as e:
+            logger.warning(f"Session compaction failed for {session.key}: {e}")
+            return
+
+        if response.finish_reason in ("error", "context_length") or not response.content:
+            logger.warning(f"Session compaction failed for {session.key}: {response.content}")
+            return
+
+        # The session may have been cleared or compacted meanwhile
+        if session.metadata.get("summarized_upto", 0) != upto or session.message_count < cut:
+            return
+
+        session.metadata["summary"] = response.content.strip()
+        session.metadata["summarized_upto"] = cut
+        self.sessions.save(session)
+        logger.info(f"Compacted session {session.key}: {cut} messages summarized")
+
+    @staticmethod
+    def _format_excerpt(messages: list[dict[str, Any]]) -> str:
+        """Render messages as a plain-text transcript."""
+        lines = []
+        for m in messages:
+            content = m.get("content") or ""
+            if len(content) > MAX_EXCERPT_CHARS_PER_MESSAGE:
+                content = content[:MAX_EXCERPT_CHARS_PER_MESSAGE] + " ... (truncated)"
+            lines.append(f"{m['role'].upper()}: {content}")
+        return "\n\n".join(lines)
@@ -0,0 +1,166 @@
+"""Scheduled consolidation of daily notes into long-term memory."""
+
+import shutil
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.providers.base import LLMProvider
+from nanobot.providers.router import set_route
+from nanobot.tracing import tracer
+
+CONSOLIDATE_PROMPT = """You maintain the long-term memory file (MEMORY.md) of an AI assistant.
+Merge the daily notes below into the existing memory and reply with the complete new MEMORY.md.
+
+- Keep durable facts: about the user and people they mention, preferences, decisions,
+  ongoing projects, commitments, important dates, file paths, names and numbers.
+- Merge duplicates and redundant statements into one; when facts conflict, keep the newest.
+- Drop small talk, finished one-off tasks and details that no longer matter.
+- Organize the result under markdown headings by topic; write terse bullet points.
+- Stay under about {target_words} words.
+Reply with the file content only."""
+
+SHRINK_PROMPT = """The memory file below is too long. Shorten it to under about {target_words} words
+by merging related points and dropping the least important details. Keep its markdown structure.
+Reply with the file content only."""
+
+# Characters of daily notes folded in per run (older notes wait for the next run)
+MAX_NOTES_CHARS = 60_000
+
+
+class MemoryConsolidator:
+    """
+    Folds daily notes older than ``keep_days`` into MEMORY.md.
+
+    The model rewrites MEMORY.md with the notes merged in, deduplicated and
+    kept under ``target_tokens``; the notes and the previous MEMORY.md are
+    then moved to memory/archive/. Run from a cron job on a cheap model
+    (the "consolidation" route), so the memory injected into prompts stays
+    bounded instead of growing with every day of notes.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        memory: MemoryStore,
+        model: str | None = None,
+        keep_days: int = 7,
+        target_tokens: int = 2000,
+    ):
+        """
+        Args:
+            provider: LLM provider used for consolidation.
+            memory: The agent's memory store.
+            model: Model for consolidation (defaults to the provider's).
+            keep_days: Daily notes of this many recent days are left alone.
+            target_tokens: Size limit for MEMORY.md.
+        """
+        self.provider = provider
+        self.memory = memory
+        self.model = model or provider.get_default_model()
+        self.keep_days = keep_days
+        self.target_tokens = target_tokens
+        self.archive_dir = memory.memory_dir / "archive"
+
+    async def run(self) -> str:
+        """
+        Consolidate old notes into MEMORY.md.
+
+        Returns:
+            A short report of what was done.
+        """
+        with tracer.span("memory.consolidate") as span:
+            notes = self._old_notes()
+            current = self.memory.read_long_term()
+            current_tokens = self._count(current)
+            span.set(notes=len(notes), tokens_before=current_tokens)
+            if not notes and current_tokens <= self.target_tokens:
+                return "Memory consolidation: nothing to do"
+
+            memory_stat = self._stat(self.memory.memory_file)
+            updated = await self._ask(
+                CONSOLIDATE_PROMPT,
+                f"## Current MEMORY.md\n\n{current or '(empty)'}\n\n## Daily Notes\n\n"
+                + "\n\n".join(f"### {p.stem}\n\n{p.read_text(encoding='utf-8')}" for p in notes),
+            )
+            if updated and self._count(updated) > self.target_tokens * 1.2:
+                updated = await self._ask(SHRINK_PROMPT, updated)
+            if not updated:
+                raise RuntimeError("memory consolidation failed: no usable response")
+
+            # The agent may have edited MEMORY.md meanwhile; retry on the next run
+            if self._stat(self.memory.memory_file) != memory_stat:
+                logger.warning("MEMORY.md changed during consolidation, skipping this run")
+                return "Memory consolidation: skipped (MEMORY.md changed meanwhile)"
+
+            self._archive(notes, current)
+            self.memory.write_long_term(updated.strip() + "\n")
+            tokens = self._count(updated)
+            span.set(tokens_after=tokens)
+            report = (
+                f"Memory consolidation: merged {len(notes)} daily notes, "
+                f"MEMORY.md {current_tokens} -> {tokens} tokens"
+            )
+            logger.info(report)
+            return report
+
+    def _old_notes(self) -> list[Path]:
+        """Daily notes older than the kept days, oldest first, up to the batch size."""
+        cutoff = date.today() - timedelta(days=self.keep_days)
+        self.memory.flush()
+        notes, size = [], 0
+        for path in sorted(self.memory.list_memory_files()):
+            try:
+                day = datetime.strptime(path.stem, "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            if day >= cutoff:
+                break
+            size += path.stat().st_size
+            if notes and size > MAX_NOTES_CHARS:
+                break
+            notes.append(path)
+        return notes
+
+    async def _ask(self, instructions: str, content: str) -> str | None:
+        """Run one consolidation call; None if it failed."""
+        messages: list[dict[str, Any]] = [
+            {"role": "system", "content": instructions.format(target_words=int(self.target_tokens * 0.75))},
+            {"role": "user", "content": content},
+        ]
+        set_route("consolidation")
+        with tracer.span("llm.chat", model=self.model) as span:
+            response = await self.provider.chat(
+                messages=messages,
+                model=self.model,
+                max_tokens=max(1024, int(self.target_tokens * 1.5)),
+                temperature=0.2,
+            )
+            span.set(finish_reason=response.finish_reason, **response.usage)
+        if response.finish_reason in ("error", "context_length", "length") or not response.content:
+            logger.warning(f"Memory consolidation call failed: {response.content}")
+            return None
+        return response.content
+
+    def _archive(self, notes: list[Path], previous: str) -> None:
+        """Move consolidated notes and the previous MEMORY.md out of the indexed directory."""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        if previous:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            (self.archive_dir / f"MEMORY-{stamp}.md").write_text(previous, encoding="utf-8")
+        for path in notes:
+            shutil.move(str(path), self.archive_dir / path.name)
+
+    def _count(self, text: str) -> int:
+        return self.provider.count_tokens(text, self.model) if text else 0
+
+    @staticmethod
+    def _stat(path: Path) -> tuple[int, int] | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
@@ -1,13 +1,23 @@
 """Context builder for assembling agent prompts."""
 
-import base64
-import mimetypes
 import platform
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+from nanobot.agent.budget import ContextBudget
+from nanobot.agent.images import ImageEncoder
 from nanobot.agent.memory import MemoryStore
-from nanobot.agent.skills import SkillsLoader
+from nanobot.agent.skills import SkillRecord, SkillsLoader
+from nanobot.tracing import tracer
+
+
+def _stat_key(path: Path) -> tuple[str, int, int, int] | tuple[str]:
+    """Identify a file version by path, mtime, size and inode (or its absence)."""
+    try:
+        st = path.stat()
+    except OSError:
+        return (str(path),)
+    return (str(path), st.st_mtime_ns, st.st_size, st.st_ino)
 
 
 class ContextBuilder:
@@ -20,21 +30,101 @@ class ContextBuilder:
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
-    def __init__(self, workspace: Path):
+    # Most skills included in full per message (the best ranked above the preload score)
+    MAX_PRELOADED_SKILLS = 2
+    # Ranked skills scoring below this fraction of the best match are left out
+    MIN_RELATIVE_SKILL_SCORE = 0.4
+    
+    def __init__(
+        self,
+        workspace: Path,
+        budget: ContextBudget | None = None,
+        prompt_blocks: bool | Callable[[], bool] = False,
+        skills_cache: Path | None = None,
+        skill_top_k: int = 0,
+        skill_preload_score: float = 0.0,
+        images: ImageEncoder | None = None,
+        memory_top_k: int = 0,
+    ):
+        """
+        Args:
+            workspace: Agent workspace directory.
+            budget: Optional token budget used to trim history.
+            prompt_blocks: Send the system prompt as separate stable and
+                volatile content blocks (for providers with prompt caching),
+                or a function deciding it for the current call.
+            skills_cache: Optional file to persist parsed skill metadata in.
+            skill_top_k: Summarize only the skills most relevant to each
+                message instead of all of them (0 = list all skills).
+            skill_preload_score: Include the full SKILL.md of ranked skills
+                scoring at least this (BM25; 0 = never preload).
+            images: Encoder for image attachments (defaults to sending originals).
+            memory_top_k: Include only the memory chunks most relevant to each
+                message instead of all of MEMORY.md and today's notes (0 = all).
+        """
         self.workspace = workspace
         self.memory = MemoryStore(workspace)
-        self.skills = SkillsLoader(workspace)
+        self.skills = SkillsLoader(workspace, cache_path=skills_cache)
+        self.budget = budget
+        self.prompt_blocks = prompt_blocks
+        self.skill_top_k = skill_top_k
+        self.skill_preload_score = skill_preload_score
+        self.images = images or ImageEncoder(max_edge=0)
+        self.memory_top_k = memory_top_k
+        # (fingerprint, prompt) of the last assembled system prompt
+        self._prompt_cache: tuple[tuple, str] | None = None
+        # ((catalog version, text), (ranked, preloaded)) of the last skill selection
+        self._skill_selection: tuple[tuple[int, str], tuple[list[str], list[str]]] | None = None
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """
-        Build the system prompt from bootstrap files, memory, and skills.
+        Build the stable part of the system prompt.
+        
+        Contains identity, bootstrap files, skills and memory, ordered from
+        least to most frequently changing, and nothing that varies per call
+        (time, session), so providers can cache it as a prompt prefix.
+        
+        The assembled prompt is reused until one of its source files changes
+        (see ``_fingerprint``), which saves reading every bootstrap, memory
+        and skill file and checking skill requirements on each message.
         
         Args:
             skill_names: Optional list of skills to include.
         
         Returns:
-            Complete system prompt.
+            System prompt without the volatile context.
         """
+        fingerprint = self._fingerprint()
+        if self._prompt_cache and self._prompt_cache[0] == fingerprint:
+            return self._prompt_cache[1]
+        
+        prompt = self._assemble_system_prompt()
+        self._prompt_cache = (fingerprint, prompt)
+        return prompt
+    
+    def _fingerprint(self) -> tuple:
+        """
+        Describe the current state of every input of the system prompt.
+        
+        Uses stat results (mtime, size, inode) of the bootstrap and memory
+        files (and the size of buffered note appends) plus the skill catalog
+        version, which changes when a SKILL.md is added, removed or edited
+        or a skill's availability changes.
+        
+        This is the one catalog refresh per build: the skill sections built
+        afterwards read its records. Costs a stat per file and per skill
+        and no reads or directory listings unless something changed.
+        """
+        paths = [self.workspace / name for name in self.BOOTSTRAP_FILES]
+        pending = 0
+        if not self.memory_top_k:
+            paths += [self.memory.memory_file, self.memory.get_today_file()]
+            pending = self.memory.pending_bytes
+        self.skills.catalog.refresh()
+        return tuple(_stat_key(p) for p in paths) + (pending, self.skills.catalog.version)
+    
+    def _assemble_system_prompt(self) -> str:
+        """Read all sources and assemble the stable system prompt."""
         parts = []
         
         # Core identity
@@ -45,11 +135,6 @@ class ContextBuilder:
         if bootstrap:
             parts.append(bootstrap)
         
-        # Memory context
-        memory = self.memory.get_memory_context()
-        if memory:
-            parts.append(f"# Memory\n\n{memory}")
-        
         # Skills - progressive loading
         # 1. Always-loaded skills: include full content
         always_skills = self.skills.get_always_skills()
@@ -58,8 +143,9 @@ class ContextBuilder:
             if always_content:
                 parts.append(f"# Active Skills\n\n{always_content}")
         
-        # 2. Available skills: only show summary (agent uses read_file to load)
-        skills_summary = self.skills.build_skills_summary()
+        # 2. Available skills: only show summary (agent uses read_file to load);
+        # with ranking enabled, relevant ones are listed per message instead
+        skills_summary = "" if self.skill_top_k else self.skills.build_skills_summary()
         if skills_summary:
             parts.append(f"""# Skills
 
@@ -68,12 +154,120 @@ Skills with available="false" need dependencies installed first - you can try in
 
 {skills_summary}""")
         
+        # Memory context (changes more often than the sections above);
+        # with retrieval enabled, relevant chunks are added per message instead
+        memory = "" if self.memory_top_k else self.memory.get_memory_context()
+        if memory:
+            parts.append(f"# Memory\n\n{memory}")
+        
         return "\n\n---\n\n".join(parts)
     
-    def _get_identity(self) -> str:
-        """Get the core identity section."""
+    def select_skills(self, text: str) -> tuple[list[str], list[str]]:
+        """
+        Pick the skills to list and to include in full for one message.
+        
+        Always-loaded skills are part of the stable prompt and skipped here.
+        Uses the skill records of the last ``build_system_prompt``. The last
+        result is kept, since the agent loop asks for it before the prompt
+        is built (see ``preloaded_skills``).
+        
+        Args:
+            text: The message and recent history to rank skills against.
+        
+        Returns:
+            Names of the ranked skills (best first) and of those to preload.
+        """
+        if not self.skill_top_k:
+            return [], []
+        key = (self.skills.catalog.version, text)
+        if self._skill_selection and self._skill_selection[0] == key:
+            return self._skill_selection[1]
+        
+        records = {r.name: r for r in self.skills.catalog.records()}
+        always = {name for name, r in records.items() if r.always and r.available}
+        ranked = [
+            (name, score)
+            for name, score in self.skills.rank(text, self.skill_top_k + len(always))
+            if name not in always
+        ][:self.skill_top_k]
+        if ranked:
+            ranked = [(name, score) for name, score in ranked if score >= ranked[0][1] * self.MIN_RELATIVE_SKILL_SCORE]
+        
+        names = [name for name, _ in ranked]
+        preload = [
+            name for name, score in ranked[:self.MAX_PRELOADED_SKILLS]
+            if self.skill_preload_score and score >= self.skill_preload_score
+            and records[name].available
+        ]
+        self._skill_selection = (key, (names, preload))
+        return names, preload
+    
+    def preloaded_skills(self, text: str) -> list[SkillRecord]:
+        """Get the skills included in full in the prompt for a message (always-loaded and preloaded)."""
+        _, preload = self.select_skills(text)
+        records = self.skills.catalog.records()
+        return [r for r in records if r.always and r.available] + [
+            r for name in preload if (r := self.skills.catalog.get(name))
+        ]
+    
+    def build_skill_context(self, text: str) -> tuple[str, list[str]]:
+        """
+        Build the skills section for one message from the most relevant skills.
+        
+        Args:
+            text: The message and recent history to rank skills against.
+        
+        Returns:
+            The section (empty if nothing matched) and the names of the ranked skills.
+        """
+        names, preload = self.select_skills(text)
+        if not names:
+            return "", []
+        
+        note = " (the best matches are already included in full below)" if preload else ""
+        section = f"""# Skills
+
+Skills relevant to this message. To use a skill, read its SKILL.md file using the read_file tool{note}.
+Skills with available="false" need dependencies installed first - you can try installing them with apt/brew.
+More skills may exist: list {self.skills.workspace_skills} and {self.skills.builtin_skills} if none of these fit.
+
+{self.skills.build_skills_summary(names)}"""
+        if preload:
+            section += f"\n\n## Preloaded Skills\n\n{self.skills.load_skills_for_context(preload)}"
+        return section, names
+    
+    def build_memory_context(self, text: str) -> tuple[str, int]:
+        """
+        Build the memory section for one message from the most relevant chunks.
+        
+        Args:
+            text: The message and recent history to search memory for.
+        
+        Returns:
+            The section (empty if nothing matched) and the number of chunks in it.
+        """
+        chunks = self.memory.index.search(text, self.memory_top_k)
+        if not chunks:
+            return "", 0
+        body = "\n\n".join(chunk.format() for chunk in chunks)
+        return (
+            "# Memory\n\n"
+            "Passages from your memory files relevant to this message "
+            "(use the recall tool to search for more):\n\n"
+            f"{body}"
+        ), len(chunks)
+    
+    def build_volatile_context(self, channel: str | None = None, chat_id: str | None = None) -> str:
+        """Build the per-call part of the system prompt (current time and session)."""
         from datetime import datetime
         now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+        context = f"## Current Time\n{now}"
+        if channel and chat_id:
+            context += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
+        return context
+    
+    def _get_identity(self) -> str:
+        """Get the core identity section."""
         workspace_path = str(self.workspace.expanduser().resolve())
         system = platform.system()
         runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}, Python {platform.python_version()}"
@@ -87,9 +281,6 @@ You are nanobot, a helpful AI assistant. You have access to tools that allow you
 - Send messages to users on chat channels
 - Spawn subagents for complex background tasks
 
-## Current Time
-{now}
-
 ## Runtime
 {runtime}
 
@@ -126,10 +317,14 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         media: list[str] | None = None,
         channel: str | None = None,
         chat_id: str | None = None,
+        tools: list[dict[str, Any]] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Build the complete message list for an LLM call.
 
+        With a context budget configured, history is trimmed newest-first to
+        what fits after the system prompt, tools schema and current message.
+
         Args:
             history: Previous conversation messages.
             current_message: The new user message.
@@ -137,26 +332,89 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
             media: Optional list of local file paths for images/media.
             channel: Current channel (telegram, feishu, etc.).
             chat_id: Current chat/user ID.
+            tools: Tool definitions sent with the request (counted against the budget).
 
         Returns:
             List of messages including system prompt.
         """
-        messages = []
+        with tracer.span("context.build") as span:
+            messages = []
 
-        # System prompt
-        system_prompt = self.build_system_prompt(skill_names)
-        if channel and chat_id:
-            system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
-        messages.append({"role": "system", "content": system_prompt})
+            # System prompt: stable prefix, then the per-call context
+            system_prompt = self.build_system_prompt(skill_names)
+            volatile = self.build_volatile_context(channel, chat_id)
+            # Ranked skills and memories vary per message, so they go after the cacheable prefix
+            recent = [m["content"] for m in history[-2:] if isinstance(m.get("content"), str)]
+            query = "\n".join([current_message, *recent])
+            if self.skill_top_k:
+                skills, ranked = self.build_skill_context(query)
+                if skills:
+                    volatile = f"{skills}\n\n---\n\n{volatile}"
+                span.set(skills=",".join(ranked))
+            if self.memory_top_k:
+                memory, chunks = self.build_memory_context(query)
+                if memory:
+                    volatile = f"{memory}\n\n---\n\n{volatile}"
+                span.set(memory_chunks=chunks)
+            prompt_blocks = self.prompt_blocks() if callable(self.prompt_blocks) else self.prompt_blocks
+            if prompt_blocks:
+                # Separate blocks let the provider mark the stable one for caching
+                system_content: str | list[dict[str, Any]] = [
+                    {"type": "text", "text": system_prompt},
+                    {"type": "text", "text": volatile},
+                ]
+            else:
+                system_content = f"{system_prompt}\n\n---\n\n{volatile}"
+            messages.append({"role": "system", "content": system_content})
 
-        # History
-        messages.extend(history)
+            # Current message (with optional image attachments)
+            user_message = {"role": "user", "content": self._build_user_content(current_message, media)}
 
-        # Current message (with optional image attachments)
-        user_content = self._build_user_content(current_message, media)
-        messages.append({"role": "user", "content": user_content})
+            # History
+            if self.budget:
+                b = self.budget
+                available = (
+                    b.context_window - b.reserve_tokens
+                    - sum(b.count_message(m) for m in messages)
+                    - b.count_tools(tools)
+                    - b.count_message(user_message)
+                )
+                history = b.fit_history(history, max(available, 0))
+            messages.extend(history)
 
-        return messages
+            messages.append(user_message)
+            span.set(history_messages=len(history))
+
+            return messages
+
+    def trim_history(self, messages: list[dict[str, Any]], turn_start: int) -> int:
+        """
+        Drop the older half of the history from a built message list, in place.
+
+        Used to retry after the provider rejects a prompt as too long.
+
+        Args:
+            messages: Message list from build_messages (plus any turn messages).
+            turn_start: Index of the current user message.
+
+        Returns:
+            The new index of the current user message, or -1 if there was no
+            history left to drop.
+        """
+        # Leading system messages (prompt, summaries) are kept
+        first = 0
+        while first < turn_start and messages[first].get("role") == "system":
+            first += 1
+        droppable = turn_start - first
+        if droppable <= 0:
+            return -1
+
+        drop = max(1, droppable // 2)
+        # Don't leave the history starting with an assistant reply
+        while first + drop < turn_start and messages[first + drop].get("role") == "assistant":
+            drop += 1
+        del messages[first:first + drop]
+        return turn_start - drop
 
     def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
         """Build user message content with optional base64-encoded images."""
@@ -165,12 +423,9 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         
         images = []
         for path in media:
-            p = Path(path)
-            mime, _ = mimetypes.guess_type(path)
-            if not p.is_file() or not mime or not mime.startswith("image/"):
-                continue
-            b64 = base64.b64encode(p.read_bytes()).decode()
-            images.append({"type": "image_url", "image_url": {"url": f"data:{mime};base64,{b64}"}})
+            url = self.images.encode(path)
+            if url:
+                images.append({"type": "image_url", "image_url": {"url": url}})
         
         if not images:
             return text
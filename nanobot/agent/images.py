@@ -0,0 +1,153 @@
+"""Downscaling and encoding of image attachments for multimodal messages."""
+
+import asyncio
+import base64
+import hashlib
+import io
+import mimetypes
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.tracing import tracer
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    Image = None
+    ImageOps = None
+
+# Largest size providers process without scaling down themselves
+# (Anthropic: 1568 px long edge, ~1.15 megapixels)
+DEFAULT_MAX_EDGE = 1568
+DEFAULT_MAX_PIXELS = 1_150_000
+
+# Formats that are resized and recompressed; others (e.g. animated GIF) are sent as-is
+_RESIZABLE = {"image/jpeg", "image/png", "image/webp"}
+
+
+class ImageEncoder:
+    """
+    Turns image files into data URLs sized for the model.
+
+    Images larger than the provider's optimal dimensions are downscaled and
+    recompressed (JPEG, or PNG when they have transparency); smaller ones
+    are recompressed only if that makes them smaller. Results are cached by
+    content hash, so retries and re-sent images are encoded once.
+
+    Resizing needs Pillow; without it images are sent unchanged (but still
+    cached). ``prepare`` does the work in a thread pool so large images do
+    not block the event loop; ``encode`` is the synchronous path and is
+    served from the cache after ``prepare``.
+    """
+
+    def __init__(
+        self,
+        max_edge: int = DEFAULT_MAX_EDGE,
+        max_pixels: int = DEFAULT_MAX_PIXELS,
+        quality: int = 85,
+        cache_bytes: int = 32 * 1024 * 1024,
+        workers: int = 2,
+    ):
+        """
+        Args:
+            max_edge: Longest side in pixels (0 = send originals).
+            max_pixels: Maximum width x height.
+            quality: JPEG/WebP quality of recompressed images.
+            cache_bytes: Total size of cached data URLs.
+            workers: Threads used by ``prepare``.
+        """
+        self.max_edge = max_edge
+        self.max_pixels = max_pixels
+        self.quality = quality
+        self.cache_bytes = cache_bytes
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._cached_size = 0
+        # encode runs in pool threads as well as on the event loop
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="image")
+        if max_edge and not PIL_AVAILABLE:
+            logger.info("Pillow not installed: image attachments are sent at full size")
+
+    async def prepare(self, paths: list[str]) -> None:
+        """Encode images in the thread pool so a later ``encode`` hits the cache."""
+        if not paths:
+            return
+        with tracer.span("image.prepare") as span:
+            loop = asyncio.get_running_loop()
+            urls = await asyncio.gather(
+                *(loop.run_in_executor(self._executor, self.encode, path) for path in paths)
+            )
+            span.set(images=sum(1 for url in urls if url))
+
+    def encode(self, path: str) -> str | None:
+        """
+        Get the data URL of an image file.
+
+        Returns:
+            The data URL, or None if the file is missing or not an image.
+        """
+        p = Path(path)
+        mime, _ = mimetypes.guess_type(path)
+        if not p.is_file() or not mime or not mime.startswith("image/"):
+            return None
+
+        data = p.read_bytes()
+        key = f"{hashlib.sha256(data).hexdigest()}:{self.max_edge}:{self.max_pixels}:{self.quality}"
+        with self._lock:
+            url = self._cache.get(key)
+            if url is not None:
+                self._cache.move_to_end(key)
+                return url
+
+        if self.max_edge and PIL_AVAILABLE and mime in _RESIZABLE:
+            try:
+                data, mime = self._shrink(data, mime)
+            except Exception as e:
+                logger.warning(f"Could not resize {path}, sending original: {e}")
+        url = f"data:{mime};base64,{base64.b64encode(data).decode()}"
+        self._store(key, url)
+        return url
+
+    def _shrink(self, data: bytes, mime: str) -> tuple[bytes, str]:
+        """Downscale and recompress an image, keeping the original if that is smaller."""
+        with Image.open(io.BytesIO(data)) as img:
+            img = ImageOps.exif_transpose(img)
+            width, height = img.size
+            scale = min(
+                1.0,
+                self.max_edge / max(width, height),
+                (self.max_pixels / (width * height)) ** 0.5,
+            )
+            if scale < 1.0:
+                img = img.resize((max(1, int(width * scale)), max(1, int(height * scale))), Image.LANCZOS)
+
+            out = io.BytesIO()
+            if img.mode in ("RGBA", "LA", "P") and mime != "image/jpeg":
+                img.save(out, format="PNG", optimize=True)
+                new_mime = "image/png"
+            else:
+                img.convert("RGB").save(out, format="JPEG", quality=self.quality, optimize=True)
+                new_mime = "image/jpeg"
+
+        if scale == 1.0 and out.tell() >= len(data):
+            return data, mime
+        return out.getvalue(), new_mime
+
+    def _store(self, key: str, url: str) -> None:
+        """Cache a data URL, evicting the least recently used ones over the size limit."""
+        if len(url) > self.cache_bytes:
+            return
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = url
+            self._cached_size += len(url)
+            while self._cached_size > self.cache_bytes:
+                _, old = self._cache.popitem(last=False)
+                self._cached_size -= len(old)
@@ -2,15 +2,27 @@
 
 import asyncio
 import json
+import time
+import uuid
+import weakref
+from collections import deque
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.lanes import LoadShedError, lane_of
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.router import set_route
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.budget import ContextBudget
+from nanobot.agent.compaction import SessionCompactor
+from nanobot.agent.consolidation import MemoryConsolidator
 from nanobot.agent.context import ContextBuilder
+from nanobot.agent.images import ImageEncoder
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
@@ -18,8 +30,14 @@ from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.cron import CronTool
+from nanobot.agent.tools.artifact import ReadArtifactTool
+from nanobot.agent.tools.load_tools import LoadToolsTool
+from nanobot.agent.tools.recall import RecallTool
+from nanobot.agent.tool_selector import ToolSelector
 from nanobot.agent.subagent import SubagentManager
-from nanobot.session.manager import SessionManager
+from nanobot.session.manager import Session, SessionManager
+from nanobot.tracing import tracer
+from nanobot.utils.helpers import get_data_path
 
 
 class AgentLoop:
@@ -34,6 +52,18 @@ class AgentLoop:
     5. Sends responses back
     """
     
+    # Minimum seconds between partial (streamed) messages of one turn
+    STREAM_FLUSH_INTERVAL_S = 0.25
+    
+    # History messages loaded per turn: the token budget decides what is sent,
+    # this only bounds the work. Without a known context window the old
+    # fixed cut applies.
+    MAX_HISTORY_MESSAGES = 500
+    FALLBACK_HISTORY_MESSAGES = 50
+    
+    # Consecutive failed LLM calls after which the provider counts as degraded
+    DEGRADED_AFTER_FAILURES = 3
+    
     def __init__(
         self,
         bus: MessageBus,
@@ -45,6 +75,24 @@ class AgentLoop:
         exec_config: "ExecToolConfig | None" = None,
         cron_service: "CronService | None" = None,
         restrict_to_workspace: bool = False,
+        max_concurrent_turns: int = 1,
+        max_parallel_tools: int = 4,
+        stream: bool = False,
+        context_window: int | None = None,
+        compact_threshold: int = 0,
+        compact_keep_recent: int = 20,
+        artifact_threshold: int = 0,
+        interrupt_turns: bool = False,
+        stop_words: list[str] | None = None,
+        select_tools: bool = False,
+        skills_cache: bool = False,
+        skill_top_k: int = 0,
+        skill_preload_score: float = 0.0,
+        image_max_edge: int = 0,
+        memory_top_k: int = 0,
+        memory_keep_days: int = 7,
+        memory_target_tokens: int = 2000,
+        data_dir: Path | None = None,
     ):
         from nanobot.config.schema import ExecToolConfig
         from nanobot.cron.service import CronService
@@ -57,10 +105,59 @@ class AgentLoop:
         self.exec_config = exec_config or ExecToolConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
-        
-        self.context = ContextBuilder(workspace)
-        self.sessions = SessionManager(workspace)
-        self.tools = ToolRegistry()
+        self.max_concurrent_turns = max(1, max_concurrent_turns)
+        self.stream = stream
+        self.interrupt_turns = interrupt_turns
+        self.stop_words = {w.lower() for w in (stop_words or [])}
+        self.select_tools = select_tools
+        # Sessions, artifacts and caches (defaults to ~/.nanobot)
+        self.data_dir = data_dir or get_data_path()
+        
+        # Window and cache support are looked up per call: a routing provider
+        # may send the call (e.g. a heartbeat) to a different model
+        default_window = provider.get_context_window(self.model)
+        budget = None
+        if context_window or default_window:
+            budget = ContextBudget(
+                count_tokens=lambda text: provider.count_tokens(text, self.model),
+                context_window=context_window or (
+                    lambda: provider.get_context_window(self.model) or default_window
+                ),
+            )
+        self.context = ContextBuilder(
+            workspace,
+            budget=budget,
+            prompt_blocks=lambda: provider.supports_prompt_caching(self.model),
+            skills_cache=self.data_dir / "cache" / "skills.json" if skills_cache else None,
+            skill_top_k=skill_top_k,
+            skill_preload_score=skill_preload_score,
+            images=ImageEncoder(max_edge=image_max_edge),
+            memory_top_k=memory_top_k,
+        )
+        # Only the messages the history can use are loaded from disk
+        self.sessions = SessionManager(
+            workspace,
+            sessions_dir=self.data_dir / "sessions",
+            tail_messages=self.MAX_HISTORY_MESSAGES,
+            keep_unsummarized=compact_threshold > 0,
+        )
+        self.compactor = SessionCompactor(
+            provider=provider,
+            sessions=self.sessions,
+            model=self.model,
+            threshold=compact_threshold,
+            keep_recent=compact_keep_recent,
+        )
+        self.consolidator = MemoryConsolidator(
+            provider=provider,
+            memory=self.context.memory,
+            model=self.model,
+            keep_days=memory_keep_days,
+            target_tokens=memory_target_tokens,
+        )
+        self.artifacts = ArtifactStore(self.data_dir / "artifacts", threshold=artifact_threshold)
+        self.tools = ToolRegistry(max_concurrency=max_parallel_tools)
+        self.tool_selector = ToolSelector(self.tools)
         self.subagents = SubagentManager(
             provider=provider,
             workspace=workspace,
@@ -69,9 +166,23 @@ class AgentLoop:
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            max_parallel_tools=max_parallel_tools,
+            artifacts=self.artifacts,
         )
         
         self._running = False
+        # Pending messages per session key; a key is present while a worker owns that session
+        self._session_queues: dict[str, deque[InboundMessage]] = {}
+        self._workers: set[asyncio.Task[None]] = set()
+        # Running turn (and its message) per session key, for interrupts
+        self._turn_tasks: dict[str, tuple[asyncio.Task[None], InboundMessage]] = {}
+        # Callers of process_direct waiting for a queued message, by message id
+        self._waiters: dict[int, asyncio.Future[str]] = {}
+        # Consecutive failed LLM calls (marks the provider degraded)
+        self._llm_failures = 0
+        self.bus.inbound.on_shed = self._on_shed
+        # Serializes turns on a session between the bus workers and process_direct callers
+        self._session_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
         self._register_default_tools()
     
     def _register_default_tools(self) -> None:
@@ -105,56 +216,259 @@ class AgentLoop:
         # Cron tool (for scheduling)
         if self.cron_service:
             self.tools.register(CronTool(self.cron_service))
+        
+        # Artifact tool (for paging through large tool outputs)
+        if self.artifacts.threshold > 0:
+            self.tools.register(ReadArtifactTool(self.artifacts))
+        
+        # Recall tool (memory is retrieved per message, the rest on demand)
+        if self.context.memory_top_k:
+            self.tools.register(RecallTool(self.context.memory.index))
+        
+        # Tool selection (registered last: lists all other tools)
+        if self.select_tools:
+            self.tools.register(LoadToolsTool(self.tool_selector))
     
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
+        """
+        Run the agent loop, processing messages from the bus.
+        
+        Up to ``max_concurrent_turns`` sessions are served at once. Messages
+        sharing a session key are handled strictly in order by a single
+        worker, while different sessions proceed in parallel. New sessions
+        are admitted by lane priority: while all slots are busy, only
+        messages for sessions that already have a worker leave the bus.
+        
+        With ``interrupt_turns``, a new chat message cancels the running chat
+        turn of its session, which is recorded as interrupted before the new
+        turn starts. A stop word only cancels the running turn. Either only
+        affects a turn started by the same sender, since in group chats a
+        session is shared by everyone in the chat.
+        """
         self._running = True
-        logger.info("Agent loop started")
+        logger.info(f"Agent loop started (max {self.max_concurrent_turns} concurrent turns)")
         
         while self._running:
             try:
-                # Wait for next message
                 msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(),
+                    self.bus.consume_inbound(accept=self._can_dispatch),
                     timeout=1.0
                 )
-                
-                # Process it
-                try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    # Send error response
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {str(e)}"
-                    ))
             except asyncio.TimeoutError:
                 continue
+            
+            key = self._get_session_key(msg)
+            if self._is_stop_request(msg, key):
+                await self._stop_turn(msg, key)
+                continue
+            
+            pending = self._session_queues.get(key)
+            if pending is not None:
+                # Session already has a worker; it will pick this up in order
+                pending.append(msg)
+                if self.interrupt_turns and lane_of(msg) == "interactive":
+                    self._interrupt_turn(key, msg.sender_id)
+                continue
+            
+            self._session_queues[key] = deque([msg])
+            worker = asyncio.create_task(self._run_session(key))
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+    
+    def _can_dispatch(self, msg: InboundMessage) -> bool:
+        """Check if a message can leave the bus now (its session has a worker or a slot is free)."""
+        return (
+            self._get_session_key(msg) in self._session_queues
+            or len(self._session_queues) < self.max_concurrent_turns
+        )
+    
+    async def _run_session(self, key: str) -> None:
+        """Drain the pending messages of one session, one turn at a time."""
+        pending = self._session_queues[key]
+        try:
+            while pending:
+                msg = pending.popleft()
+                # Each turn is its own task so it can be cancelled on its own
+                turn = asyncio.create_task(self._handle_inbound(msg))
+                self._turn_tasks[key] = (turn, msg)
+                try:
+                    await asyncio.wait({turn})
+                except asyncio.CancelledError:
+                    turn.cancel()
+                    raise
+                finally:
+                    self._turn_tasks.pop(key, None)
+                if turn.cancelled():
+                    logger.info(f"Turn for {key} interrupted")
+                    self._fail_waiter(msg, asyncio.CancelledError())
+        finally:
+            del self._session_queues[key]
+            # A slot is free: let the dispatcher admit waiting sessions
+            self.bus.inbound.notify()
+    
+    def _interrupt_turn(self, key: str, sender_id: str) -> bool:
+        """Cancel the running chat turn of a session, if the sender started it."""
+        turn, msg = self._turn_tasks.get(key, (None, None))
+        if turn is None or turn.done() or lane_of(msg) != "interactive" or msg.sender_id != sender_id:
+            return False
+        turn.cancel()
+        return True
+    
+    def _is_stop_request(self, msg: InboundMessage, key: str) -> bool:
+        """Check if a chat message is a stop word aimed at a running turn."""
+        if lane_of(msg) != "interactive" or not self.stop_words:
+            return False
+        word = msg.content.strip().lower().rstrip("!.")
+        if word not in self.stop_words:
+            return False
+        _, running = self._turn_tasks.get(key, (None, None))
+        return running is not None and running.sender_id == msg.sender_id
+    
+    async def _stop_turn(self, msg: InboundMessage, key: str) -> None:
+        """Cancel the sender's running turn and queued chat messages in a session and acknowledge."""
+        pending = self._session_queues.get(key)
+        if pending:
+            # Scheduled work and other participants' messages still run
+            kept = [m for m in pending if lane_of(m) != "interactive" or m.sender_id != msg.sender_id]
+            pending.clear()
+            pending.extend(kept)
+        self._interrupt_turn(key, msg.sender_id)
+        await self.bus.publish_outbound(OutboundMessage(
+            channel=msg.channel,
+            chat_id=msg.chat_id,
+            content="Stopped.",
+        ))
+    
+    async def _handle_inbound(self, msg: InboundMessage) -> None:
+        """Process one inbound message and publish the response (or hand it to a waiting caller)."""
+        waiter = self._waiters.pop(id(msg), None)
+        # One stream per turn, so an error reply replaces text streamed before the failure
+        stream_id = uuid.uuid4().hex[:12] if self.stream and waiter is None else None
+        try:
+            response = await self._process_message(msg, stream_id=stream_id)
+            if waiter is not None:
+                if not waiter.done():
+                    waiter.set_result(response.content if response else "")
+            elif response:
+                await self.bus.publish_outbound(response)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            if waiter is not None:
+                if not waiter.done():
+                    waiter.set_exception(e)
+                return
+            # Send error response
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=f"Sorry, I encountered an error: {str(e)}",
+                stream_id=stream_id,
+            ))
+        except asyncio.CancelledError:
+            if waiter is not None:
+                waiter.cancel()
+            raise
+    
+    def _fail_waiter(self, msg: InboundMessage, error: BaseException) -> None:
+        """Resolve the caller waiting on a message that will not be processed."""
+        waiter = self._waiters.pop(id(msg), None)
+        if waiter is None or waiter.done():
+            return
+        if isinstance(error, asyncio.CancelledError):
+            waiter.cancel()
+        else:
+            waiter.set_exception(error)
+    
+    def _on_shed(self, msg: InboundMessage, reason: str) -> None:
+        """Fail the caller of a message dropped by load shedding."""
+        self._fail_waiter(msg, LoadShedError(f"{lane_of(msg)} work shed: {reason}"))
+    
+    @staticmethod
+    def _get_session_key(msg: InboundMessage) -> str:
+        """Session key a message belongs to (system messages route to their origin)."""
+        if msg.channel == "system":
+            return msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+        return msg.session_key
     
     def stop(self) -> None:
         """Stop the agent loop."""
         self._running = False
         logger.info("Agent loop stopping")
     
-    async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
+    @property
+    def idle(self) -> bool:
+        """Check if no work is queued, running or pending in subagents."""
+        return (
+            not self._session_queues
+            and self.bus.inbound_size == 0
+            and self.subagents.get_running_count() == 0
+        )
+    
+    @property
+    def _history_limit(self) -> int:
+        """Number of history messages to load for a turn."""
+        return self.MAX_HISTORY_MESSAGES if self.context.budget else self.FALLBACK_HISTORY_MESSAGES
+    
+    def _set_tool_context(self, channel: str, chat_id: str) -> None:
+        """
+        Point the context-aware tools at the current conversation.
+        
+        Tool contexts are held in context variables, so the values only apply
+        to the asyncio task running this turn and concurrent turns stay isolated.
+        """
+        message_tool = self.tools.get("message")
+        if isinstance(message_tool, MessageTool):
+            message_tool.set_context(channel, chat_id)
+        
+        spawn_tool = self.tools.get("spawn")
+        if isinstance(spawn_tool, SpawnTool):
+            spawn_tool.set_context(channel, chat_id)
+        
+        cron_tool = self.tools.get("cron")
+        if isinstance(cron_tool, CronTool):
+            cron_tool.set_context(channel, chat_id)
+        
+        self.artifacts.set_session(f"{channel}:{chat_id}")
+    
+    async def _process_message(self, msg: InboundMessage, stream_id: str | None = None) -> OutboundMessage | None:
         """
         Process a single inbound message.
         
         Args:
             msg: The inbound message to process.
+            stream_id: If set, publish partial responses to the bus under this
+                ID while the LLM generates.
         
         Returns:
             The response message, or None if no response needed.
         """
-        # Handle system messages (subagent announces)
-        # The chat_id contains the original "channel:chat_id" to route back to
-        if msg.channel == "system":
-            return await self._process_system_message(msg)
-        
+        key = self._get_session_key(msg)
+        lock = self._session_locks.get(key)
+        if lock is None:
+            lock = self._session_locks[key] = asyncio.Lock()
+        
+        async with lock:
+            # Time from receipt until the turn starts (bus queue + session lock)
+            queue_wait_ms = (datetime.now() - msg.timestamp).total_seconds() * 1000
+            with tracer.span(
+                "turn",
+                new_trace=True,
+                channel=msg.channel,
+                session=key,
+                queue_wait_ms=round(queue_wait_ms, 1),
+            ):
+                # Pick the model policy for this workload (chat, announce, cron, heartbeat)
+                lane = lane_of(msg)
+                set_route("announce" if lane == "system" else lane)
+                
+                # Handle system messages (subagent announces)
+                # The chat_id contains the original "channel:chat_id" to route back to
+                if msg.channel == "system":
+                    return await self._process_system_message(msg, stream_id)
+                return await self._process_user_message(msg, stream_id)
+    
+    async def _process_user_message(self, msg: InboundMessage, stream_id: str | None = None) -> OutboundMessage | None:
+        """Run a turn for a message from a chat channel."""
         preview = msg.content[:80] + "..." if len(msg.content) > 80 else msg.content
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}: {preview}")
         
@@ -162,71 +476,31 @@ class AgentLoop:
         session = self.sessions.get_or_create(msg.session_key)
         
         # Update tool contexts
-        message_tool = self.tools.get("message")
-        if isinstance(message_tool, MessageTool):
-            message_tool.set_context(msg.channel, msg.chat_id)
+        self._set_tool_context(msg.channel, msg.chat_id)
         
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(msg.channel, msg.chat_id)
+        # Offer only the tools relevant to this message and the last exchange
+        history = session.get_history(max_messages=self._history_limit)
+        self._select_tools(msg.content, history)
         
-        cron_tool = self.tools.get("cron")
-        if isinstance(cron_tool, CronTool):
-            cron_tool.set_context(msg.channel, msg.chat_id)
+        # Resize and encode attachments off the event loop
+        await self.context.images.prepare(msg.media)
         
         # Build initial messages (use get_history for LLM-formatted messages)
         messages = self.context.build_messages(
-            history=session.get_history(),
+            history=history,
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel,
             chat_id=msg.chat_id,
+            tools=self.tool_selector.definitions(),
         )
         
         # Agent loop
-        iteration = 0
-        final_content = None
-        
-        while iteration < self.max_iterations:
-            iteration += 1
-            
-            # Call LLM
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
-            
-            # Handle tool calls
-            if response.has_tool_calls:
-                # Add assistant message with tool calls
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)  # Must be JSON string
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
-                
-                # Execute tools
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
-            else:
-                # No tool calls, we're done
-                final_content = response.content
-                break
+        try:
+            final_content = await self._run_agent_loop(messages, msg.channel, msg.chat_id, stream_id)
+        except asyncio.CancelledError:
+            self._save_interrupted_turn(session, msg.content, messages)
+            raise
         
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
@@ -240,13 +514,232 @@ class AgentLoop:
         session.add_message("assistant", final_content)
         self.sessions.save(session)
         
+        # Fold older turns into the summary in the background
+        self.compactor.schedule(session)
+        
         return OutboundMessage(
             channel=msg.channel,
             chat_id=msg.chat_id,
-            content=final_content
+            content=final_content,
+            # Lets channels match the reply to the inbound message
+            metadata=dict(msg.metadata),
+            stream_id=stream_id,
         )
     
-    async def _process_system_message(self, msg: InboundMessage) -> OutboundMessage | None:
+    async def _run_agent_loop(
+        self,
+        messages: list[dict[str, Any]],
+        channel: str,
+        chat_id: str,
+        stream_id: str | None = None,
+    ) -> str | None:
+        """
+        Run the LLM / tool-call loop until the model stops calling tools.
+        
+        Args:
+            messages: Initial messages; tool calls and results are appended in place.
+            channel: Channel the response goes to.
+            chat_id: Chat the response goes to.
+            stream_id: If set, stream partial content to the chat under this ID.
+                Text streamed before tool calls is finished as its own chat
+                message, so each step's text gets a message of its own.
+        
+        Returns:
+            The final response content, or None if the iteration limit was hit.
+        """
+        iteration = 0
+        turn_start = len(messages) - 1  # index of the current user message
+        
+        while iteration < self.max_iterations:
+            iteration += 1
+            
+            # Call LLM
+            with tracer.span("llm.chat", model=self.model, iteration=iteration, stream=bool(stream_id)) as span:
+                if stream_id:
+                    response = await self._stream_llm(messages, channel, chat_id, stream_id)
+                else:
+                    response = await self.provider.chat(
+                        messages=messages,
+                        tools=self.tool_selector.definitions(),
+                        model=self.model
+                    )
+                span.set(finish_reason=response.finish_reason, **response.usage)
+            self._log_usage(response)
+            self._track_provider_health(response)
+            
+            # Prompt too long: drop older history and retry the same step
+            if response.context_exceeded:
+                turn_start = self.context.trim_history(messages, turn_start)
+                if turn_start < 0:
+                    return response.content
+                logger.warning(f"Context window exceeded, retrying with {turn_start - 1} history messages")
+                iteration -= 1
+                continue
+            
+            # No tool calls, we're done
+            if not response.has_tool_calls:
+                return response.content
+            
+            # Add assistant message with tool calls
+            tool_call_dicts = [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.name,
+                        "arguments": json.dumps(tc.arguments)  # Must be JSON string
+                    }
+                }
+                for tc in response.tool_calls
+            ]
+            messages = self.context.add_assistant_message(
+                messages, response.content, tool_call_dicts
+            )
+            
+            # Finish the streamed text before the tools run; channels then
+            # start a new message for the next step's text
+            if stream_id and response.content:
+                await self.bus.publish_outbound(OutboundMessage(
+                    channel=channel,
+                    chat_id=chat_id,
+                    content=response.content,
+                    stream_id=stream_id,
+                    stream_only=True,
+                ))
+            
+            # Execute tools (independent read-only calls run concurrently);
+            # a call to a tool that was not offered enables it for the turn
+            for tool_call in response.tool_calls:
+                args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
+                logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
+            self.tool_selector.widen(tc.name for tc in response.tool_calls)
+            results = await self.tools.execute_batch(
+                [(tc.name, tc.arguments) for tc in response.tool_calls]
+            )
+            
+            # Results are appended in call order to keep the transcript valid;
+            # large ones are replaced by an artifact handle with a preview
+            for tool_call, result in zip(response.tool_calls, results):
+                if tool_call.name != "load_tools":
+                    self.tool_selector.observe(result)
+                if tool_call.name != "read_artifact":
+                    result = self.artifacts.spill(tool_call.name, result)
+                messages = self.context.add_tool_result(
+                    messages, tool_call.id, tool_call.name, result
+                )
+        
+        return None
+    
+    async def _stream_llm(
+        self,
+        messages: list[dict[str, Any]],
+        channel: str,
+        chat_id: str,
+        stream_id: str,
+    ) -> LLMResponse:
+        """Call the LLM in streaming mode, publishing partial content as it arrives."""
+        text = ""
+        last_flush = 0.0
+        started = time.monotonic()
+        response: LLMResponse | None = None
+        
+        try:
+            async for chunk in self.provider.chat_stream(
+                messages=messages,
+                tools=self.tool_selector.definitions(),
+                model=self.model
+            ):
+                if chunk.response is not None:
+                    response = chunk.response
+                    continue
+                if not chunk.delta:
+                    continue
+                if not text:
+                    span = tracer.current()
+                    if span:
+                        span.set(ttft_ms=round((time.monotonic() - started) * 1000, 1))
+                text += chunk.delta
+                now = time.monotonic()
+                # First delta goes out immediately, the rest are coalesced
+                if now - last_flush >= self.STREAM_FLUSH_INTERVAL_S:
+                    last_flush = now
+                    await self.bus.publish_outbound(OutboundMessage(
+                        channel=channel,
+                        chat_id=chat_id,
+                        content=text,
+                        stream_id=stream_id,
+                        partial=True,
+                    ))
+        except asyncio.CancelledError:
+            # Close the streamed message so the channel stops tracking it
+            if text:
+                await self.bus.publish_outbound(OutboundMessage(
+                    channel=channel,
+                    chat_id=chat_id,
+                    content=f"{text} …",
+                    stream_id=stream_id,
+                    stream_only=True,
+                ))
+            raise
+        
+        return response or LLMResponse(content=text or None)
+    
+    def _save_interrupted_turn(self, session: Session, user_content: str, messages: list[dict[str, Any]]) -> None:
+        """
+        Record a cancelled turn in the session.
+        
+        The tools started are listed, so the next turn knows which
+        side effects happened before the interruption.
+        """
+        last_user = max(i for i, m in enumerate(messages) if m["role"] == "user")
+        calls = [
+            f"{tc['function']['name']}({tc['function']['arguments'][:100]})"
+            for m in messages[last_user + 1:]
+            if m["role"] == "assistant"
+            for tc in m.get("tool_calls") or []
+        ]
+        note = "[Interrupted by the user before finishing.]"
+        if calls:
+            note += " Tools started before the interruption: " + "; ".join(calls)
+        
+        session.add_message("user", user_content)
+        session.add_message("assistant", note)
+        self.sessions.save(session)
+    
+    def _select_tools(self, content: str, history: list[dict[str, Any]]) -> None:
+        """Start the turn's tool selection from the message and the last exchange."""
+        if not self.select_tools:
+            return
+        recent = [m["content"] for m in history[-2:] if isinstance(m.get("content"), str)]
+        self.tool_selector.begin(content, *recent)
+        # Skills in the prompt that need a CLI are used through exec
+        if any(r.bins for r in self.context.preloaded_skills("\n".join([content, *recent]))):
+            self.tool_selector.widen(["exec"])
+    
+    def _track_provider_health(self, response: LLMResponse) -> None:
+        """Mark the provider degraded after repeated failed calls, so low-priority work is held back."""
+        if response.finish_reason == "error":
+            self._llm_failures += 1
+        else:
+            self._llm_failures = 0
+        self.bus.set_degraded(self._llm_failures >= self.DEGRADED_AFTER_FAILURES)
+    
+    @staticmethod
+    def _log_usage(response: LLMResponse) -> None:
+        """Log token usage of an LLM call, including prompt-cache hits and writes."""
+        usage = response.usage
+        if not usage:
+            return
+        prompt = usage.get("prompt_tokens", 0)
+        cache_read = usage.get("cache_read_tokens", 0)
+        cache_write = usage.get("cache_write_tokens", 0)
+        hit_rate = cache_read / prompt if prompt else 0.0
+        logger.debug(
+            f"LLM usage: prompt={prompt} completion={usage.get('completion_tokens', 0)} "
+            f"cache_read={cache_read} cache_write={cache_write} ({hit_rate:.0%} cached)"
+        )
+    
+    async def _process_system_message(self, msg: InboundMessage, stream_id: str | None = None) -> OutboundMessage | None:
         """
         Process a system message (e.g., subagent announce).
         
@@ -270,65 +763,26 @@ class AgentLoop:
         session = self.sessions.get_or_create(session_key)
         
         # Update tool contexts
-        message_tool = self.tools.get("message")
-        if isinstance(message_tool, MessageTool):
-            message_tool.set_context(origin_channel, origin_chat_id)
+        self._set_tool_context(origin_channel, origin_chat_id)
         
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(origin_channel, origin_chat_id)
-        
-        cron_tool = self.tools.get("cron")
-        if isinstance(cron_tool, CronTool):
-            cron_tool.set_context(origin_channel, origin_chat_id)
+        history = session.get_history(max_messages=self._history_limit)
+        self._select_tools(msg.content, history)
         
         # Build messages with the announce content
         messages = self.context.build_messages(
-            history=session.get_history(),
+            history=history,
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
+            tools=self.tool_selector.definitions(),
         )
         
         # Agent loop (limited for announce handling)
-        iteration = 0
-        final_content = None
-        
-        while iteration < self.max_iterations:
-            iteration += 1
-            
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
-            
-            if response.has_tool_calls:
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
-                
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
-            else:
-                final_content = response.content
-                break
+        try:
+            final_content = await self._run_agent_loop(messages, origin_channel, origin_chat_id, stream_id)
+        except asyncio.CancelledError:
+            self._save_interrupted_turn(session, f"[System: {msg.sender_id}] {msg.content}", messages)
+            raise
         
         if final_content is None:
             final_content = "Background task completed."
@@ -338,10 +792,14 @@ class AgentLoop:
         session.add_message("assistant", final_content)
         self.sessions.save(session)
         
+        # Fold older turns into the summary in the background
+        self.compactor.schedule(session)
+        
         return OutboundMessage(
             channel=origin_channel,
             chat_id=origin_chat_id,
-            content=final_content
+            content=final_content,
+            stream_id=stream_id,
         )
     
     async def process_direct(
@@ -350,25 +808,53 @@ class AgentLoop:
         session_key: str = "cli:direct",
         channel: str = "cli",
         chat_id: str = "direct",
+        lane: str | None = None,
     ) -> str:
         """
         Process a message directly (for CLI or cron usage).
         
+        With a lane given and the loop running, the message is queued on the
+        bus in that lane (subject to its priority, capacity and shedding) and
+        the call waits for the result; otherwise it is processed right away.
+        
         Args:
             content: The message content.
             session_key: Session identifier.
             channel: Source channel (for context).
             chat_id: Source chat ID (for context).
+            lane: Priority lane, e.g. "cron" or "heartbeat".
         
         Returns:
             The agent's response.
+        
+        Raises:
+            LoadShedError: If the queued message was dropped by load shedding.
         """
         msg = InboundMessage(
             channel=channel,
             sender_id="user",
             chat_id=chat_id,
-            content=content
+            content=content,
+            lane=lane,
         )
         
+        if lane and self._running:
+            waiter: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+            self._waiters[id(msg)] = waiter
+            # If the lane is full, _on_shed fails the waiter right away
+            await self.bus.publish_inbound(msg)
+            return await waiter
+        
         response = await self._process_message(msg)
         return response.content if response else ""
+    
+    async def consolidate_memory(self) -> str:
+        """
+        Fold old daily notes into MEMORY.md (run by the built-in cron job).
+        
+        Raises:
+            LoadShedError: If the agent is overloaded (the job runs again next time).
+        """
+        if self.bus.inbound.overloaded:
+            raise LoadShedError("memory consolidation deferred: agent overloaded")
+        return await self.consolidator.run()
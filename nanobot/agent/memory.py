@@ -1,9 +1,47 @@
 """Memory system for persistent agent memory."""
 
+import atexit
+import os
+import re
+import threading
+import weakref
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+from typing import Callable
 
 from nanobot.utils.helpers import ensure_dir, today_date
+from nanobot.utils.search import BM25Index, tokenize
+
+# Target size of an indexed memory chunk (paragraphs are kept whole)
+CHUNK_CHARS = 800
+
+_HEADING = re.compile(r"^#{1,6}\s+(.*)$")
+_DATED_NOTE = re.compile(r"^\d{4}-\d{2}-\d{2}\.md$")
+
+FSYNC_POLICIES = ("never", "flush", "always")
+
+
+def atomic_write(path: Path, content: str) -> None:
+    """Replace a file's content via a synced temp file and rename (never leaves it torn)."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# Stores whose buffered appends are written at exit (held weakly)
+_stores: "weakref.WeakSet[MemoryStore]" = weakref.WeakSet()
+
+
+def _flush_stores() -> None:
+    for store in list(_stores):
+        store.flush()
+
+
+atexit.register(_flush_stores)
 
 
 class MemoryStore:
@@ -11,37 +49,128 @@ class MemoryStore:
     Memory system for the agent.
     
     Supports daily notes (memory/YYYY-MM-DD.md) and long-term memory (MEMORY.md).
+    
+    Daily notes are appended, not rewritten: appends collect in a buffer
+    that is written out when it reaches ``flush_bytes`` or ``flush_interval_s``
+    after the first buffered append (and at exit). Reads return the file
+    plus the buffer under the same lock as writes, so they never see a
+    partial append. ``fsync`` controls durability: "never" leaves syncing
+    to the OS, "flush" syncs after each buffer write, "always" writes and
+    syncs every append immediately.
     """
     
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        flush_interval_s: float = 1.0,
+        flush_bytes: int = 64 * 1024,
+        fsync: str = "never",
+    ):
+        """
+        Args:
+            workspace: Agent workspace (memory lives in workspace/memory).
+            flush_interval_s: Longest time an append stays buffered.
+            flush_bytes: Buffered size that triggers a write.
+            fsync: "never", "flush" or "always".
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
         self.workspace = workspace
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
+        self.flush_interval_s = flush_interval_s
+        self.flush_bytes = flush_bytes
+        self.fsync = fsync
+        # Pending appends and the note file they belong to
+        self._buffer: list[str] = []
+        self._buffer_file: Path | None = None
+        self._buffer_size = 0
+        self._lock = threading.RLock()
+        self._timer: threading.Timer | None = None
+        self.index = MemoryIndex(self.memory_dir, read=self._read_note, pending=self._pending_note)
+        _stores.add(self)
     
     def get_today_file(self) -> Path:
         """Get path to today's memory file."""
         return self.memory_dir / f"{today_date()}.md"
     
     def read_today(self) -> str:
-        """Read today's memory notes."""
-        today_file = self.get_today_file()
-        if today_file.exists():
-            return today_file.read_text(encoding="utf-8")
-        return ""
+        """Read today's memory notes (including appends not written yet)."""
+        return self._read_note(self.get_today_file())
     
     def append_today(self, content: str) -> None:
         """Append content to today's memory notes."""
         today_file = self.get_today_file()
         
-        if today_file.exists():
-            existing = today_file.read_text(encoding="utf-8")
-            content = existing + "\n" + content
-        else:
-            # Add header for new day
-            header = f"# {today_date()}\n\n"
-            content = header + content
+        with self._lock:
+            if self._buffer_file and self._buffer_file != today_file:
+                # The day changed: earlier appends go to their own day's file
+                self.flush()
+            
+            if self._buffer or today_file.exists():
+                entry = "\n" + content
+            else:
+                # Add header for new day
+                entry = f"# {today_date()}\n\n" + content
+            
+            self._buffer.append(entry)
+            self._buffer_file = today_file
+            self._buffer_size += len(entry)
+            
+            if self.fsync == "always" or self._buffer_size >= self.flush_bytes:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval_s, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def flush(self) -> None:
+        """Write buffered appends to their note file."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if not self._buffer:
+                return
+            with open(self._buffer_file, "a", encoding="utf-8") as f:
+                f.write("".join(self._buffer))
+                if self.fsync != "never":
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._buffer.clear()
+            self._buffer_size = 0
+            self._buffer_file = None
+    
+    @property
+    def pending_bytes(self) -> int:
+        """Size of the appends not written yet."""
+        return self._buffer_size
+    
+    def rewrite_note(self, path: Path, content: str) -> None:
+        """
+        Replace a daily note's content atomically (e.g. after compacting it).
         
-        today_file.write_text(content, encoding="utf-8")
+        Pending appends to the note are written first, so none are lost.
+        """
+        with self._lock:
+            if self._buffer_file == path:
+                self.flush()
+            atomic_write(path, content)
+    
+    def _pending_note(self) -> tuple[str, int] | None:
+        """Get the file name and size of the buffered appends, if any."""
+        with self._lock:
+            if not self._buffer:
+                return None
+            return self._buffer_file.name, self._buffer_size
+    
+    def _read_note(self, path: Path) -> str:
+        """Read a note file plus any appends still buffered for it."""
+        with self._lock:
+            content = path.read_text(encoding="utf-8") if path.exists() else ""
+            if self._buffer_file == path:
+                content += "".join(self._buffer)
+            return content
     
     def read_long_term(self) -> str:
         """Read long-term memory (MEMORY.md)."""
@@ -51,7 +180,7 @@ class MemoryStore:
     
     def write_long_term(self, content: str) -> None:
         """Write to long-term memory (MEMORY.md)."""
-        self.memory_file.write_text(content, encoding="utf-8")
+        atomic_write(self.memory_file, content)
     
     def get_recent_memories(self, days: int = 7) -> str:
         """
@@ -71,10 +200,8 @@ class MemoryStore:
         for i in range(days):
             date = today - timedelta(days=i)
             date_str = date.strftime("%Y-%m-%d")
-            file_path = self.memory_dir / f"{date_str}.md"
-            
-            if file_path.exists():
-                content = file_path.read_text(encoding="utf-8")
+            content = self._read_note(self.memory_dir / f"{date_str}.md")
+            if content:
                 memories.append(content)
         
         return "\n\n---\n\n".join(memories)
@@ -107,3 +234,150 @@ class MemoryStore:
             parts.append("## Today's Notes\n" + today)
         
         return "\n\n".join(parts) if parts else ""
+
+
+@dataclass
+class MemoryChunk:
+    """A section of a memory file."""
+    source: str  # File name, e.g. "MEMORY.md" or "2026-01-31.md"
+    heading: str
+    text: str
+    score: float = 0.0
+    
+    def format(self) -> str:
+        """Render the chunk with its origin."""
+        origin = f"{self.source} > {self.heading}" if self.heading else self.source
+        return f"[{origin}]\n{self.text}"
+
+
+def chunk_markdown(source: str, content: str, max_chars: int = CHUNK_CHARS) -> list[MemoryChunk]:
+    """
+    Split a markdown file into chunks under their nearest heading.
+    
+    Consecutive paragraphs of a section are merged up to ``max_chars``;
+    a longer paragraph becomes a chunk of its own.
+    """
+    chunks: list[MemoryChunk] = []
+    heading = ""
+    buffer: list[str] = []
+    
+    def flush() -> None:
+        if buffer:
+            chunks.append(MemoryChunk(source, heading, "\n\n".join(buffer)))
+            buffer.clear()
+    
+    for block in re.split(r"\n\s*\n", content):
+        block = block.strip()
+        if not block:
+            continue
+        lines = block.split("\n")
+        match = _HEADING.match(lines[0])
+        if match:
+            flush()
+            heading = match.group(1).strip()
+            block = "\n".join(lines[1:]).strip()
+            if not block:
+                continue
+        if buffer and sum(len(b) for b in buffer) + len(block) > max_chars:
+            flush()
+        buffer.append(block)
+    flush()
+    return chunks
+
+
+class MemoryIndex:
+    """
+    Searchable index over MEMORY.md and the dated notes.
+    
+    Files are chunked by heading and paragraph and ranked with BM25. Each
+    search stats the memory files and re-chunks only those that changed,
+    so edits by the agent (or the user) are picked up on the next search.
+    Appends still buffered by the MemoryStore are indexed with their file
+    without flushing them.
+    """
+    
+    def __init__(
+        self,
+        memory_dir: Path,
+        read: Callable[[Path], str] | None = None,
+        pending: Callable[[], tuple[str, int] | None] | None = None,
+    ):
+        """
+        Args:
+            memory_dir: Directory of MEMORY.md and the daily notes.
+            read: Reads a file's content (e.g. including buffered appends).
+            pending: Gets the file name and size of buffered appends, if any.
+        """
+        self.memory_dir = memory_dir
+        self.read = read or (lambda path: path.read_text(encoding="utf-8"))
+        self.pending = pending
+        # file name -> (stat key + buffered size, chunks)
+        self._files: dict[str, tuple[tuple[int, ...], list[MemoryChunk]]] = {}
+        self._chunks: list[MemoryChunk] = []
+        self._index: BM25Index | None = None
+    
+    def refresh(self) -> bool:
+        """
+        Bring the index up to date with the memory files.
+        
+        Returns:
+            True if any file was added, changed or removed.
+        """
+        pending = self.pending() if self.pending else None
+        current: dict[str, tuple[int, ...]] = {}
+        try:
+            with os.scandir(self.memory_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and (entry.name == "MEMORY.md" or _DATED_NOTE.match(entry.name)):
+                        st = entry.stat()
+                        current[entry.name] = (st.st_mtime_ns, st.st_size, st.st_ino, 0)
+        except OSError:
+            pass
+        if pending:
+            # The buffered size tells appends apart; the file may not exist yet
+            name, size = pending
+            current[name] = current.get(name, (0, 0, 0, 0))[:3] + (size,)
+        
+        changed = current.keys() != self._files.keys()
+        files = {}
+        for name, key in current.items():
+            cached = self._files.get(name)
+            if cached and cached[0] == key:
+                files[name] = cached
+                continue
+            try:
+                content = self.read(self.memory_dir / name)
+            except OSError:
+                continue
+            files[name] = (key, chunk_markdown(name, content))
+            changed = True
+        
+        if changed or self._index is None:
+            self._files = files
+            # Long-term memory first, then notes newest first (ties rank in this order)
+            notes = sorted((n for n in files if n != "MEMORY.md"), reverse=True)
+            names = (["MEMORY.md"] if "MEMORY.md" in files else []) + notes
+            self._chunks = [chunk for name in names for chunk in files[name][1]]
+            self._index = BM25Index([tokenize(f"{c.heading}\n{c.heading}\n{c.text}") for c in self._chunks])
+        return changed
+    
+    def search(self, query: str, k: int = 5) -> list[MemoryChunk]:
+        """
+        Find the memory chunks most relevant to a query.
+        
+        Args:
+            query: Text to match (e.g. the user's message).
+            k: Maximum number of chunks.
+        
+        Returns:
+            Matching chunks with their scores, best first.
+        """
+        terms = tokenize(query)
+        if not terms or k <= 0:
+            return []
+        self.refresh()
+        results = []
+        for i, score in self._index.top(terms, k):
+            chunk = self._chunks[i]
+            results.append(MemoryChunk(chunk.source, chunk.heading, chunk.text, score))
+        return results
@@ -4,24 +4,305 @@ import json
 import os
 import re
 import shutil
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.utils.search import BM25Index, tokenize
 
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+# Bump when SkillRecord changes, so stale cache files are ignored
+CATALOG_VERSION = 1
+
+
+def _stat_key(path: Path) -> list[int] | None:
+    """Identify a file version by mtime, size and inode (None if missing)."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+@dataclass
+class SkillRecord:
+    """Parsed frontmatter and requirements of one SKILL.md."""
+    name: str
+    path: str
+    source: str  # "workspace" or "builtin"
+    stat: list[int]
+    description: str
+    always: bool = False
+    bins: list[str] = field(default_factory=list)
+    env: list[str] = field(default_factory=list)
+    metadata: dict[str, str] = field(default_factory=dict)  # Raw frontmatter
+    missing: list[str] = field(default_factory=list)  # Unmet requirements, e.g. "CLI: gh"
+
+    @property
+    def available(self) -> bool:
+        return not self.missing
+
+
+def parse_frontmatter(content: str) -> dict[str, str] | None:
+    """Parse the simple YAML frontmatter of a skill (None if there is none)."""
+    if content.startswith("---"):
+        match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
+        if match:
+            metadata = {}
+            for line in match.group(1).split("\n"):
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    metadata[key.strip()] = value.strip().strip('"\'')
+            return metadata
+    return None
+
+
+def _parse_nanobot_metadata(raw: str) -> dict:
+    """Parse nanobot metadata JSON from frontmatter."""
+    try:
+        data = json.loads(raw)
+        return data.get("nanobot", {}) if isinstance(data, dict) else {}
+    except (json.JSONDecodeError, TypeError):
+        return {}
+
+
+class SkillCatalog:
+    """
+    Parsed records of all skills, refreshed incrementally.
+
+    ``refresh`` first checks the skill roots, the known SKILL.md files and
+    PATH with one stat each; only if something changed are the roots listed
+    again and new or changed files read and parsed. Requirement checks are
+    re-evaluated on such a rescan, with ``shutil.which`` results memoized
+    until PATH changes. ``records`` and ``get`` serve the records of the
+    last refresh. ``version`` increases whenever any record or its
+    availability changes, so callers can cache what they derive from it.
+
+    With a cache file, records are persisted and reused on the next start
+    for files that have not changed.
+    """
+
+    def __init__(self, roots: list[tuple[Path, str]], cache_path: Path | None = None):
+        """
+        Args:
+            roots: Skill directories with their source name, highest priority first.
+            cache_path: Optional JSON file to persist parsed records in.
+        """
+        self.roots = roots
+        self.cache_path = cache_path
+        self.version = 0
+        self._records: dict[str, SkillRecord] = {}
+        # Parsed records by SKILL.md path, reused while the file is unchanged
+        self._parsed: dict[str, SkillRecord] = self._load_cache()
+        self._which: dict[str, bool] = {}
+        self._path = os.environ.get("PATH", "")
+        # Skill directories without a SKILL.md, watched for one being added
+        self._empty_dirs: list[Path] = []
+        # What the last scan saw (see _state); None = never scanned
+        self._state: list[Any] | None = None
+
+    def refresh(self) -> bool:
+        """
+        Bring the records up to date with the skill directories.
+
+        Returns:
+            True if any record or its availability changed.
+        """
+        if self._current_state() == self._state:
+            return False
+
+        if self._path != os.environ.get("PATH", ""):
+            self._path = os.environ.get("PATH", "")
+            self._which.clear()
+
+        # Taken first: records are reused and their availability updated in place
+        before = self._summary(self._records)
+        records: dict[str, SkillRecord] = {}
+        parsed: dict[str, SkillRecord] = {}
+        # Stats are taken before what they cover is read, so a change made
+        # during the scan shows up in the next refresh
+        root_stats: list[list[int] | None] = []
+        empty_dirs: list[Path] = []
+        empty_stats: list[list[int] | None] = []
+        reparsed = False
+        for root, source in self.roots:
+            root_stats.append(_stat_key(root) if root else None)
+            if not root or not root.is_dir():
+                continue
+            with os.scandir(root) as entries:
+                names = sorted(e.name for e in entries if e.is_dir())
+            for name in names:
+                if name in records:
+                    continue  # Shadowed by a higher-priority root
+                dir_stat = _stat_key(root / name)
+                skill_file = root / name / "SKILL.md"
+                stat = _stat_key(skill_file)
+                if stat is None:
+                    empty_dirs.append(root / name)
+                    empty_stats.append(dir_stat)
+                    continue
+                record = self._parsed.get(str(skill_file))
+                if record is None or record.stat != stat or record.source != source:
+                    record = self._parse(name, skill_file, source, stat)
+                    reparsed = True
+                record.missing = self._missing(record)
+                records[name] = record
+                parsed[str(skill_file)] = record
+
+        files_changed = reparsed or parsed.keys() != self._parsed.keys()
+        changed = self._state is None or files_changed or self._summary(records) != before
+        self._records = records
+        self._parsed = parsed
+        self._empty_dirs = empty_dirs
+        self._state = self._current_state(root_stats, empty_stats)
+        if files_changed:
+            self._save_cache()
+        if changed:
+            self.version += 1
+        return changed
+
+    def records(self) -> list[SkillRecord]:
+        """Get all skill records as of the last refresh, workspace skills first."""
+        if self._state is None:
+            self.refresh()
+        return list(self._records.values())
+
+    def get(self, name: str) -> SkillRecord | None:
+        """Get a skill record by name as of the last refresh."""
+        if self._state is None:
+            self.refresh()
+        return self._records.get(name)
+
+    def _current_state(
+        self,
+        root_stats: list[list[int] | None] | None = None,
+        empty_stats: list[list[int] | None] | None = None,
+    ) -> list[Any]:
+        """
+        Cheap snapshot of what the records depend on.
+
+        One stat per root (its mtime changes when a skill directory is added
+        or removed), per known SKILL.md and per skill directory still lacking
+        one, plus PATH and the required environment variables. A scan passes
+        the stats it took instead of taking new ones.
+        """
+        records = self._records.values()
+        if root_stats is None:
+            root_stats = [_stat_key(root) if root else None for root, _ in self.roots]
+            file_stats = [_stat_key(Path(r.path)) for r in records]
+        else:
+            file_stats = [r.stat for r in records]
+        if empty_stats is None:
+            empty_stats = [_stat_key(d) for d in self._empty_dirs]
+        return [
+            os.environ.get("PATH", ""),
+            root_stats,
+            file_stats,
+            empty_stats,
+            [bool(os.environ.get(env)) for r in records for env in r.env],
+        ]
+
+    def _parse(self, name: str, path: Path, source: str, stat: list[int]) -> SkillRecord:
+        """Read and parse one SKILL.md."""
+        try:
+            meta = parse_frontmatter(path.read_text(encoding="utf-8")) or {}
+        except OSError:
+            meta = {}
+        skill_meta = _parse_nanobot_metadata(meta.get("metadata", ""))
+        requires = skill_meta.get("requires", {})
+        return SkillRecord(
+            name=name,
+            path=str(path),
+            source=source,
+            stat=stat,
+            description=meta.get("description") or name,
+            always=bool(skill_meta.get("always") or meta.get("always")),
+            bins=list(requires.get("bins", [])),
+            env=list(requires.get("env", [])),
+            metadata=meta,
+        )
+
+    def _missing(self, record: SkillRecord) -> list[str]:
+        """Get the unmet requirements of a skill."""
+        missing = []
+        for b in record.bins:
+            if b not in self._which:
+                self._which[b] = shutil.which(b) is not None
+            if not self._which[b]:
+                missing.append(f"CLI: {b}")
+        for env in record.env:
+            if not os.environ.get(env):
+                missing.append(f"ENV: {env}")
+        return missing
+
+    @staticmethod
+    def _summary(records: dict[str, SkillRecord]) -> list[tuple[str, str, list[str]]]:
+        return [(r.name, r.path, r.missing) for r in records.values()]
+
+    def _load_cache(self) -> dict[str, SkillRecord]:
+        """Load persisted records (empty if missing, stale or unreadable)."""
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            if data.get("version") != CATALOG_VERSION:
+                return {}
+            return {r["path"]: SkillRecord(**r) for r in data.get("records", [])}
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring skills cache {self.cache_path}: {e}")
+            return {}
+
+    def _save_cache(self) -> None:
+        """Persist the parsed records."""
+        if not self.cache_path:
+            return
+        data = {
+            "version": CATALOG_VERSION,
+            "records": [asdict(r) for r in self._parsed.values()],
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write skills cache {self.cache_path}: {e}")
+
 
 class SkillsLoader:
     """
     Loader for agent skills.
     
     Skills are markdown files (SKILL.md) that teach the agent how to use
-    specific tools or perform certain tasks.
+    specific tools or perform certain tasks. Their metadata is served from
+    a SkillCatalog, so each file is parsed once until it changes.
     """
     
-    def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
+    def __init__(
+        self,
+        workspace: Path,
+        builtin_skills_dir: Path | None = None,
+        cache_path: Path | None = None,
+    ):
+        """
+        Args:
+            workspace: Agent workspace (skills under workspace/skills).
+            builtin_skills_dir: Built-in skills directory.
+            cache_path: Optional file to persist parsed skill metadata in.
+        """
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self.catalog = SkillCatalog(
+            [(self.workspace_skills, "workspace"), (self.builtin_skills, "builtin")],
+            cache_path=cache_path,
+        )
+        # (catalog version, skill names, index) for relevance ranking
+        self._index: tuple[int, list[str], BM25Index] | None = None
     
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -33,28 +314,11 @@ class SkillsLoader:
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
-        skills = []
-        
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-        
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-        
-        # Filter by requirements
-        if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
-        return skills
+        return [
+            {"name": r.name, "path": r.path, "source": r.source}
+            for r in self.catalog.records()
+            if r.available or not filter_unavailable
+        ]
     
     def load_skill(self, name: str) -> str | None:
         """
@@ -66,18 +330,13 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-        
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-        
-        return None
+        record = self.catalog.get(name)
+        if not record:
+            return None
+        try:
+            return Path(record.path).read_text(encoding="utf-8")
+        except OSError:
+            return None
     
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
@@ -98,65 +357,80 @@ class SkillsLoader:
         
         return "\n\n---\n\n".join(parts) if parts else ""
     
-    def build_skills_summary(self) -> str:
+    def build_skills_summary(self, names: list[str] | None = None) -> str:
         """
         Build a summary of all skills (name, description, path, availability).
         
         This is used for progressive loading - the agent can read the full
         skill content using read_file when needed.
         
+        Args:
+            names: Only summarize these skills (in this order).
+        
         Returns:
             XML-formatted skills summary.
         """
-        all_skills = self.list_skills(filter_unavailable=False)
-        if not all_skills:
+        records = self.catalog.records()
+        if names is not None:
+            by_name = {r.name: r for r in records}
+            records = [by_name[n] for n in names if n in by_name]
+        if not records:
             return ""
         
         def escape_xml(s: str) -> str:
             return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
         
         lines = ["<skills>"]
-        for s in all_skills:
-            name = escape_xml(s["name"])
-            path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
-            available = self._check_requirements(skill_meta)
-            
-            lines.append(f"  <skill available=\"{str(available).lower()}\">")
-            lines.append(f"    <name>{name}</name>")
-            lines.append(f"    <description>{desc}</description>")
-            lines.append(f"    <location>{path}</location>")
+        for r in records:
+            lines.append(f"  <skill available=\"{str(r.available).lower()}\">")
+            lines.append(f"    <name>{escape_xml(r.name)}</name>")
+            lines.append(f"    <description>{escape_xml(r.description)}</description>")
+            lines.append(f"    <location>{r.path}</location>")
             
             # Show missing requirements for unavailable skills
-            if not available:
-                missing = self._get_missing_requirements(skill_meta)
-                if missing:
-                    lines.append(f"    <requires>{escape_xml(missing)}</requires>")
+            if r.missing:
+                lines.append(f"    <requires>{escape_xml(', '.join(r.missing))}</requires>")
             
             lines.append(f"  </skill>")
         lines.append("</skills>")
         
         return "\n".join(lines)
     
-    def _get_missing_requirements(self, skill_meta: dict) -> str:
-        """Get a description of missing requirements."""
-        missing = []
-        requires = skill_meta.get("requires", {})
-        for b in requires.get("bins", []):
-            if not shutil.which(b):
-                missing.append(f"CLI: {b}")
-        for env in requires.get("env", []):
-            if not os.environ.get(env):
-                missing.append(f"ENV: {env}")
-        return ", ".join(missing)
+    def rank(self, text: str, k: int) -> list[tuple[str, float]]:
+        """
+        Rank skills by relevance to a text (BM25 over name, description and body).
+        
+        Args:
+            text: The message (and recent history) to match.
+            k: Maximum number of skills to return.
+        
+        Returns:
+            (skill name, score) pairs with a positive score, best first.
+        """
+        query = tokenize(text)
+        if not query or k <= 0:
+            return []
+        names, index = self._get_index()
+        return [(names[i], score) for i, score in index.top(query, k)]
     
-    def _get_skill_description(self, name: str) -> str:
-        """Get the description of a skill from its frontmatter."""
-        meta = self.get_skill_metadata(name)
-        if meta and meta.get("description"):
-            return meta["description"]
-        return name  # Fallback to skill name
+    def _get_index(self) -> tuple[list[str], BM25Index]:
+        """Get the ranking index, rebuilt when the catalog changes."""
+        records = self.catalog.records()
+        if self._index and self._index[0] == self.catalog.version:
+            return self._index[1], self._index[2]
+        
+        names, documents = [], []
+        for r in records:
+            try:
+                body = self._strip_frontmatter(Path(r.path).read_text(encoding="utf-8"))
+            except OSError:
+                body = ""
+            # Name and description say what a skill is for; weight them over the body
+            documents.append(tokenize(r.name) * 3 + tokenize(r.description) * 2 + tokenize(body))
+            names.append(r.name)
+        index = BM25Index(documents)
+        self._index = (self.catalog.version, names, index)
+        return names, index
     
     def _strip_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content."""
@@ -166,39 +440,9 @@ class SkillsLoader:
                 return content[match.end():].strip()
         return content
     
-    def _parse_nanobot_metadata(self, raw: str) -> dict:
-        """Parse nanobot metadata JSON from frontmatter."""
-        try:
-            data = json.loads(raw)
-            return data.get("nanobot", {}) if isinstance(data, dict) else {}
-        except (json.JSONDecodeError, TypeError):
-            return {}
-    
-    def _check_requirements(self, skill_meta: dict) -> bool:
-        """Check if skill requirements are met (bins, env vars)."""
-        requires = skill_meta.get("requires", {})
-        for b in requires.get("bins", []):
-            if not shutil.which(b):
-                return False
-        for env in requires.get("env", []):
-            if not os.environ.get(env):
-                return False
-        return True
-    
-    def _get_skill_meta(self, name: str) -> dict:
-        """Get nanobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_nanobot_metadata(meta.get("metadata", ""))
-    
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
-        result = []
-        for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_nanobot_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
-                result.append(s["name"])
-        return result
+        return [r.name for r in self.catalog.records() if r.always and r.available]
     
     def get_skill_metadata(self, name: str) -> dict | None:
         """
@@ -210,19 +454,7 @@ class SkillsLoader:
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
+        record = self.catalog.get(name)
+        if not record or not record.metadata:
             return None
-        
-        if content.startswith("---"):
-            match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-            if match:
-                # Simple YAML parsing
-                metadata = {}
-                for line in match.group(1).split("\n"):
-                    if ":" in line:
-                        key, value = line.split(":", 1)
-                        metadata[key.strip()] = value.strip().strip('"\'')
-                return metadata
-        
-        return None
+        return dict(record.metadata)
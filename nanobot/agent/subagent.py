@@ -11,10 +11,14 @@ from loguru import logger
 from nanobot.bus.events import InboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
+from nanobot.providers.router import set_route
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.tools.artifact import ReadArtifactTool
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.tracing import tracer
 
 
 class SubagentManager:
@@ -35,6 +39,8 @@ class SubagentManager:
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
+        max_parallel_tools: int = 4,
+        artifacts: ArtifactStore | None = None,
     ):
         from nanobot.config.schema import ExecToolConfig
         self.provider = provider
@@ -44,6 +50,9 @@ class SubagentManager:
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
+        self.max_parallel_tools = max_parallel_tools
+        # Large tool results are stored with the artifacts of the origin session
+        self.artifacts = artifacts
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
     
     async def spawn(
@@ -93,88 +102,110 @@ class SubagentManager:
         origin: dict[str, str],
     ) -> None:
         """Execute the subagent task and announce the result."""
-        logger.info(f"Subagent [{task_id}] starting task: {label}")
-        
-        try:
-            # Build subagent tools (no message tool, no spawn tool)
-            tools = ToolRegistry()
-            allowed_dir = self.workspace if self.restrict_to_workspace else None
-            tools.register(ReadFileTool(allowed_dir=allowed_dir))
-            tools.register(WriteFileTool(allowed_dir=allowed_dir))
-            tools.register(ListDirTool(allowed_dir=allowed_dir))
-            tools.register(ExecTool(
-                working_dir=str(self.workspace),
-                timeout=self.exec_config.timeout,
-                restrict_to_workspace=self.restrict_to_workspace,
-            ))
-            tools.register(WebSearchTool(api_key=self.brave_api_key))
-            tools.register(WebFetchTool())
-            
-            # Build messages with subagent-specific prompt
-            system_prompt = self._build_subagent_prompt(task)
-            messages: list[dict[str, Any]] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": task},
-            ]
-            
-            # Run agent loop (limited iterations)
-            max_iterations = 15
-            iteration = 0
-            final_result: str | None = None
+        # Subagents get their own trace, linked to the turn that spawned them
+        parent = tracer.current()
+        with tracer.span(
+            "subagent",
+            new_trace=True,
+            task_id=task_id,
+            label=label,
+            origin_trace=parent.trace_id if parent else None,
+        ):
+            logger.info(f"Subagent [{task_id}] starting task: {label}")
+            set_route("subagent")
             
-            while iteration < max_iterations:
-                iteration += 1
+            try:
+                # Build subagent tools (no message tool, no spawn tool)
+                tools = ToolRegistry(max_concurrency=self.max_parallel_tools)
+                allowed_dir = self.workspace if self.restrict_to_workspace else None
+                tools.register(ReadFileTool(allowed_dir=allowed_dir))
+                tools.register(WriteFileTool(allowed_dir=allowed_dir))
+                tools.register(ListDirTool(allowed_dir=allowed_dir))
+                tools.register(ExecTool(
+                    working_dir=str(self.workspace),
+                    timeout=self.exec_config.timeout,
+                    restrict_to_workspace=self.restrict_to_workspace,
+                ))
+                tools.register(WebSearchTool(api_key=self.brave_api_key))
+                tools.register(WebFetchTool())
+                spill = self.artifacts is not None and self.artifacts.threshold > 0
+                if spill:
+                    # Runs in this task's context, so the parent turn keeps its session
+                    self.artifacts.set_session(f"{origin['channel']}:{origin['chat_id']}")
+                    tools.register(ReadArtifactTool(self.artifacts))
                 
-                response = await self.provider.chat(
-                    messages=messages,
-                    tools=tools.get_definitions(),
-                    model=self.model,
-                )
+                # Build messages with subagent-specific prompt
+                system_prompt = self._build_subagent_prompt(task)
+                messages: list[dict[str, Any]] = [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": task},
+                ]
                 
-                if response.has_tool_calls:
-                    # Add assistant message with tool calls
-                    tool_call_dicts = [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.name,
-                                "arguments": json.dumps(tc.arguments),
-                            },
-                        }
-                        for tc in response.tool_calls
-                    ]
-                    messages.append({
-                        "role": "assistant",
-                        "content": response.content or "",
-                        "tool_calls": tool_call_dicts,
-                    })
+                # Run agent loop (limited iterations)
+                max_iterations = 15
+                iteration = 0
+                final_result: str | None = None
+                
+                while iteration < max_iterations:
+                    iteration += 1
+                    
+                    with tracer.span("llm.chat", model=self.model, iteration=iteration) as span:
+                        response = await self.provider.chat(
+                            messages=messages,
+                            tools=tools.get_definitions(),
+                            model=self.model,
+                        )
+                        span.set(finish_reason=response.finish_reason, **response.usage)
                     
-                    # Execute tools
-                    for tool_call in response.tool_calls:
-                        args_str = json.dumps(tool_call.arguments)
-                        logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                    if response.has_tool_calls:
+                        # Add assistant message with tool calls
+                        tool_call_dicts = [
+                            {
+                                "id": tc.id,
+                                "type": "function",
+                                "function": {
+                                    "name": tc.name,
+                                    "arguments": json.dumps(tc.arguments),
+                                },
+                            }
+                            for tc in response.tool_calls
+                        ]
                         messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "name": tool_call.name,
-                            "content": result,
+                            "role": "assistant",
+                            "content": response.content or "",
+                            "tool_calls": tool_call_dicts,
                         })
-                else:
-                    final_result = response.content
-                    break
-            
-            if final_result is None:
-                final_result = "Task completed but no final response was generated."
-            
-            logger.info(f"Subagent [{task_id}] completed successfully")
-            await self._announce_result(task_id, label, task, final_result, origin, "ok")
-            
-        except Exception as e:
-            error_msg = f"Error: {str(e)}"
-            logger.error(f"Subagent [{task_id}] failed: {e}")
-            await self._announce_result(task_id, label, task, error_msg, origin, "error")
+                        
+                        # Execute tools (independent read-only calls run concurrently)
+                        for tool_call in response.tool_calls:
+                            args_str = json.dumps(tool_call.arguments)
+                            logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
+                        results = await tools.execute_batch(
+                            [(tc.name, tc.arguments) for tc in response.tool_calls]
+                        )
+                        for tool_call, result in zip(response.tool_calls, results):
+                            if spill and tool_call.name != "read_artifact":
+                                result = self.artifacts.spill(tool_call.name, result)
+                            messages.append({
+                                "role": "tool",
+                                "tool_call_id": tool_call.id,
+                                "name": tool_call.name,
+                                "content": result,
+                            })
+                    else:
+                        final_result = response.content
+                        break
+                
+                if final_result is None:
+                    final_result = "Task completed but no final response was generated."
+                
+                logger.info(f"Subagent [{task_id}] completed successfully")
+                await self._announce_result(task_id, label, task, final_result, origin, "ok")
+                
+            except Exception as e:
+                error_msg = f"Error: {str(e)}"
+                logger.error(f"Subagent [{task_id}] failed: {e}")
+                await self._announce_result(task_id, label, task, error_msg, origin, "error")
     
     async def _announce_result(
         self,
@@ -0,0 +1,78 @@
+"""Per-turn selection of the tools offered to the model."""
+
+import re
+from contextvars import ContextVar
+from typing import Any, Iterable
+
+from loguru import logger
+
+from nanobot.agent.tools.registry import ToolRegistry
+
+_WORD = re.compile(r"[a-z0-9_]+")
+
+
+class ToolSelector:
+    """
+    Picks the tools relevant to the current turn.
+    
+    Each tool declares keyword prefixes; it is offered when a word of the
+    user's message, the recent history or a tool result starts with one of
+    them. Tools without keywords are always offered. The selection only
+    grows during a turn: the model can enable more tools with load_tools,
+    and calling a tool that was not offered enables it as well.
+    
+    The selection is held in a context variable (set once per turn), so
+    concurrent turns are independent. Outside a turn all tools are offered.
+    """
+    
+    def __init__(self, registry: ToolRegistry):
+        self.registry = registry
+        self._selected: ContextVar[set[str] | None] = ContextVar("tool_selection", default=None)
+    
+    def begin(self, *texts: str) -> None:
+        """Start a turn with the tools matching the given texts."""
+        selected = {
+            name for name in self.registry.tool_names
+            if not self.registry.get(name).keywords
+        }
+        self._selected.set(selected)
+        for text in texts:
+            self.observe(text)
+        logger.debug(f"Tools offered: {', '.join(sorted(selected))}")
+    
+    def observe(self, text: str) -> None:
+        """Add the tools matching a text (e.g. a tool result) to the turn's selection."""
+        selected = self._selected.get()
+        if selected is None or not text:
+            return
+        words = set(_WORD.findall(text.lower()))
+        for name in self.registry.tool_names:
+            if name in selected:
+                continue
+            keywords = self.registry.get(name).keywords
+            if any(word.startswith(k) for k in keywords for word in words):
+                selected.add(name)
+    
+    def widen(self, names: Iterable[str] | None = None) -> list[str]:
+        """
+        Offer more tools for the rest of the turn.
+        
+        Args:
+            names: Tools to add (unknown names are ignored); None adds all.
+        
+        Returns:
+            The names that were newly added.
+        """
+        selected = self._selected.get()
+        if selected is None:
+            return []
+        wanted = self.registry.tool_names if names is None else names
+        added = [n for n in wanted if n in self.registry and n not in selected]
+        selected.update(added)
+        if added:
+            logger.debug(f"Tools enabled: {', '.join(added)}")
+        return added
+    
+    def definitions(self) -> list[dict[str, Any]]:
+        """Get the definitions of the tools offered in the current turn."""
+        return self.registry.get_definitions(self._selected.get())
@@ -0,0 +1,74 @@
+"""Artifact tool for paging through large tool outputs."""
+
+from typing import Any, TYPE_CHECKING
+
+from nanobot.agent.tools.base import Tool
+
+if TYPE_CHECKING:
+    from nanobot.agent.artifacts import ArtifactStore
+
+
+class ReadArtifactTool(Tool):
+    """Tool to read a line or byte range of a stored artifact."""
+
+    effect = "read_only"
+    keywords = ("artifact",)
+
+    def __init__(self, store: "ArtifactStore"):
+        self._store = store
+
+    @property
+    def name(self) -> str:
+        return "read_artifact"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Read part of a large tool output that was stored as an artifact. "
+            "Give a line range (start_line/end_line, 1-based, inclusive) or a "
+            "byte range (offset/length)."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "id": {
+                    "type": "string",
+                    "description": "Artifact ID from the tool output"
+                },
+                "start_line": {
+                    "type": "integer",
+                    "description": "First line to read (1-based)",
+                    "minimum": 1
+                },
+                "end_line": {
+                    "type": "integer",
+                    "description": "Last line to read (inclusive)",
+                    "minimum": 1
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Byte offset to start reading at",
+                    "minimum": 0
+                },
+                "length": {
+                    "type": "integer",
+                    "description": "Number of bytes to read",
+                    "minimum": 1
+                }
+            },
+            "required": ["id"]
+        }
+
+    async def execute(
+        self,
+        id: str,
+        start_line: int | None = None,
+        end_line: int | None = None,
+        offset: int | None = None,
+        length: int | None = None,
+        **kwargs: Any,
+    ) -> str:
+        return self._store.read(id, start_line, end_line, offset, length)
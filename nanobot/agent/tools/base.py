@@ -21,6 +21,14 @@ class Tool(ABC):
         "object": dict,
     }
     
+    # Side-effect class of the tool: "read_only", "idempotent" or "side_effect".
+    # Read-only and idempotent tools may run concurrently with each other.
+    effect: str = "side_effect"
+    
+    # Word prefixes that make the tool relevant to a message (see ToolSelector).
+    # Tools without keywords are offered on every call.
+    keywords: tuple[str, ...] = ()
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -52,6 +60,11 @@ class Tool(ABC):
         """
         pass
 
+    @property
+    def concurrency_safe(self) -> bool:
+        """Whether calls to this tool may run concurrently within one LLM iteration."""
+        return self.effect in ("read_only", "idempotent")
+
     def validate_params(self, params: dict[str, Any]) -> list[str]:
         """Validate tool parameters against JSON schema. Returns error list (empty if valid)."""
         schema = self.parameters or {}
@@ -0,0 +1,50 @@
+"""Tool for enabling tools that were not offered for the current turn."""
+
+from typing import Any, TYPE_CHECKING
+
+from nanobot.agent.tools.base import Tool
+
+if TYPE_CHECKING:
+    from nanobot.agent.tool_selector import ToolSelector
+
+
+class LoadToolsTool(Tool):
+    """Tool to widen the per-turn tool selection."""
+    
+    effect = "read_only"
+    
+    def __init__(self, selector: "ToolSelector"):
+        self._selector = selector
+        # Register last so the description lists every other tool
+        self._available = [n for n in selector.registry.tool_names if n != "load_tools"]
+    
+    @property
+    def name(self) -> str:
+        return "load_tools"
+    
+    @property
+    def description(self) -> str:
+        return (
+            "Enable tools that are not offered right now. Only the tools relevant "
+            f"to the message are offered; all tools: {', '.join(self._available)}. "
+            "Omit names to enable all of them."
+        )
+    
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Tools to enable"
+                }
+            }
+        }
+    
+    async def execute(self, names: list[str] | None = None, **kwargs: Any) -> str:
+        added = self._selector.widen(names or None)
+        if not added:
+            return "No new tools enabled (already available or unknown)."
+        return f"Enabled tools: {', '.join(added)}"
@@ -0,0 +1,54 @@
+"""Recall tool for searching the agent's memory files."""
+
+from typing import Any, TYPE_CHECKING
+
+from nanobot.agent.tools.base import Tool
+
+if TYPE_CHECKING:
+    from nanobot.agent.memory import MemoryIndex
+
+
+class RecallTool(Tool):
+    """Tool to search long-term memory and daily notes."""
+
+    effect = "read_only"
+
+    def __init__(self, index: "MemoryIndex"):
+        self._index = index
+
+    @property
+    def name(self) -> str:
+        return "recall"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search your memory (MEMORY.md and daily notes) for passages relevant "
+            "to a query. Only the best matches for the current message are in "
+            "the prompt; use this to look for more or for other topics."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Words to look for (names, topics, dates)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum passages to return (default 5)",
+                    "minimum": 1,
+                    "maximum": 20
+                }
+            },
+            "required": ["query"]
+        }
+
+    async def execute(self, query: str, limit: int = 5, **kwargs: Any) -> str:
+        chunks = self._index.search(query, limit)
+        if not chunks:
+            return f"No memories match: {query}"
+        return "\n\n---\n\n".join(chunk.format() for chunk in chunks)
@@ -1,8 +1,10 @@
 """Tool registry for dynamic tool management."""
 
-from typing import Any
+import asyncio
+from typing import Any, Iterable
 
 from nanobot.agent.tools.base import Tool
+from nanobot.tracing import tracer
 
 
 class ToolRegistry:
@@ -12,16 +14,21 @@ class ToolRegistry:
     Allows dynamic registration and execution of tools.
     """
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 4):
         self._tools: dict[str, Tool] = {}
+        # Schemas are built once at registration, not on every LLM call
+        self._schemas: dict[str, dict[str, Any]] = {}
+        self.max_concurrency = max(1, max_concurrency)
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
         self._tools[tool.name] = tool
+        self._schemas[tool.name] = tool.to_schema()
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
         self._tools.pop(name, None)
+        self._schemas.pop(name, None)
     
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -31,9 +38,17 @@ class ToolRegistry:
         """Check if a tool is registered."""
         return name in self._tools
     
-    def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+    def get_definitions(self, names: Iterable[str] | None = None) -> list[dict[str, Any]]:
+        """
+        Get tool definitions in OpenAI format.
+        
+        Args:
+            names: Only include these tools (default: all), in registration order.
+        """
+        if names is None:
+            return list(self._schemas.values())
+        wanted = set(names)
+        return [schema for name, schema in self._schemas.items() if name in wanted]
     
     async def execute(self, name: str, params: dict[str, Any]) -> str:
         """
@@ -53,13 +68,57 @@ class ToolRegistry:
         if not tool:
             return f"Error: Tool '{name}' not found"
 
-        try:
-            errors = tool.validate_params(params)
-            if errors:
-                return f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors)
-            return await tool.execute(**params)
-        except Exception as e:
-            return f"Error executing {name}: {str(e)}"
+        with tracer.span("tool.execute", tool=name) as span:
+            try:
+                errors = tool.validate_params(params)
+                if errors:
+                    result = f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors)
+                else:
+                    result = await tool.execute(**params)
+            except Exception as e:
+                result = f"Error executing {name}: {str(e)}"
+            # Tools report failures as "Error..." strings
+            if result.startswith("Error"):
+                span.status = "error"
+                span.error = result[:200]
+            span.set(result_chars=len(result))
+            return result
+    
+    async def execute_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        """
+        Execute the tool calls of one LLM response.
+        
+        Consecutive calls to concurrency-safe tools run in parallel (at most
+        ``max_concurrency`` at a time). A side-effecting call acts as a barrier:
+        it starts only after everything before it finished and runs alone.
+        
+        Args:
+            calls: (tool name, parameters) pairs in the order the model issued them.
+        
+        Returns:
+            Results in the same order as ``calls``.
+        """
+        results: list[str] = [""] * len(calls)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run(index: int, name: str, params: dict[str, Any]) -> None:
+            async with semaphore:
+                results[index] = await self.execute(name, params)
+        
+        group: list[Any] = []
+        for index, (name, params) in enumerate(calls):
+            tool = self._tools.get(name)
+            if tool and tool.concurrency_safe:
+                group.append(run(index, name, params))
+                continue
+            if group:
+                await asyncio.gather(*group)
+                group = []
+            results[index] = await self.execute(name, params)
+        if group:
+            await asyncio.gather(*group)
+        
+        return results
     
     @property
     def tool_names(self) -> list[str]:
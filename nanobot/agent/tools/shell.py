@@ -3,6 +3,7 @@
 import asyncio
 import os
 import re
+import signal
 from pathlib import Path
 from typing import Any
 
@@ -12,6 +13,12 @@ from nanobot.agent.tools.base import Tool
 class ExecTool(Tool):
     """Tool to execute shell commands."""
     
+    keywords = (
+        "run", "exec", "command", "shell", "terminal", "bash", "install", "script", "git",
+        "python", "pip", "npm", "process", "build", "test", "compil", "deploy", "curl",
+        "docker", "disk", "kill",
+    )
+    
     def __init__(
         self,
         timeout: int = 60,
@@ -67,11 +74,13 @@ class ExecTool(Tool):
             return guard_error
         
         try:
+            # Own process group, so the whole command tree can be killed
             process = await asyncio.create_subprocess_shell(
                 command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
+                start_new_session=os.name == "posix",
             )
             
             try:
@@ -80,8 +89,12 @@ class ExecTool(Tool):
                     timeout=self.timeout
                 )
             except asyncio.TimeoutError:
-                process.kill()
+                self._kill(process)
                 return f"Error: Command timed out after {self.timeout} seconds"
+            except asyncio.CancelledError:
+                # The turn was interrupted: don't leave the command running
+                self._kill(process)
+                raise
             
             output_parts = []
             
@@ -108,6 +121,19 @@ class ExecTool(Tool):
         except Exception as e:
             return f"Error executing command: {str(e)}"
 
+    @staticmethod
+    def _kill(process: asyncio.subprocess.Process) -> None:
+        """Kill a command and any child processes it started."""
+        if process.returncode is not None:
+            return
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
     def _guard_command(self, command: str, cwd: str) -> str | None:
         """Best-effort safety guard for potentially destructive commands."""
         cmd = command.strip()
@@ -47,6 +47,9 @@ class WebSearchTool(Tool):
     """Search the web using Brave Search API."""
     
     name = "web_search"
+    effect = "read_only"
+    keywords = ("search", "googl", "news", "latest", "current", "recent", "today", "price",
+                "web", "internet", "online", "research", "lookup")
     description = "Search the web. Returns titles, URLs, and snippets."
     parameters = {
         "type": "object",
@@ -94,6 +97,8 @@ class WebFetchTool(Tool):
     """Fetch and extract content from a URL using Readability."""
     
     name = "web_fetch"
+    effect = "read_only"
+    keywords = ("http", "www", "url", "link", "website", "site", "page", "fetch", "download", "article")
     description = "Fetch URL and extract readable content (HTML → markdown/text)."
     parameters = {
         "type": "object",
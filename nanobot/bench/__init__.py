@@ -0,0 +1,5 @@
+"""Offline benchmarks of the agent loop on recorded LLM cassettes."""
+
+from nanobot.bench.runner import BenchReport, Scenario, benchmark, record, run_scenario
+
+__all__ = ["BenchReport", "Scenario", "benchmark", "record", "run_scenario"]
@@ -0,0 +1,254 @@
+"""Drive recorded scenarios through the real agent loop, fully offline."""
+
+import asyncio
+import json
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.tools.base import Tool
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider
+from nanobot.providers.cassette import RecordingProvider, ReplayProvider, RequestKey
+from nanobot.tracing import Span, tracer
+
+# Tools that would reach the network; they answer with an error in both
+# recording and replay so runs stay offline and reproducible
+NETWORK_TOOLS = ("web_search", "web_fetch")
+
+# Channel of benchmark sessions (deleted after each run)
+BENCH_CHANNEL = "bench"
+
+# Longest wait for subagents and announcements after the last step
+SETTLE_TIMEOUT_S = 300.0
+
+
+@dataclass
+class Scenario:
+    """
+    A scripted conversation: workspace files plus the messages to send.
+
+    Each step is {"content": ..., "chat_id": "1", "lane": "interactive"};
+    use lane "cron" or "heartbeat" to run a step like a scheduled job.
+    """
+    name: str
+    steps: list[dict[str, Any]]
+    files: dict[str, str] = field(default_factory=dict)
+    path: Path | None = None
+
+    @classmethod
+    def load(cls, path: Path) -> "Scenario":
+        """Load a scenario from a JSON file."""
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(
+            name=data.get("name", path.stem),
+            steps=data["steps"],
+            files=data.get("files", {}),
+            path=path,
+        )
+
+    @property
+    def cassette_path(self) -> Path:
+        """Cassette recorded for this scenario (next to the scenario file)."""
+        return self.path.with_suffix(".cassette.jsonl")
+
+
+@dataclass
+class RunResult:
+    """Outcome of one pass over a scenario."""
+    wall_s: float
+    responses: list[str]
+    spans: list[dict[str, Any]]
+
+
+class _OfflineTool(Tool):
+    """Stands in for a network tool with the same schema."""
+
+    def __init__(self, tool: Tool):
+        self._tool = tool
+        self.effect = tool.effect
+        self.keywords = tool.keywords
+
+    @property
+    def name(self) -> str:
+        return self._tool.name
+
+    @property
+    def description(self) -> str:
+        return self._tool.description
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return self._tool.parameters
+
+    async def execute(self, **kwargs: Any) -> str:
+        return f"Error: {self.name} is unavailable (network access is disabled in benchmarks)"
+
+
+async def run_scenario(
+    scenario: Scenario,
+    make_provider: Callable[[RequestKey], LLMProvider],
+    **agent_options: Any,
+) -> RunResult:
+    """
+    Run a scenario once in a fresh temporary workspace.
+
+    Args:
+        scenario: The scenario to run.
+        make_provider: Builds the provider, given the request key for this workspace.
+        **agent_options: Extra AgentLoop arguments.
+
+    Returns:
+        Wall time, the response to each step and the spans of the run.
+    """
+    spans: list[dict[str, Any]] = []
+
+    def collect(span: Span) -> None:
+        spans.append(span.to_dict())
+
+    with tempfile.TemporaryDirectory(prefix="nanobot-bench-") as tmp:
+        workspace = Path(tmp) / "workspace"
+        for rel, content in scenario.files.items():
+            target = workspace / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content, encoding="utf-8")
+        workspace.mkdir(parents=True, exist_ok=True)
+        data_dir = Path(tmp) / "data"
+
+        key = RequestKey({
+            str(workspace): "<workspace>",
+            str(data_dir): "<data>",
+            str(Path(__file__).resolve().parent.parent): "<nanobot>",
+            str(Path.home()): "<home>",
+        })
+        bus = MessageBus()
+        # Sessions and artifacts stay in the temporary directory too
+        agent = AgentLoop(
+            bus=bus,
+            provider=make_provider(key),
+            workspace=workspace,
+            data_dir=data_dir,
+            **agent_options,
+        )
+        for name in NETWORK_TOOLS:
+            tool = agent.tools.get(name)
+            if tool:
+                agent.tools.register(_OfflineTool(tool))
+
+        loop_task = asyncio.create_task(agent.run())
+        # Subagent announcements and cron deliveries end up here; nobody reads them
+        drain_task = asyncio.create_task(_drain_outbound(bus))
+        tracer.add_listener(collect)
+        responses = []
+        started = time.perf_counter()
+        try:
+            for step in scenario.steps:
+                responses.append(await agent.process_direct(
+                    step["content"],
+                    channel=BENCH_CHANNEL,
+                    chat_id=step.get("chat_id", "1"),
+                    lane=step.get("lane", "interactive"),
+                ))
+            # Wait for subagents and their announcements; a message taken off the
+            # bus is briefly in neither place, so idleness must hold for a few polls
+            deadline = time.monotonic() + SETTLE_TIMEOUT_S
+            idle_polls = 0
+            while idle_polls < 3 and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+                idle_polls = idle_polls + 1 if agent.idle else 0
+            wall_s = time.perf_counter() - started
+        finally:
+            tracer.remove_listener(collect)
+            agent.stop()
+            for task in (loop_task, drain_task):
+                task.cancel()
+            await asyncio.gather(loop_task, drain_task, return_exceptions=True)
+
+    return RunResult(wall_s=wall_s, responses=responses, spans=spans)
+
+
+async def _drain_outbound(bus: MessageBus) -> None:
+    """Discard outbound messages."""
+    while True:
+        await bus.consume_outbound()
+
+
+async def record(scenario: Scenario, provider: LLMProvider, **agent_options: Any) -> RunResult:
+    """Run a scenario against a live provider and record its cassette."""
+    return await run_scenario(
+        scenario,
+        lambda key: RecordingProvider(provider, scenario.cassette_path, key),
+        **agent_options,
+    )
+
+
+@dataclass
+class BenchReport:
+    """Aggregated results of replaying a scenario."""
+    scenario: str
+    wall_s: list[float]
+    peak_kib: float
+    retained_kib: float
+    spans: list[dict[str, Any]]
+    prompt_tokens: list[int]
+    hits: int = 0
+    fallbacks: int = 0
+    misses: int = 0
+
+
+async def benchmark(
+    scenario: Scenario,
+    repeat: int = 3,
+    strict: bool = False,
+    realtime: bool = False,
+    **agent_options: Any,
+) -> BenchReport:
+    """
+    Replay a scenario offline and measure it.
+
+    The scenario runs ``repeat`` times for timings, then once more under
+    tracemalloc for allocations (kept separate so tracing does not skew
+    the wall times).
+
+    Args:
+        scenario: A scenario with a recorded cassette.
+        repeat: Timed runs.
+        strict: Only replay exact request matches.
+        realtime: Replay the recorded LLM latency instead of answering at once.
+        **agent_options: Extra AgentLoop arguments (must match the recording).
+    """
+    if not scenario.cassette_path.exists():
+        raise FileNotFoundError(f"No cassette for {scenario.name}: record it first")
+
+    replays: list[ReplayProvider] = []
+
+    def make_provider(key: RequestKey) -> ReplayProvider:
+        replay = ReplayProvider(scenario.cassette_path, key, strict=strict, realtime=realtime)
+        replays.append(replay)
+        return replay
+
+    runs = [await run_scenario(scenario, make_provider, **agent_options) for _ in range(max(1, repeat))]
+
+    tracemalloc.start()
+    try:
+        await run_scenario(scenario, make_provider, **agent_options)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    first = replays[0]
+    return BenchReport(
+        scenario=scenario.name,
+        wall_s=[run.wall_s for run in runs],
+        peak_kib=peak / 1024,
+        retained_kib=retained / 1024,
+        spans=[span for run in runs for span in run.spans],
+        prompt_tokens=first.prompt_tokens,
+        hits=first.hits,
+        fallbacks=first.fallbacks,
+        misses=first.misses,
+    )
@@ -1,6 +1,7 @@
 """Message bus module for decoupled channel-agent communication."""
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.lanes import LoadShedError
 from nanobot.bus.queue import MessageBus
 
-__all__ = ["MessageBus", "InboundMessage", "OutboundMessage"]
+__all__ = ["MessageBus", "InboundMessage", "OutboundMessage", "LoadShedError"]
@@ -0,0 +1,107 @@
+"""Debouncing of rapid-fire inbound messages into a single turn."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from nanobot.bus.events import InboundMessage
+
+
+def merge_inbound(messages: list[InboundMessage]) -> InboundMessage:
+    """
+    Merge consecutive messages of one session into a single message.
+
+    Contents are joined by newlines and media lists concatenated. The first
+    message's timestamp is kept (so queue wait covers the whole burst); the
+    sender and metadata of later messages take precedence.
+    """
+    if len(messages) == 1:
+        return messages[0]
+
+    metadata: dict = {}
+    for msg in messages:
+        metadata.update(msg.metadata)
+    metadata["coalesced"] = len(messages)
+
+    last = messages[-1]
+    return InboundMessage(
+        channel=last.channel,
+        sender_id=last.sender_id,
+        chat_id=last.chat_id,
+        content="\n".join(m.content for m in messages if m.content),
+        timestamp=messages[0].timestamp,
+        media=[path for m in messages for path in m.media],
+        metadata=metadata,
+    )
+
+
+class InboundCoalescer:
+    """
+    Holds inbound messages per session until the chat goes quiet.
+
+    A message is delivered once no further message for its session arrived
+    within ``window_s``; a burst is never held longer than ``max_hold_s``
+    after its first message.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[InboundMessage], Awaitable[None]],
+        window_s: float,
+        max_hold_s: float = 5.0,
+    ):
+        """
+        Args:
+            deliver: Called with each (merged) message when it is released.
+            window_s: Quiet period that ends a burst.
+            max_hold_s: Maximum delay of the first message of a burst.
+        """
+        self._deliver = deliver
+        self.window_s = window_s
+        self.max_hold_s = max(max_hold_s, window_s)
+        self._pending: dict[str, list[InboundMessage]] = {}
+        self._first_at: dict[str, float] = {}
+        self._timers: dict[str, asyncio.Task[None]] = {}
+
+    async def add(self, msg: InboundMessage) -> None:
+        """Buffer a message and (re)start its session's quiet timer."""
+        key = msg.session_key
+        self._pending.setdefault(key, []).append(msg)
+        now = time.monotonic()
+        first_at = self._first_at.setdefault(key, now)
+
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+
+        delay = min(self.window_s, first_at + self.max_hold_s - now)
+        if delay <= 0:
+            await self._flush(key)
+        else:
+            self._timers[key] = asyncio.create_task(self._flush_later(key, delay))
+
+    async def flush_all(self) -> None:
+        """Release all buffered messages immediately."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for key in list(self._pending):
+            await self._flush(key)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of messages currently held back."""
+        return sum(len(batch) for batch in self._pending.values())
+
+    async def _flush_later(self, key: str, delay: float) -> None:
+        """Release a session's burst after the delay, unless cancelled by a newer message."""
+        await asyncio.sleep(delay)
+        self._timers.pop(key, None)
+        await self._flush(key)
+
+    async def _flush(self, key: str) -> None:
+        """Deliver a session's buffered messages as one."""
+        batch = self._pending.pop(key, None)
+        self._first_at.pop(key, None)
+        if batch:
+            await self._deliver(merge_inbound(batch))
@@ -16,6 +16,7 @@ class InboundMessage:
     timestamp: datetime = field(default_factory=datetime.now)
     media: list[str] = field(default_factory=list)  # Media URLs
     metadata: dict[str, Any] = field(default_factory=dict)  # Channel-specific data
+    lane: str | None = None  # Priority lane (interactive, system, cron, heartbeat); derived if unset
     
     @property
     def session_key(self) -> str:
@@ -33,5 +34,12 @@ class OutboundMessage:
     reply_to: str | None = None
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Streaming: messages sharing a stream_id update one chat message in place.
+    # Partial messages carry the full text so far; the last one has partial=False.
+    # After that, partials with the same stream_id start a new chat message.
+    stream_id: str | None = None
+    partial: bool = False
+    # Only for channels that render streams (e.g. finishing text streamed before tool calls)
+    stream_only: bool = False
 
 
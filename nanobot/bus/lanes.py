@@ -0,0 +1,185 @@
+"""Priority lanes for inbound work with capacity limits and load shedding."""
+
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Callable
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage
+
+# Lanes in priority order (highest first)
+LANES = ("interactive", "system", "cron", "heartbeat")
+
+# Lanes whose work may be deferred or dropped under load; the others block
+# producers when full (backpressure) and are never shed
+SHEDDABLE_LANES = ("cron", "heartbeat")
+
+DEFAULT_CAPACITY = {"interactive": 200, "system": 100, "cron": 20, "heartbeat": 2}
+
+# Seconds a message may wait: for the interactive lane this is the SLO whose
+# breach triggers shedding, for sheddable lanes the age at which work is dropped
+DEFAULT_MAX_AGE_S = {"interactive": 30.0, "system": 0.0, "cron": 600.0, "heartbeat": 600.0}
+
+# How often a blocked consumer re-checks deferred work and message ages
+RECHECK_INTERVAL_S = 1.0
+
+
+class LoadShedError(Exception):
+    """Raised for work that was dropped by load shedding."""
+
+
+def lane_of(msg: InboundMessage) -> str:
+    """Get the lane of a message (subagent announces default to "system")."""
+    if msg.lane:
+        return msg.lane
+    return "system" if msg.channel == "system" else "interactive"
+
+
+class LaneQueue:
+    """
+    Inbound queue with one FIFO per priority lane.
+
+    ``get`` returns the oldest message of the highest-priority lane. Full
+    interactive/system lanes make ``put`` wait (backpressure on channels and
+    subagents); full cron/heartbeat lanes reject new work.
+
+    While the provider is degraded or user messages wait longer than the
+    interactive SLO, cron and heartbeat work is deferred (policy "defer") or
+    dropped (policy "drop"). Deferred work that exceeds its lane's max age is
+    dropped as well.
+    """
+
+    def __init__(
+        self,
+        capacity: dict[str, int] | None = None,
+        max_age_s: dict[str, float] | None = None,
+        shed_policy: str = "defer",
+    ):
+        """
+        Args:
+            capacity: Maximum queued messages per lane.
+            max_age_s: Interactive SLO and per-lane max age for sheddable lanes (0 = none).
+            shed_policy: "defer" or "drop" low-priority work under load.
+        """
+        if shed_policy not in ("defer", "drop"):
+            raise ValueError(f"Unknown shed policy: {shed_policy}")
+        self.capacity = {**DEFAULT_CAPACITY, **(capacity or {})}
+        self.max_age_s = {**DEFAULT_MAX_AGE_S, **(max_age_s or {})}
+        self.shed_policy = shed_policy
+        self.degraded = False
+        # Called with each shed message and the reason
+        self.on_shed: Callable[[InboundMessage, str], None] | None = None
+        self._lanes: dict[str, deque[InboundMessage]] = {lane: deque() for lane in LANES}
+        self._available = asyncio.Event()
+        self._space = asyncio.Event()
+
+    async def put(self, msg: InboundMessage) -> bool:
+        """
+        Enqueue a message.
+
+        Returns:
+            False if the message was shed because its lane is full.
+        """
+        lane = lane_of(msg)
+        if lane not in self._lanes:
+            raise ValueError(f"Unknown lane: {lane}")
+        queue = self._lanes[lane]
+
+        warned = False
+        while len(queue) >= self.capacity[lane]:
+            if lane in SHEDDABLE_LANES:
+                self._shed(msg, f"{lane} lane full")
+                return False
+            if not warned:
+                logger.warning(f"Inbound {lane} lane full ({len(queue)}), applying backpressure")
+                warned = True
+            self._space.clear()
+            await self._space.wait()
+
+        queue.append(msg)
+        self._available.set()
+        return True
+
+    async def get(self, accept: Callable[[InboundMessage], bool] | None = None) -> InboundMessage:
+        """
+        Dequeue the next message by lane priority.
+
+        Args:
+            accept: Optional filter; messages it rejects stay queued (in order)
+                and are reconsidered after ``notify``.
+        """
+        while True:
+            self._available.clear()
+            msg = self._take(accept)
+            if msg is not None:
+                self._space.set()
+                return msg
+            try:
+                await asyncio.wait_for(self._available.wait(), RECHECK_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+
+    def notify(self) -> None:
+        """Wake consumers to re-evaluate their filter or deferred work."""
+        self._available.set()
+
+    def set_degraded(self, degraded: bool) -> None:
+        """Mark the provider as degraded (defers low-priority work)."""
+        if degraded != self.degraded:
+            logger.warning(f"Provider {'degraded' if degraded else 'recovered'}: "
+                           f"{'deferring' if degraded else 'resuming'} low-priority work")
+            self.degraded = degraded
+            self._available.set()
+
+    def qsize(self) -> int:
+        """Total number of queued messages."""
+        return sum(len(q) for q in self._lanes.values())
+
+    def sizes(self) -> dict[str, int]:
+        """Number of queued messages per lane."""
+        return {lane: len(q) for lane, q in self._lanes.items()}
+
+    @property
+    def overloaded(self) -> bool:
+        """Check if low-priority work should be held back."""
+        slo = self.max_age_s.get("interactive", 0)
+        interactive = self._lanes["interactive"]
+        return self.degraded or bool(slo and interactive and self._age(interactive[0]) > slo)
+
+    def _take(self, accept: Callable[[InboundMessage], bool] | None) -> InboundMessage | None:
+        """Remove and return the next eligible message, shedding expired work."""
+        overloaded = self.overloaded
+        for lane in LANES:
+            queue = self._lanes[lane]
+            if lane in SHEDDABLE_LANES:
+                self._expire(lane)
+                if overloaded:
+                    if self.shed_policy == "drop":
+                        while queue:
+                            self._shed(queue.popleft(), "overloaded")
+                    continue
+            for i, msg in enumerate(queue):
+                if accept is None or accept(msg):
+                    del queue[i]
+                    return msg
+        return None
+
+    def _expire(self, lane: str) -> None:
+        """Drop messages that waited longer than their lane's max age."""
+        max_age = self.max_age_s.get(lane, 0)
+        queue = self._lanes[lane]
+        while max_age and queue and self._age(queue[0]) > max_age:
+            self._shed(queue.popleft(), f"waited over {max_age:.0f}s")
+
+    def _shed(self, msg: InboundMessage, reason: str) -> None:
+        """Drop a message and report it."""
+        logger.warning(f"Shedding {lane_of(msg)} message for {msg.session_key}: {reason}")
+        if self.on_shed:
+            self.on_shed(msg, reason)
+
+    @staticmethod
+    def _age(msg: InboundMessage) -> float:
+        """Seconds since a message was received."""
+        return (datetime.now() - msg.timestamp).total_seconds()
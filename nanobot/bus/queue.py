@@ -5,7 +5,9 @@ from typing import Callable, Awaitable
 
 from loguru import logger
 
+from nanobot.bus.coalesce import InboundCoalescer
 from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.lanes import LaneQueue, lane_of
 
 
 class MessageBus:
@@ -14,21 +16,65 @@ class MessageBus:
     
     Channels push messages to the inbound queue, and the agent processes
     them and pushes responses to the outbound queue.
+    
+    Inbound work is queued in priority lanes (interactive, system, cron,
+    heartbeat) with per-lane capacity and load shedding, see LaneQueue.
+    
+    With a coalescing window set, chat messages arriving in quick succession
+    for the same session are merged into one inbound message before they
+    reach the agent. System messages are never delayed.
     """
     
-    def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
+    def __init__(
+        self,
+        coalesce_window_s: float = 0.0,
+        coalesce_max_hold_s: float = 5.0,
+        lane_capacity: dict[str, int] | None = None,
+        lane_max_age_s: dict[str, float] | None = None,
+        shed_policy: str = "defer",
+    ):
+        """
+        Args:
+            coalesce_window_s: Quiet period that ends a burst of chat messages (0 = off).
+            coalesce_max_hold_s: Maximum time the first message of a burst is held.
+            lane_capacity: Maximum queued messages per lane.
+            lane_max_age_s: Interactive SLO and max age of cron/heartbeat work.
+            shed_policy: "defer" or "drop" low-priority work under load.
+        """
+        self.inbound = LaneQueue(lane_capacity, lane_max_age_s, shed_policy)
         self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
         self._outbound_subscribers: dict[str, list[Callable[[OutboundMessage], Awaitable[None]]]] = {}
         self._running = False
+        self._coalescer: InboundCoalescer | None = None
+        if coalesce_window_s > 0:
+            self._coalescer = InboundCoalescer(
+                self.inbound.put, coalesce_window_s, coalesce_max_hold_s
+            )
     
-    async def publish_inbound(self, msg: InboundMessage) -> None:
-        """Publish a message from a channel to the agent."""
-        await self.inbound.put(msg)
+    async def publish_inbound(self, msg: InboundMessage) -> bool:
+        """
+        Publish a message from a channel to the agent.
+        
+        Waits while the message's lane is full (backpressure).
+        
+        Returns:
+            False if the message was shed instead of queued.
+        """
+        if self._coalescer and lane_of(msg) == "interactive":
+            await self._coalescer.add(msg)
+            return True
+        return await self.inbound.put(msg)
     
-    async def consume_inbound(self) -> InboundMessage:
-        """Consume the next inbound message (blocks until available)."""
-        return await self.inbound.get()
+    async def consume_inbound(
+        self, accept: Callable[[InboundMessage], bool] | None = None
+    ) -> InboundMessage:
+        """
+        Consume the next inbound message by lane priority (blocks until available).
+        
+        Args:
+            accept: Optional filter; rejected messages stay queued.
+        """
+        return await self.inbound.get(accept)
     
     async def publish_outbound(self, msg: OutboundMessage) -> None:
         """Publish a response from the agent to channels."""
@@ -70,10 +116,19 @@ class MessageBus:
         """Stop the dispatcher loop."""
         self._running = False
     
+    def set_degraded(self, degraded: bool) -> None:
+        """Mark the LLM provider as degraded (low-priority work is held back)."""
+        self.inbound.set_degraded(degraded)
+    
+    def lane_sizes(self) -> dict[str, int]:
+        """Number of queued inbound messages per lane."""
+        return self.inbound.sizes()
+    
     @property
     def inbound_size(self) -> int:
-        """Number of pending inbound messages."""
-        return self.inbound.qsize()
+        """Number of pending inbound messages (including ones held for coalescing)."""
+        held = self._coalescer.pending_count if self._coalescer else 0
+        return self.inbound.qsize() + held
     
     @property
     def outbound_size(self) -> int:
@@ -19,6 +19,10 @@ class BaseChannel(ABC):
     
     name: str = "base"
     
+    # Whether send() can render partial (streamed) messages by editing in place.
+    # Channels without support only receive the final message of a stream.
+    supports_streaming: bool = False
+    
     def __init__(self, config: Any, bus: MessageBus):
         """
         Initialize the channel.
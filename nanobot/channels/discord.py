@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import time
 from pathlib import Path
 from typing import Any
 
@@ -23,6 +24,10 @@ class DiscordChannel(BaseChannel):
     """Discord channel using Gateway websocket."""
 
     name = "discord"
+    supports_streaming = True
+
+    # Minimum seconds between PATCHes of a streamed message
+    STREAM_EDIT_INTERVAL_S = 1.0
 
     def __init__(self, config: DiscordConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -32,6 +37,7 @@ class DiscordChannel(BaseChannel):
         self._heartbeat_task: asyncio.Task | None = None
         self._typing_tasks: dict[str, asyncio.Task] = {}
         self._http: httpx.AsyncClient | None = None
+        self._streams: dict[str, tuple[str, float]] = {}  # stream_id -> (message_id, last edit time)
 
     async def start(self) -> None:
         """Start the Discord gateway connection."""
@@ -85,28 +91,68 @@ class DiscordChannel(BaseChannel):
             payload["message_reference"] = {"message_id": msg.reply_to}
             payload["allowed_mentions"] = {"replied_user": False}
 
-        headers = {"Authorization": f"Bot {self.config.token}"}
-
         try:
-            for attempt in range(3):
-                try:
-                    response = await self._http.post(url, headers=headers, json=payload)
-                    if response.status_code == 429:
-                        data = response.json()
-                        retry_after = float(data.get("retry_after", 1.0))
-                        logger.warning(f"Discord rate limited, retrying in {retry_after}s")
-                        await asyncio.sleep(retry_after)
-                        continue
-                    response.raise_for_status()
-                    return
-                except Exception as e:
-                    if attempt == 2:
-                        logger.error(f"Error sending Discord message: {e}")
-                    else:
-                        await asyncio.sleep(1)
+            if msg.stream_id and await self._send_stream(msg, url, payload):
+                return
+            await self._request("POST", url, payload)
         finally:
             await self._stop_typing(msg.chat_id)
 
+    async def _send_stream(self, msg: OutboundMessage, url: str, payload: dict[str, Any]) -> bool:
+        """
+        Render a streamed message by PATCHing one Discord message in place.
+
+        Returns:
+            True if handled, False if the message should be sent normally.
+        """
+        state = self._streams.get(msg.stream_id)
+
+        if not msg.partial:
+            if not state:
+                return False
+            del self._streams[msg.stream_id]
+            await self._request("PATCH", f"{url}/{state[0]}", {"content": msg.content})
+            return True
+
+        # Partial content, rate limited
+        if not msg.content.strip():
+            return True
+        now = time.monotonic()
+        if not state:
+            data = await self._request("POST", url, payload)
+            if data and data.get("id"):
+                self._streams[msg.stream_id] = (str(data["id"]), now)
+        elif now - state[1] >= self.STREAM_EDIT_INTERVAL_S:
+            self._streams[msg.stream_id] = (state[0], now)
+            await self._request("PATCH", f"{url}/{state[0]}", {"content": msg.content})
+        return True
+
+    async def _request(self, method: str, url: str, payload: dict[str, Any]) -> dict[str, Any] | None:
+        """Send a REST request with rate-limit retries. Returns the response JSON, if any."""
+        headers = {"Authorization": f"Bot {self.config.token}"}
+
+        for attempt in range(3):
+            try:
+                response = await self._http.request(method, url, headers=headers, json=payload)
+                if response.status_code == 429:
+                    data = response.json()
+                    retry_after = float(data.get("retry_after", 1.0))
+                    logger.warning(f"Discord rate limited, retrying in {retry_after}s")
+                    await asyncio.sleep(retry_after)
+                    continue
+                response.raise_for_status()
+            except Exception as e:
+                if attempt == 2:
+                    logger.error(f"Error sending Discord message: {e}")
+                else:
+                    await asyncio.sleep(1)
+                continue
+            try:
+                return response.json()
+            except ValueError:
+                return None
+        return None
+
     async def _gateway_loop(self) -> None:
         """Main gateway loop: identify, heartbeat, dispatch events."""
         if not self._ws:
@@ -0,0 +1,206 @@
+"""Synthetic load generator channel for gateway throughput testing."""
+
+import asyncio
+import base64
+import math
+import random
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.config.schema import LoadGenConfig
+from nanobot.tracing.report import percentile
+from nanobot.utils.helpers import ensure_dir, get_data_path
+
+# 1x1 PNG used as the attachment when no media_path is configured
+_PLACEHOLDER_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+_WORDS = (
+    "please", "check", "the", "logs", "for", "today", "and", "summarize", "what", "changed",
+    "can", "you", "remind", "me", "about", "meeting", "tomorrow", "file", "notes", "list",
+    "weather", "in", "berlin", "how", "is", "project", "going", "write", "short", "reply",
+)
+
+# Seconds to wait for outstanding replies after the last message was sent
+DRAIN_TIMEOUT_S = 60.0
+
+
+class LoadGenChannel(BaseChannel):
+    """
+    Injects a synthetic message stream into the bus and measures the replies.
+
+    Messages arrive as a Poisson process over ``sessions`` simulated chats,
+    with lengths drawn from the configured size distribution and optional
+    image attachments. Each message carries a sequence number in its
+    metadata; the agent echoes the metadata on its reply, so a reply
+    answers every message of its chat up to that number (bursts merged by
+    coalescing, or interrupted turns, are answered together).
+
+    Throughput and p50/p95/p99 end-to-end latency are logged periodically
+    and when the run ends, and are available from ``report()``.
+    """
+
+    name = "loadgen"
+
+    def __init__(self, config: LoadGenConfig, bus: MessageBus):
+        super().__init__(config, bus)
+        self.config: LoadGenConfig = config
+        self._rng = random.Random(config.seed)
+        self._media_file: str | None = None
+        self._seq = 0
+        # chat_id -> (seq, send time) of messages without a reply yet
+        self._pending: dict[str, deque[tuple[int, float]]] = {}
+        self._latencies: list[float] = []
+        self._replies = 0
+        self._reply_chars = 0
+        self._started = 0.0
+        self._publishers: set[asyncio.Task[None]] = set()
+
+    async def start(self) -> None:
+        """Send messages until the configured duration has passed, then report."""
+        self._running = True
+        self._started = time.monotonic()
+        if self.config.media_ratio > 0:
+            self._media_file = self._prepare_media()
+        reporter = None
+        if self.config.report_interval_s > 0:
+            reporter = asyncio.create_task(self._report_periodically())
+        logger.info(
+            f"Load generator: {self.config.rate}/s over {self.config.sessions} chats "
+            f"for {self.config.duration_s or 'unlimited '}s"
+        )
+
+        try:
+            while self._running:
+                await asyncio.sleep(self._rng.expovariate(self.config.rate))
+                if self.config.duration_s and time.monotonic() - self._started >= self.config.duration_s:
+                    break
+                self._send_one()
+
+            deadline = time.monotonic() + DRAIN_TIMEOUT_S
+            while self._running and self.outstanding and time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+        finally:
+            if reporter:
+                reporter.cancel()
+            self._log_report("final")
+            self._running = False
+
+    async def stop(self) -> None:
+        """Stop sending."""
+        self._running = False
+        for task in self._publishers:
+            task.cancel()
+
+    async def send(self, msg: OutboundMessage) -> None:
+        """Record a reply and the latency of every message it answers."""
+        self._replies += 1
+        self._reply_chars += len(msg.content)
+        seq = msg.metadata.get("loadgen_seq")
+        pending = self._pending.get(msg.chat_id)
+        if seq is None or not pending:
+            return
+        now = time.monotonic()
+        while pending and pending[0][0] <= seq:
+            _, sent_at = pending.popleft()
+            self._latencies.append(now - sent_at)
+
+    def _send_one(self) -> None:
+        """Publish the next message without waiting on backpressure (open-loop arrivals)."""
+        self._seq += 1
+        session = self._rng.randrange(max(1, self.config.sessions))
+        chat_id = f"chat{session}"
+        media = []
+        if self._media_file and self._rng.random() < self.config.media_ratio:
+            media.append(self._media_file)
+        self._pending.setdefault(chat_id, deque()).append((self._seq, time.monotonic()))
+
+        task = asyncio.create_task(self._handle_message(
+            sender_id=f"user{session}",
+            chat_id=chat_id,
+            content=self._make_content(),
+            media=media,
+            metadata={"loadgen_seq": self._seq},
+        ))
+        self._publishers.add(task)
+        task.add_done_callback(self._publishers.discard)
+
+    def _make_content(self) -> str:
+        """Generate a message with a length drawn from the size distribution."""
+        mean = max(1, self.config.message_chars)
+        kind = self.config.size_distribution
+        if kind == "fixed":
+            length = mean
+        elif kind == "uniform":
+            length = self._rng.uniform(0.5 * mean, 1.5 * mean)
+        else:
+            # Lognormal with the configured mean (sigma 1: a long tail of big messages)
+            length = self._rng.lognormvariate(math.log(mean) - 0.5, 1.0)
+        length = max(1, int(length))
+
+        words: list[str] = []
+        size = 0
+        while size < length:
+            word = self._rng.choice(_WORDS)
+            words.append(word)
+            size += len(word) + 1
+        return " ".join(words)[:length]
+
+    def _prepare_media(self) -> str:
+        """Get the attachment path, writing the placeholder image if needed."""
+        if self.config.media_path:
+            return str(Path(self.config.media_path).expanduser())
+        path = ensure_dir(get_data_path() / "loadgen") / "placeholder.png"
+        path.write_bytes(_PLACEHOLDER_PNG)
+        return str(path)
+
+    @property
+    def outstanding(self) -> int:
+        """Messages sent that have no reply yet."""
+        return sum(len(p) for p in self._pending.values())
+
+    def report(self) -> dict[str, Any]:
+        """
+        Get the results so far.
+
+        Returns:
+            Messages sent and answered, replies, throughput (answered/s) and
+            end-to-end latency percentiles in milliseconds.
+        """
+        elapsed = max(time.monotonic() - self._started, 1e-9) if self._started else 0.0
+        answered = len(self._latencies)
+        return {
+            "elapsed_s": elapsed,
+            "sent": self._seq,
+            "answered": answered,
+            "outstanding": self.outstanding,
+            "replies": self._replies,
+            "reply_chars": self._reply_chars,
+            "throughput": answered / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(self._latencies, 50) * 1000,
+            "p95_ms": percentile(self._latencies, 95) * 1000,
+            "p99_ms": percentile(self._latencies, 99) * 1000,
+        }
+
+    async def _report_periodically(self) -> None:
+        """Log the results every report interval."""
+        while True:
+            await asyncio.sleep(self.config.report_interval_s)
+            self._log_report("progress")
+
+    def _log_report(self, label: str) -> None:
+        r = self.report()
+        logger.info(
+            f"Load generator {label}: sent {r['sent']}, answered {r['answered']} "
+            f"({r['outstanding']} outstanding) in {r['elapsed_s']:.1f}s, "
+            f"{r['throughput']:.2f} msg/s, latency p50 {r['p50_ms']:.0f} ms, "
+            f"p95 {r['p95_ms']:.0f} ms, p99 {r['p99_ms']:.0f} ms"
+        )
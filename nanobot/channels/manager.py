@@ -77,6 +77,14 @@ class ChannelManager:
                 logger.info("Feishu channel enabled")
             except ImportError as e:
                 logger.warning(f"Feishu channel not available: {e}")
+        
+        # Load generator (synthetic traffic for throughput tests)
+        if self.config.channels.loadgen.enabled:
+            from nanobot.channels.loadgen import LoadGenChannel
+            self.channels["loadgen"] = LoadGenChannel(
+                self.config.channels.loadgen, self.bus
+            )
+            logger.info("Load generator channel enabled")
     
     async def _start_channel(self, name: str, channel: BaseChannel) -> None:
         """Start a channel and log any exceptions."""
@@ -135,6 +143,8 @@ class ChannelManager:
                 )
                 
                 channel = self.channels.get(msg.channel)
+                if channel and (msg.partial or msg.stream_only) and not channel.supports_streaming:
+                    continue
                 if channel:
                     try:
                         await channel.send(msg)
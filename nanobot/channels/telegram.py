@@ -2,6 +2,7 @@
 
 import asyncio
 import re
+import time
 
 from loguru import logger
 from telegram import Update
@@ -85,6 +86,10 @@ class TelegramChannel(BaseChannel):
     """
     
     name = "telegram"
+    supports_streaming = True
+    
+    # Minimum seconds between edits of a streamed message (Telegram rate limits edits)
+    STREAM_EDIT_INTERVAL_S = 1.0
     
     def __init__(self, config: TelegramConfig, bus: MessageBus, groq_api_key: str = ""):
         super().__init__(config, bus)
@@ -92,6 +97,7 @@ class TelegramChannel(BaseChannel):
         self.groq_api_key = groq_api_key
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
+        self._streams: dict[str, tuple[int, float]] = {}  # stream_id -> (message_id, last edit time)
     
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -157,6 +163,9 @@ class TelegramChannel(BaseChannel):
             logger.warning("Telegram bot not running")
             return
         
+        if msg.stream_id and await self._send_stream(msg):
+            return
+        
         try:
             # chat_id should be the Telegram chat ID (integer)
             chat_id = int(msg.chat_id)
@@ -180,6 +189,55 @@ class TelegramChannel(BaseChannel):
             except Exception as e2:
                 logger.error(f"Error sending Telegram message: {e2}")
     
+    async def _send_stream(self, msg: OutboundMessage) -> bool:
+        """
+        Render a streamed message by editing one Telegram message in place.
+        
+        Returns:
+            True if handled, False if the message should be sent normally.
+        """
+        state = self._streams.get(msg.stream_id)
+        
+        if not msg.partial:
+            # Final content: replace the streamed text with the formatted version
+            if not state:
+                return False
+            del self._streams[msg.stream_id]
+            message_id = state[0]
+            try:
+                await self._app.bot.edit_message_text(
+                    chat_id=int(msg.chat_id),
+                    message_id=message_id,
+                    text=_markdown_to_telegram_html(msg.content),
+                    parse_mode="HTML"
+                )
+            except Exception as e:
+                logger.debug(f"HTML edit failed, falling back to plain text: {e}")
+                try:
+                    await self._app.bot.edit_message_text(
+                        chat_id=int(msg.chat_id), message_id=message_id, text=msg.content
+                    )
+                except Exception as e2:
+                    logger.error(f"Error finalizing Telegram message: {e2}")
+            return True
+        
+        # Partial content: plain text, rate limited
+        if not msg.content.strip():
+            return True
+        now = time.monotonic()
+        try:
+            if not state:
+                sent = await self._app.bot.send_message(chat_id=int(msg.chat_id), text=msg.content)
+                self._streams[msg.stream_id] = (sent.message_id, now)
+            elif now - state[1] >= self.STREAM_EDIT_INTERVAL_S:
+                await self._app.bot.edit_message_text(
+                    chat_id=int(msg.chat_id), message_id=state[0], text=msg.content
+                )
+                self._streams[msg.stream_id] = (state[0], now)
+        except Exception as e:
+            logger.debug(f"Telegram stream update skipped: {e}")
+        return True
+    
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
         if not update.message or not update.effective_user:
@@ -148,22 +148,64 @@ This file stores important information that should persist across sessions.
 
 
 def _make_provider(config):
-    """Create LiteLLMProvider from config. Exits if no API key found."""
+    """Create LiteLLMProvider from config (wrapped in a router if routes are set). Exits if no API key found."""
     from nanobot.providers.litellm_provider import LiteLLMProvider
+    from nanobot.providers.router import RoutePolicy, RoutingProvider
+    
+    def make(model: str) -> LiteLLMProvider:
+        p = config.get_provider(model)
+        return LiteLLMProvider(
+            api_key=p.api_key if p else None,
+            api_base=config.get_api_base(model),
+            default_model=model,
+            extra_headers=p.extra_headers if p else None,
+        )
+    
     p = config.get_provider()
     model = config.agents.defaults.model
+    if model == "fake" or model.startswith("fake/"):
+        # Offline canned responses (load testing)
+        from nanobot.providers.fake import FakeProvider
+        return FakeProvider(default_model=model)
     if not (p and p.api_key) and not model.startswith("bedrock/"):
         console.print("[red]Error: No API key configured.[/red]")
         console.print("Set one in ~/.nanobot/config.json under providers section")
         raise typer.Exit(1)
-    return LiteLLMProvider(
-        api_key=p.api_key if p else None,
-        api_base=config.get_api_base(),
-        default_model=model,
-        extra_headers=p.extra_headers if p else None,
+    provider = make(model)
+    
+    policies = {
+        name: RoutePolicy(model=route.model, escalate_to=route.escalate_to or None)
+        for name, route in config.agents.routes
+        if route.model
+    }
+    if not policies:
+        return provider
+    models = {m for policy in policies.values() for m in (policy.model, policy.escalate_to) if m}
+    return RoutingProvider(
+        provider,
+        policies,
+        providers={m: make(m) for m in models if m != model},
     )
 
 
+def _get_trace_path():
+    """Get the span file path."""
+    from nanobot.config.loader import get_data_dir
+    return get_data_dir() / "traces" / "spans.jsonl"
+
+
+def _setup_tracing(config) -> None:
+    """Export spans to the local JSONL trace file if tracing is enabled."""
+    from nanobot.tracing import JsonlExporter, tracer
+    if not config.tracing.enabled:
+        return
+    tracer.add_listener(JsonlExporter(
+        _get_trace_path(),
+        max_bytes=config.tracing.max_file_mb * 1024 * 1024,
+        backup_count=config.tracing.backup_count,
+    ))
+
+
 # ============================================================================
 # Gateway / Server
 # ============================================================================
@@ -171,7 +213,7 @@ def _make_provider(config):
 
 @app.command()
 def gateway(
-    port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
+    port: int = typer.Option(None, "--port", "-p", help="Gateway port (default: gateway.port from config)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """Start the nanobot gateway."""
@@ -180,18 +222,36 @@ def gateway(
     from nanobot.agent.loop import AgentLoop
     from nanobot.channels.manager import ChannelManager
     from nanobot.cron.service import CronService
-    from nanobot.cron.types import CronJob
+    from nanobot.cron.types import CronJob, CronSchedule
     from nanobot.heartbeat.service import HeartbeatService
     
     if verbose:
         import logging
         logging.basicConfig(level=logging.DEBUG)
     
+    config = load_config()
+    port = port or config.gateway.port
+    
     console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
     
-    config = load_config()
-    bus = MessageBus()
+    bus = MessageBus(
+        coalesce_window_s=config.channels.coalesce_window_ms / 1000,
+        coalesce_max_hold_s=config.channels.coalesce_max_hold_ms / 1000,
+        lane_capacity={
+            "interactive": config.queue.interactive_capacity,
+            "system": config.queue.system_capacity,
+            "cron": config.queue.cron_capacity,
+            "heartbeat": config.queue.heartbeat_capacity,
+        },
+        lane_max_age_s={
+            "interactive": config.queue.interactive_slo_s,
+            "cron": config.queue.cron_max_age_s,
+            "heartbeat": config.queue.heartbeat_max_age_s,
+        },
+        shed_policy=config.queue.shed_policy,
+    )
     provider = _make_provider(config)
+    _setup_tracing(config)
     
     # Create cron service first (callback set after agent creation)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
@@ -208,16 +268,36 @@ def gateway(
         exec_config=config.tools.exec,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        max_parallel_tools=config.tools.max_parallel_calls,
+        artifact_threshold=config.tools.artifact_threshold,
+        select_tools=config.tools.select_tools,
+        skills_cache=config.agents.defaults.skills_cache,
+        skill_top_k=config.agents.defaults.skill_top_k,
+        skill_preload_score=config.agents.defaults.skill_preload_score,
+        image_max_edge=config.agents.defaults.image_max_edge,
+        memory_top_k=config.agents.defaults.memory_top_k,
+        memory_keep_days=config.agents.defaults.memory_keep_days,
+        memory_target_tokens=config.agents.defaults.memory_target_tokens,
+        stream=config.agents.defaults.stream,
+        interrupt_turns=config.agents.defaults.interrupt_turns,
+        stop_words=config.agents.defaults.stop_words,
+        context_window=config.agents.defaults.context_window or None,
+        compact_threshold=config.agents.defaults.compact_threshold,
+        compact_keep_recent=config.agents.defaults.compact_keep_recent,
     )
     
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
         """Execute a cron job through the agent."""
+        if job.payload.kind == "memory_consolidation":
+            return await agent.consolidate_memory()
         response = await agent.process_direct(
             job.payload.message,
             session_key=f"cron:{job.id}",
             channel=job.payload.channel or "cli",
             chat_id=job.payload.to or "direct",
+            lane="cron",
         )
         if job.payload.deliver and job.payload.to:
             from nanobot.bus.events import OutboundMessage
@@ -229,10 +309,18 @@ def gateway(
         return response
     cron.on_job = on_cron_job
     
+    # Built-in job that keeps MEMORY.md bounded
+    consolidate_cron = config.agents.defaults.memory_consolidate_cron
+    cron.ensure_builtin_job(
+        "memory_consolidation",
+        "Consolidate memory",
+        CronSchedule(kind="cron", expr=consolidate_cron) if consolidate_cron else None,
+    )
+    
     # Create heartbeat service
     async def on_heartbeat(prompt: str) -> str:
         """Execute heartbeat through the agent."""
-        return await agent.process_direct(prompt, session_key="heartbeat")
+        return await agent.process_direct(prompt, session_key="heartbeat", lane="heartbeat")
     
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
@@ -255,8 +343,25 @@ def gateway(
     
     console.print(f"[green]✓[/green] Heartbeat: every 30m")
     
+    # Metrics are derived from tracing spans plus live queue/subagent gauges
+    metrics_server = None
+    if config.gateway.metrics:
+        from nanobot.metrics import AgentMetrics, MetricsServer
+        from nanobot.tracing import tracer
+        metrics = AgentMetrics()
+        metrics.bind(
+            inbound_size=lambda: bus.inbound_size,
+            outbound_size=lambda: bus.outbound_size,
+            running_subagents=agent.subagents.get_running_count,
+        )
+        tracer.add_listener(metrics)
+        metrics_server = MetricsServer(metrics.registry, host=config.gateway.host, port=port)
+        console.print(f"[green]✓[/green] Metrics: http://{config.gateway.host}:{port}/metrics")
+    
     async def run():
         try:
+            if metrics_server:
+                await metrics_server.start()
             await cron.start()
             await heartbeat.start()
             await asyncio.gather(
@@ -269,6 +374,8 @@ def gateway(
             cron.stop()
             agent.stop()
             await channels.stop_all()
+            if metrics_server:
+                await metrics_server.stop()
     
     asyncio.run(run())
 
@@ -294,6 +401,7 @@ def agent(
     
     bus = MessageBus()
     provider = _make_provider(config)
+    _setup_tracing(config)
     
     agent_loop = AgentLoop(
         bus=bus,
@@ -302,6 +410,19 @@ def agent(
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        max_parallel_tools=config.tools.max_parallel_calls,
+        artifact_threshold=config.tools.artifact_threshold,
+        select_tools=config.tools.select_tools,
+        skills_cache=config.agents.defaults.skills_cache,
+        skill_top_k=config.agents.defaults.skill_top_k,
+        skill_preload_score=config.agents.defaults.skill_preload_score,
+        image_max_edge=config.agents.defaults.image_max_edge,
+        memory_top_k=config.agents.defaults.memory_top_k,
+        memory_keep_days=config.agents.defaults.memory_keep_days,
+        memory_target_tokens=config.agents.defaults.memory_target_tokens,
+        context_window=config.agents.defaults.context_window or None,
+        compact_threshold=config.agents.defaults.compact_threshold,
+        compact_keep_recent=config.agents.defaults.compact_keep_recent,
     )
     
     if message:
@@ -612,6 +733,181 @@ def cron_run(
         console.print(f"[red]Failed to run job {job_id}[/red]")
 
 
+# ============================================================================
+# Trace Commands
+# ============================================================================
+
+
+@app.command()
+def trace(
+    trace_id: str = typer.Argument(None, help="Show only this trace (ID prefix)"),
+    last: int = typer.Option(5, "--last", "-n", help="Number of recent turns to show"),
+    stats_only: bool = typer.Option(False, "--stats", "-s", help="Only show per-stage statistics"),
+):
+    """Show recent turn waterfalls and latency by stage."""
+    from nanobot.tracing import read_spans
+    from nanobot.tracing.report import group_traces, span_depths, stage_label, stage_stats
+    
+    spans = list(read_spans(_get_trace_path()))
+    if not spans:
+        console.print("No traces recorded yet.")
+        return
+    
+    traces = group_traces(spans)
+    if trace_id:
+        traces = {tid: t for tid, t in traces.items() if tid.startswith(trace_id)}
+        if not traces:
+            console.print(f"[red]Trace {trace_id} not found[/red]")
+            raise typer.Exit(1)
+    
+    if not stats_only:
+        recent = sorted(traces.values(), key=lambda t: t[0]["start"])[-last:]
+        for spans_of_trace in recent:
+            _print_waterfall(spans_of_trace, span_depths(spans_of_trace), stage_label)
+    
+    table = Table(title=f"Latency by Stage ({len(traces)} traces)")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Count", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    table.add_column("Cost $", justify="right")
+    for row in stage_stats(s for t in traces.values() for s in t):
+        table.add_row(
+            row["stage"], str(row["count"]),
+            f"{row['p50']:.1f}", f"{row['p95']:.1f}", f"{row['max']:.1f}",
+            f"{row['cost']:.4f}" if row["cost"] else "",
+        )
+    console.print(table)
+
+
+def _print_waterfall(spans, depths, label) -> None:
+    """Print one trace as an indented waterfall of span bars."""
+    import time
+    
+    width = 40
+    start = min(s["start"] for s in spans)
+    end = max(s["start"] + s["duration_ms"] / 1000 for s in spans)
+    total_ms = max((end - start) * 1000, 0.001)
+    
+    root = spans[0]
+    when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(root["start"]))
+    attrs = root.get("attributes", {})
+    header = f"[bold]{root['name']}[/bold] {root['trace_id'][:12]}  {when}  {total_ms:.0f} ms"
+    if "session" in attrs:
+        header += f"  {attrs['session']}"
+    if "queue_wait_ms" in attrs:
+        header += f"  (queued {attrs['queue_wait_ms']:.0f} ms)"
+    console.print(header)
+    
+    for s in spans:
+        offset = int((s["start"] - start) * 1000 / total_ms * width)
+        length = max(1, int(s["duration_ms"] / total_ms * width))
+        bar = " " * min(offset, width - 1) + "█" * min(length, width - offset)
+        name = "  " * depths.get(s["span_id"], 0) + label(s)
+        color = "red" if s.get("status") != "ok" else "green"
+        console.print(f"  {name:<36} [{color}]{bar:<{width}}[/{color}] {s['duration_ms']:>9.1f} ms")
+    console.print()
+
+
+# ============================================================================
+# Benchmark Commands
+# ============================================================================
+
+
+bench_app = typer.Typer(help="Record and replay offline agent benchmarks")
+app.add_typer(bench_app, name="bench")
+
+
+def _bench_options(config) -> dict:
+    """AgentLoop options for benchmarks (recording and replay must use the same)."""
+    return dict(
+        max_iterations=config.agents.defaults.max_tool_iterations,
+        exec_config=config.tools.exec,
+        max_parallel_tools=config.tools.max_parallel_calls,
+        artifact_threshold=config.tools.artifact_threshold,
+        select_tools=config.tools.select_tools,
+        skill_top_k=config.agents.defaults.skill_top_k,
+        skill_preload_score=config.agents.defaults.skill_preload_score,
+        image_max_edge=config.agents.defaults.image_max_edge,
+        memory_top_k=config.agents.defaults.memory_top_k,
+        memory_keep_days=config.agents.defaults.memory_keep_days,
+        memory_target_tokens=config.agents.defaults.memory_target_tokens,
+        context_window=config.agents.defaults.context_window or None,
+        compact_threshold=config.agents.defaults.compact_threshold,
+        compact_keep_recent=config.agents.defaults.compact_keep_recent,
+    )
+
+
+@bench_app.command("record")
+def bench_record(
+    scenario_path: Path = typer.Argument(..., help="Scenario JSON file"),
+):
+    """Run a scenario against the configured LLM and record its cassette."""
+    from nanobot.config.loader import load_config
+    from nanobot.bench import Scenario, record
+    
+    config = load_config()
+    scenario = Scenario.load(scenario_path)
+    result = asyncio.run(record(scenario, _make_provider(config), **_bench_options(config)))
+    console.print(
+        f"[green]✓[/green] Recorded {scenario.name} ({len(result.responses)} steps, "
+        f"{result.wall_s:.1f}s) to {scenario.cassette_path}"
+    )
+
+
+@bench_app.command("run")
+def bench_run(
+    scenario_paths: list[Path] = typer.Argument(..., help="Scenario JSON files with recorded cassettes"),
+    repeat: int = typer.Option(3, "--repeat", "-r", help="Timed runs per scenario"),
+    strict: bool = typer.Option(False, "--strict", help="Fail requests that were not recorded exactly"),
+    realtime: bool = typer.Option(False, "--realtime", help="Replay the recorded LLM latency"),
+):
+    """Replay recorded scenarios offline and report timings, allocations and prompt sizes."""
+    from nanobot.config.loader import load_config
+    from nanobot.bench import Scenario, benchmark
+    from nanobot.tracing.report import percentile, stage_stats
+    
+    config = load_config()
+    for path in scenario_paths:
+        scenario = Scenario.load(path)
+        try:
+            report = asyncio.run(benchmark(
+                scenario, repeat=repeat, strict=strict, realtime=realtime, **_bench_options(config)
+            ))
+        except FileNotFoundError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(1)
+        
+        prompts = report.prompt_tokens or [0]
+        console.print(f"\n[bold]{report.scenario}[/bold]")
+        console.print(
+            f"  Wall time: min {min(report.wall_s) * 1000:.1f} ms, "
+            f"median {percentile(report.wall_s, 50) * 1000:.1f} ms over {len(report.wall_s)} runs"
+        )
+        console.print(f"  Memory: peak {report.peak_kib:.0f} KiB, retained {report.retained_kib:.0f} KiB")
+        console.print(
+            f"  Prompts: {len(report.prompt_tokens)} calls, ~{sum(prompts) / len(prompts):.0f} tokens avg, "
+            f"~{max(prompts)} max, ~{sum(prompts)} total"
+        )
+        console.print(
+            f"  Replay: {report.hits} exact, {report.fallbacks} by shape, {report.misses} missing"
+        )
+        
+        table = Table(title="Stages (all runs)")
+        table.add_column("Stage", style="cyan")
+        table.add_column("Count", justify="right")
+        table.add_column("p50 ms", justify="right")
+        table.add_column("p95 ms", justify="right")
+        table.add_column("Max ms", justify="right")
+        for row in stage_stats(report.spans):
+            table.add_row(
+                row["stage"], str(row["count"]),
+                f"{row['p50']:.2f}", f"{row['p95']:.2f}", f"{row['max']:.2f}",
+            )
+        console.print(table)
+
+
 # ============================================================================
 # Status Commands
 # ============================================================================
@@ -652,6 +948,12 @@ def status():
         vllm_status = f"[green]✓ {config.providers.vllm.api_base}[/green]" if has_vllm else "[dim]not set[/dim]"
         console.print(f"vLLM/Local: {vllm_status}")
 
+        from nanobot.session.manager import SessionManager
+
+        counts = SessionManager(workspace).count_sessions()
+        by_channel = ", ".join(f"{channel}: {n}" for channel, n in counts.items())
+        console.print(f"Sessions: {sum(counts.values())}" + (f" ({by_channel})" if by_channel else ""))
+
 
 if __name__ == "__main__":
     app()
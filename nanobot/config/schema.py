@@ -39,12 +39,29 @@ class DiscordConfig(BaseModel):
     intents: int = 37377  # GUILDS + GUILD_MESSAGES + DIRECT_MESSAGES + MESSAGE_CONTENT
 
 
+class LoadGenConfig(BaseModel):
+    """Synthetic load generator channel (for gateway throughput tests)."""
+    enabled: bool = False
+    sessions: int = Field(default=10, ge=1)  # Simulated chats
+    rate: float = Field(default=1.0, gt=0)  # Mean messages per second over all chats (Poisson arrivals)
+    duration_s: float = 60.0  # Stop sending after this long (0 = until the gateway stops)
+    message_chars: int = 200  # Mean message length
+    size_distribution: str = "lognormal"  # "fixed", "uniform" (0.5-1.5x mean) or "lognormal"
+    media_ratio: float = 0.0  # Fraction of messages with an image attached
+    media_path: str = ""  # Image to attach; empty = a generated placeholder
+    report_interval_s: float = 10.0  # Log throughput and latency this often
+    seed: int | None = None  # Random seed for reproducible streams
+
+
 class ChannelsConfig(BaseModel):
     """Configuration for chat channels."""
+    coalesce_window_ms: int = 0  # Merge messages of one chat sent within this quiet window (0 = off)
+    coalesce_max_hold_ms: int = 5000  # Never hold the first message of a burst longer than this
     whatsapp: WhatsAppConfig = Field(default_factory=WhatsAppConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
     discord: DiscordConfig = Field(default_factory=DiscordConfig)
     feishu: FeishuConfig = Field(default_factory=FeishuConfig)
+    loadgen: LoadGenConfig = Field(default_factory=LoadGenConfig)
 
 
 class AgentDefaults(BaseModel):
@@ -54,11 +71,44 @@ class AgentDefaults(BaseModel):
     max_tokens: int = 8192
     temperature: float = 0.7
     max_tool_iterations: int = 20
+    max_concurrent_turns: int = 4  # Turns processed in parallel (same-session messages stay ordered)
+    stream: bool = True  # Stream partial responses to channels that support message edits
+    context_window: int = 0  # Input token budget; 0 = look up the model's window
+    compact_threshold: int = 60  # Unsummarized session messages that trigger a summary (0 = off)
+    compact_keep_recent: int = 20  # Newest messages kept verbatim next to the summary
+    interrupt_turns: bool = False  # A new message from the same sender cancels their running turn
+    stop_words: list[str] = Field(default_factory=lambda: ["stop", "cancel", "/stop"])  # Only cancel the running turn
+    skills_cache: bool = True  # Persist parsed skill metadata for a faster cold start
+    skill_top_k: int = 5  # Skills summarized per message, ranked by relevance (0 = list all)
+    skill_preload_score: float = 6.0  # Include ranked skills scoring at least this in full (0 = never)
+    memory_top_k: int = 6  # Memory chunks included per message, ranked by relevance (0 = all of MEMORY.md and today's notes)
+    memory_consolidate_cron: str = "0 4 * * *"  # When to fold old daily notes into MEMORY.md ("" = never)
+    memory_keep_days: int = 7  # Daily notes of this many recent days are not consolidated
+    memory_target_tokens: int = 2000  # Size limit for MEMORY.md after consolidation
+    image_max_edge: int = 1568  # Downscale image attachments to this longest side (0 = send originals; needs Pillow)
+
+
+class RouteConfig(BaseModel):
+    """Model policy for one workload class."""
+    model: str = ""  # Model for this workload; empty = agents.defaults.model
+    escalate_to: str = ""  # Retry on this model when the answer calls no tools and looks unsure
+
+
+class RoutesConfig(BaseModel):
+    """Model routing per workload class."""
+    interactive: RouteConfig = Field(default_factory=RouteConfig)  # Chat turns
+    announce: RouteConfig = Field(default_factory=RouteConfig)  # Summarizing subagent results
+    cron: RouteConfig = Field(default_factory=RouteConfig)  # Scheduled jobs
+    heartbeat: RouteConfig = Field(default_factory=RouteConfig)  # Periodic HEARTBEAT.md checks
+    subagent: RouteConfig = Field(default_factory=RouteConfig)  # Background subagent tasks
+    compaction: RouteConfig = Field(default_factory=RouteConfig)  # Session summaries
+    consolidation: RouteConfig = Field(default_factory=RouteConfig)  # Folding daily notes into MEMORY.md
 
 
 class AgentsConfig(BaseModel):
     """Agent configuration."""
     defaults: AgentDefaults = Field(default_factory=AgentDefaults)
+    routes: RoutesConfig = Field(default_factory=RoutesConfig)
 
 
 class ProviderConfig(BaseModel):
@@ -87,6 +137,7 @@ class GatewayConfig(BaseModel):
     """Gateway/server configuration."""
     host: str = "0.0.0.0"
     port: int = 18790
+    metrics: bool = True  # Serve Prometheus metrics at http://host:port/metrics
 
 
 class WebSearchConfig(BaseModel):
@@ -110,6 +161,28 @@ class ToolsConfig(BaseModel):
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
+    max_parallel_calls: int = 4  # Concurrent read-only tool calls per LLM response
+    artifact_threshold: int = 8000  # Tool results longer than this (chars) become paged artifacts (0 = off)
+    select_tools: bool = True  # Offer only the tools relevant to each message (the model can load the rest)
+
+
+class TracingConfig(BaseModel):
+    """Span tracing configuration (spans go to ~/.nanobot/traces/spans.jsonl)."""
+    enabled: bool = True
+    max_file_mb: int = 10  # Rotate the span file at this size
+    backup_count: int = 3  # Rotated span files to keep
+
+
+class QueueConfig(BaseModel):
+    """Inbound queue lanes: capacity, interactive SLO and load shedding."""
+    interactive_capacity: int = 200  # Queued chat messages before channels are slowed down
+    system_capacity: int = 100  # Queued subagent announcements before subagents are slowed down
+    cron_capacity: int = 20  # Queued cron jobs before new ones are dropped
+    heartbeat_capacity: int = 2  # Queued heartbeats before new ones are dropped
+    interactive_slo_s: float = 30.0  # Chat wait time above which cron/heartbeat work is shed (0 = off)
+    cron_max_age_s: float = 600.0  # Drop cron work that waited longer than this (0 = never)
+    heartbeat_max_age_s: float = 600.0  # Drop heartbeats that waited longer than this (0 = never)
+    shed_policy: str = "defer"  # "defer" (hold back) or "drop" cron/heartbeat work under load
 
 
 class Config(BaseSettings):
@@ -119,6 +192,8 @@ class Config(BaseSettings):
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
+    queue: QueueConfig = Field(default_factory=QueueConfig)
     
     @property
     def workspace_path(self) -> Path:
@@ -10,6 +10,7 @@ from typing import Any, Callable, Coroutine
 from loguru import logger
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from nanobot.tracing import tracer
 
 
 def _now_ms() -> int:
@@ -218,19 +219,26 @@ class CronService:
         start_ms = _now_ms()
         logger.info(f"Cron: executing job '{job.name}' ({job.id})")
         
-        try:
-            response = None
-            if self.on_job:
-                response = await self.on_job(job)
-            
-            job.state.last_status = "ok"
-            job.state.last_error = None
-            logger.info(f"Cron: job '{job.name}' completed")
-            
-        except Exception as e:
-            job.state.last_status = "error"
-            job.state.last_error = str(e)
-            logger.error(f"Cron: job '{job.name}' failed: {e}")
+        # Lag between the scheduled and the actual start (0 for manual runs)
+        scheduled_ms = job.state.next_run_at_ms
+        lag_ms = start_ms - scheduled_ms if scheduled_ms and scheduled_ms <= start_ms else 0
+        
+        with tracer.span("cron.job", new_trace=True, job_id=job.id, lag_ms=lag_ms) as span:
+            try:
+                response = None
+                if self.on_job:
+                    response = await self.on_job(job)
+                
+                job.state.last_status = "ok"
+                job.state.last_error = None
+                logger.info(f"Cron: job '{job.name}' completed")
+                
+            except Exception as e:
+                job.state.last_status = "error"
+                job.state.last_error = str(e)
+                span.status = "error"
+                span.error = str(e)
+                logger.error(f"Cron: job '{job.name}' failed: {e}")
         
         job.state.last_run_at_ms = start_ms
         job.updated_at_ms = _now_ms()
@@ -263,6 +271,7 @@ class CronService:
         channel: str | None = None,
         to: str | None = None,
         delete_after_run: bool = False,
+        kind: str = "agent_turn",
     ) -> CronJob:
         """Add a new job."""
         store = self._load_store()
@@ -274,7 +283,7 @@ class CronService:
             enabled=True,
             schedule=schedule,
             payload=CronPayload(
-                kind="agent_turn",
+                kind=kind,
                 message=message,
                 deliver=deliver,
                 channel=channel,
@@ -293,6 +302,28 @@ class CronService:
         logger.info(f"Cron: added job '{name}' ({job.id})")
         return job
     
+    def ensure_builtin_job(self, kind: str, name: str, schedule: CronSchedule | None) -> CronJob | None:
+        """
+        Keep exactly one job of a built-in payload kind, on the given schedule.
+        
+        Args:
+            kind: Payload kind handled by the job callback (e.g. "memory_consolidation").
+            name: Job name.
+            schedule: Desired schedule, or None to remove the job.
+        
+        Returns:
+            The job, or None if it was removed.
+        """
+        store = self._load_store()
+        existing = [j for j in store.jobs if j.payload.kind == kind]
+        if schedule and len(existing) == 1 and existing[0].schedule == schedule:
+            return existing[0]
+        for job in existing:
+            self.remove_job(job.id)
+        if not schedule:
+            return None
+        return self.add_job(name, schedule, message="", kind=kind)
+    
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
         store = self._load_store()
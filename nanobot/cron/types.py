@@ -21,7 +21,7 @@ class CronSchedule:
 @dataclass
 class CronPayload:
     """What to do when the job runs."""
-    kind: Literal["system_event", "agent_turn"] = "agent_turn"
+    kind: Literal["system_event", "agent_turn", "memory_consolidation"] = "agent_turn"
     message: str = ""
     # Deliver response to channel
     deliver: bool = False
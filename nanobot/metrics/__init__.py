@@ -0,0 +1,7 @@
+"""Prometheus metrics for the gateway."""
+
+from nanobot.metrics.recorder import AgentMetrics
+from nanobot.metrics.registry import Counter, Gauge, Histogram, MetricsRegistry
+from nanobot.metrics.server import MetricsServer
+
+__all__ = ["AgentMetrics", "MetricsRegistry", "MetricsServer", "Counter", "Gauge", "Histogram"]
@@ -0,0 +1,123 @@
+"""Agent metrics fed from tracing spans."""
+
+from typing import Callable
+
+from nanobot.metrics.registry import MetricsRegistry
+from nanobot.tracing import Span
+
+# Token usage keys reported by providers and their metric label
+_TOKEN_TYPES = {
+    "prompt_tokens": "prompt",
+    "completion_tokens": "completion",
+    "cache_read_tokens": "cache_read",
+    "cache_write_tokens": "cache_write",
+}
+
+
+class AgentMetrics:
+    """
+    Gateway metrics: queue depths, turn/LLM/tool latencies, token usage,
+    per-route LLM latency and cost, running subagents and cron lag.
+
+    Latencies and counts are derived from finished spans (register the
+    instance as a tracer listener); queue depths and running subagents are
+    read at scrape time.
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+
+        self.inbound_queue = r.gauge("nanobot_inbound_queue_size", "Inbound messages waiting for the agent.")
+        self.outbound_queue = r.gauge("nanobot_outbound_queue_size", "Outbound messages waiting for channels.")
+        self.subagents_running = r.gauge("nanobot_subagents_running", "Subagents currently running.")
+
+        self.turn_duration = r.histogram(
+            "nanobot_turn_duration_seconds", "Agent turn duration.", ("channel",)
+        )
+        self.turn_queue_wait = r.histogram(
+            "nanobot_turn_queue_wait_seconds", "Time from message receipt to turn start.", ("channel",)
+        )
+        self.turns = r.counter("nanobot_turns_total", "Agent turns processed.", ("channel", "status"))
+
+        self.llm_duration = r.histogram(
+            "nanobot_llm_request_duration_seconds", "LLM request duration.", ("model",)
+        )
+        self.llm_ttft = r.histogram(
+            "nanobot_llm_time_to_first_token_seconds", "Time to first streamed token.", ("model",)
+        )
+        self.llm_requests = r.counter(
+            "nanobot_llm_requests_total", "LLM requests by finish reason.", ("model", "finish_reason")
+        )
+        self.llm_tokens = r.counter("nanobot_llm_tokens_total", "LLM tokens used.", ("model", "type"))
+        self.route_duration = r.histogram(
+            "nanobot_llm_route_duration_seconds", "LLM request duration by workload route.", ("route",)
+        )
+        self.route_cost = r.counter(
+            "nanobot_llm_cost_usd_total", "Estimated LLM cost by workload route.", ("route", "model")
+        )
+        self.route_escalations = r.counter(
+            "nanobot_llm_escalations_total", "Requests retried on a larger model.", ("route",)
+        )
+
+        self.tool_duration = r.histogram(
+            "nanobot_tool_duration_seconds", "Tool execution duration.", ("tool",)
+        )
+        self.tool_calls = r.counter("nanobot_tool_calls_total", "Tool calls by outcome.", ("tool", "status"))
+
+        self.cron_lag = r.histogram(
+            "nanobot_cron_lag_seconds", "Delay between a cron job's scheduled and actual start."
+        )
+        self.cron_jobs = r.counter("nanobot_cron_jobs_total", "Cron jobs executed.", ("status",))
+
+        self.stage_duration = r.histogram(
+            "nanobot_stage_duration_seconds", "Duration of other traced stages.", ("stage",)
+        )
+
+    def bind(
+        self,
+        inbound_size: Callable[[], int],
+        outbound_size: Callable[[], int],
+        running_subagents: Callable[[], int],
+    ) -> None:
+        """Set the callbacks read at scrape time."""
+        self.inbound_queue.set_function(inbound_size)
+        self.outbound_queue.set_function(outbound_size)
+        self.subagents_running.set_function(running_subagents)
+
+    def __call__(self, span: Span) -> None:
+        """Record a finished span (tracer listener)."""
+        attrs = span.attributes
+        seconds = span.duration_ms / 1000
+
+        if span.name == "turn":
+            channel = attrs.get("channel", "unknown")
+            self.turn_duration.observe(seconds, channel=channel)
+            self.turn_queue_wait.observe(attrs.get("queue_wait_ms", 0) / 1000, channel=channel)
+            self.turns.inc(channel=channel, status=span.status)
+        elif span.name == "llm.chat":
+            model = attrs.get("model", "unknown")
+            self.llm_duration.observe(seconds, model=model)
+            if "ttft_ms" in attrs:
+                self.llm_ttft.observe(attrs["ttft_ms"] / 1000, model=model)
+            finish_reason = attrs.get("finish_reason", span.status)
+            self.llm_requests.inc(model=model, finish_reason=finish_reason)
+            for key, token_type in _TOKEN_TYPES.items():
+                if attrs.get(key):
+                    self.llm_tokens.inc(attrs[key], model=model, type=token_type)
+            route = attrs.get("route")
+            if route:
+                self.route_duration.observe(seconds, route=route)
+                if attrs.get("cost_usd"):
+                    self.route_cost.inc(attrs["cost_usd"], route=route, model=model)
+                if attrs.get("escalated"):
+                    self.route_escalations.inc(route=route)
+        elif span.name == "tool.execute":
+            tool = attrs.get("tool", "unknown")
+            self.tool_duration.observe(seconds, tool=tool)
+            self.tool_calls.inc(tool=tool, status=span.status)
+        elif span.name == "cron.job":
+            self.cron_lag.observe(max(attrs.get("lag_ms", 0), 0) / 1000)
+            self.cron_jobs.inc(status=span.status)
+        else:
+            self.stage_duration.observe(seconds, stage=span.name)
@@ -0,0 +1,77 @@
+"""Tiny asyncio HTTP server exposing metrics for Prometheus scrapes."""
+
+import asyncio
+
+from loguru import logger
+
+from nanobot.metrics.registry import MetricsRegistry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Give up on clients that don't send a request in time
+REQUEST_TIMEOUT_S = 10.0
+
+
+class MetricsServer:
+    """
+    Serves ``GET /metrics`` (Prometheus text format) and ``GET /health``.
+
+    Only what a scraper needs is implemented: one request per connection,
+    no request bodies.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "0.0.0.0", port: int = 18790):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Metrics server listening on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer a single HTTP request."""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT_S)
+            # Drain headers
+            while True:
+                line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT_S)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+            parts = request_line.decode("latin-1").split()
+            method, path = (parts[0], parts[1].split("?", 1)[0]) if len(parts) >= 2 else ("", "")
+
+            if method not in ("GET", "HEAD"):
+                status, body, content_type = "405 Method Not Allowed", "method not allowed\n", "text/plain"
+            elif path == "/metrics":
+                status, body, content_type = "200 OK", self.registry.render(), CONTENT_TYPE
+            elif path == "/health":
+                status, body, content_type = "200 OK", "ok\n", "text/plain"
+            else:
+                status, body, content_type = "404 Not Found", "not found\n", "text/plain"
+
+            payload = body.encode("utf-8")
+            head = (
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            writer.write(head if method == "HEAD" else head + payload)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.warning(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
@@ -1,6 +1,7 @@
 """LLM provider abstraction module."""
 
-from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk
 from nanobot.providers.litellm_provider import LiteLLMProvider
+from nanobot.providers.router import RoutePolicy, RoutingProvider
 
-__all__ = ["LLMProvider", "LLMResponse", "LiteLLMProvider"]
+__all__ = ["LLMProvider", "LLMResponse", "LLMStreamChunk", "LiteLLMProvider", "RoutePolicy", "RoutingProvider"]
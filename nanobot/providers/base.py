@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, AsyncIterator
 
 
 @dataclass
@@ -21,12 +21,31 @@ class LLMResponse:
     finish_reason: str = "stop"
     usage: dict[str, int] = field(default_factory=dict)
     
+    @property
+    def context_exceeded(self) -> bool:
+        """Check if the request failed because the prompt exceeded the context window."""
+        return self.finish_reason == "context_length"
+    
     @property
     def has_tool_calls(self) -> bool:
         """Check if response contains tool calls."""
         return len(self.tool_calls) > 0
 
 
+@dataclass
+class LLMStreamChunk:
+    """
+    One piece of a streamed LLM response.
+    
+    Intermediate chunks carry a content delta or a tool-call fragment
+    ({"index", "id"?, "name"?, "arguments"?}); the last chunk carries the
+    assembled response.
+    """
+    delta: str = ""
+    tool_call_delta: dict[str, Any] | None = None
+    response: LLMResponse | None = None
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -63,6 +82,54 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Stream a chat completion request.
+        
+        Providers without native streaming fall back to a single chunk
+        holding the complete response.
+        
+        Yields:
+            LLMStreamChunk items; the last one has ``response`` set.
+        """
+        response = await self.chat(messages, tools, model, max_tokens, temperature)
+        if response.content:
+            yield LLMStreamChunk(delta=response.content)
+        yield LLMStreamChunk(response=response)
+    
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        """
+        Count the tokens of a text for the given model.
+        
+        The default is a rough estimate (about 4 characters per token);
+        providers with access to a tokenizer should override it.
+        """
+        return len(text) // 4 + 1
+    
+    def get_context_window(self, model: str | None = None) -> int | None:
+        """Get the maximum input tokens of a model, or None if unknown."""
+        return None
+    
+    def estimate_cost(self, usage: dict[str, int], model: str | None = None) -> float | None:
+        """Estimate the USD cost of a call from its token usage, or None if unknown."""
+        return None
+    
+    def supports_prompt_caching(self, model: str | None = None) -> bool:
+        """
+        Check if the backend takes explicit prompt-cache breakpoints.
+        
+        When true, the agent sends the system prompt as separate stable and
+        volatile content blocks so the stable prefix can be cached.
+        """
+        return False
+    
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
@@ -0,0 +1,241 @@
+"""Recording and offline replay of LLM calls."""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import deque
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+# Request parts that differ between otherwise identical runs: wall-clock
+# times in the system prompt and random IDs (subagents, artifacts)
+_VOLATILE = (
+    (re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2})?(?: \(\w+\))?"), "<time>"),
+    (re.compile(r"\b[0-9a-f]{8,32}\b"), "<id>"),
+)
+
+
+class RequestKey:
+    """
+    Computes the replay key of a request.
+
+    Volatile parts (times, random IDs) and the given machine-specific paths
+    are scrubbed before hashing, so a cassette recorded in one workspace
+    replays in another.
+    """
+
+    def __init__(self, paths: dict[str, str] | None = None):
+        """
+        Args:
+            paths: Literal paths to replace, e.g. {"/tmp/x/workspace": "<workspace>"}.
+        """
+        # Longest first, so nested paths are replaced before their parents
+        self.paths = sorted((paths or {}).items(), key=lambda p: -len(p[0]))
+
+    def scrub(self, text: str) -> str:
+        """Replace paths and volatile values in a text."""
+        for path, placeholder in self.paths:
+            text = text.replace(path, placeholder)
+        for pattern, placeholder in _VOLATILE:
+            text = pattern.sub(placeholder, text)
+        return text
+
+    def __call__(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+    ) -> str:
+        """Hash a request."""
+        payload = json.dumps(
+            {"messages": messages, "tools": tools or [], "model": model},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(self.scrub(payload).encode("utf-8")).hexdigest()[:32]
+
+
+def request_shape(messages: list[dict[str, Any]]) -> str:
+    """
+    Describe a request coarsely, for replaying after prompt changes.
+
+    Two requests of the same turn step have the same number of messages and
+    end in the same role (and tool) even if their text differs.
+    """
+    last = messages[-1] if messages else {}
+    return f"{len(messages)}:{last.get('role', '')}:{last.get('name', '')}"
+
+
+def _response_from_dict(data: dict[str, Any]) -> LLMResponse:
+    return LLMResponse(
+        content=data.get("content"),
+        tool_calls=[ToolCallRequest(**tc) for tc in data.get("tool_calls", [])],
+        finish_reason=data.get("finish_reason", "stop"),
+        usage=data.get("usage", {}),
+    )
+
+
+class RecordingProvider(LLMProvider):
+    """
+    Passes calls through to a real provider and appends each request and
+    response to a cassette (JSONL) for later offline replay.
+    """
+
+    def __init__(self, provider: LLMProvider, path: Path, key: RequestKey | None = None):
+        """
+        Args:
+            provider: The provider that answers the calls.
+            path: Cassette file (truncated when recording starts).
+            key: Request key function (defaults to scrubbing volatile values only).
+        """
+        super().__init__(provider.api_key, provider.api_base)
+        self.provider = provider
+        self.path = path
+        self.key = key or RequestKey()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("", encoding="utf-8")
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Answer with the wrapped provider and record the exchange."""
+        started = time.monotonic()
+        response = await self.provider.chat(messages, tools, model, max_tokens, temperature)
+        entry = {
+            "key": self.key(messages, tools, model),
+            "shape": request_shape(messages),
+            "model": model,
+            "latency_ms": round((time.monotonic() - started) * 1000, 1),
+            # Replayed so the agent builds the same prompts offline
+            "context_window": self.provider.get_context_window(model),
+            "prompt_caching": self.provider.supports_prompt_caching(model),
+            "response": asdict(response),
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return response
+
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        return self.provider.count_tokens(text, model)
+
+    def get_context_window(self, model: str | None = None) -> int | None:
+        return self.provider.get_context_window(model)
+
+    def supports_prompt_caching(self, model: str | None = None) -> bool:
+        return self.provider.supports_prompt_caching(model)
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
+
+
+class ReplayProvider(LLMProvider):
+    """
+    Answers calls from a recorded cassette without network access.
+
+    Requests are matched by key. With ``strict`` off, a request whose key
+    was not recorded (e.g. because the prompt changed) gets the next unused
+    response recorded for a request of the same shape, so prompt changes
+    can still be benchmarked. Responses are returned at once unless
+    ``realtime`` replays the recorded latency.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        key: RequestKey | None = None,
+        strict: bool = False,
+        realtime: bool = False,
+        default_model: str | None = None,
+    ):
+        """
+        Args:
+            path: Cassette file written by RecordingProvider.
+            key: Request key function (must scrub like the recording's).
+            strict: Only replay exact key matches.
+            realtime: Sleep for the recorded latency of each response.
+            default_model: Model reported as default (defaults to the recorded one).
+        """
+        super().__init__()
+        self.key = key or RequestKey()
+        self.strict = strict
+        self.realtime = realtime
+        self.default_model = default_model
+        self._by_key: dict[str, deque[dict[str, Any]]] = {}
+        self._by_shape: dict[str, deque[dict[str, Any]]] = {}
+        self._context_window: int | None = None
+        self._prompt_caching = False
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            self._by_key.setdefault(entry["key"], deque()).append(entry)
+            self._by_shape.setdefault(entry["shape"], deque()).append(entry)
+            self._context_window = entry.get("context_window")
+            self._prompt_caching = entry.get("prompt_caching", False)
+            self.default_model = self.default_model or entry.get("model")
+        self.hits = 0
+        self.fallbacks = 0
+        self.misses = 0
+        # Estimated prompt tokens of every request, in call order
+        self.prompt_tokens: list[int] = []
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Return the recorded response for the request."""
+        self.prompt_tokens.append(self.count_tokens(json.dumps(messages) + json.dumps(tools or [])))
+        entry = self._take(self._by_key.get(self.key(messages, tools, model)))
+        if entry is not None:
+            self.hits += 1
+        elif not self.strict:
+            entry = self._take(self._by_shape.get(request_shape(messages)))
+            if entry is not None:
+                self.fallbacks += 1
+
+        if entry is None:
+            self.misses += 1
+            logger.warning(f"No recorded response for request ({request_shape(messages)})")
+            return LLMResponse(
+                content="Error calling LLM: no recorded response for this request",
+                finish_reason="error",
+            )
+
+        if self.realtime:
+            await asyncio.sleep(entry.get("latency_ms", 0) / 1000)
+        return _response_from_dict(entry["response"])
+
+    @staticmethod
+    def _take(entries: deque[dict[str, Any]] | None) -> dict[str, Any] | None:
+        """Pop the next entry not replayed yet (entries are shared between both indexes)."""
+        while entries:
+            entry = entries.popleft()
+            if not entry.get("_used"):
+                entry["_used"] = True
+                return entry
+        return None
+
+    def get_context_window(self, model: str | None = None) -> int | None:
+        return self._context_window
+
+    def supports_prompt_caching(self, model: str | None = None) -> bool:
+        return self._prompt_caching
+
+    def get_default_model(self) -> str:
+        return self.default_model or "replay"
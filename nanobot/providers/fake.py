@@ -0,0 +1,59 @@
+"""Offline provider with canned responses for load and throughput tests."""
+
+import asyncio
+import random
+from typing import Any
+
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+class FakeProvider(LLMProvider):
+    """
+    Answers every request after a simulated latency, without network access.
+    
+    Selected with the model name "fake" or "fake/<latency_ms>" (e.g.
+    "fake/800"). Latency varies by +-``jitter`` (a fraction) around the mean;
+    the reply has ``reply_chars`` characters and never calls tools, so a
+    turn costs exactly one LLM call.
+    """
+    
+    def __init__(
+        self,
+        default_model: str = "fake",
+        latency_ms: float | None = None,
+        jitter: float = 0.25,
+        reply_chars: int = 200,
+    ):
+        super().__init__()
+        self.default_model = default_model
+        if latency_ms is None:
+            _, _, suffix = default_model.partition("/")
+            latency_ms = float(suffix) if suffix.replace(".", "", 1).isdigit() else 500.0
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.reply_chars = reply_chars
+    
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Return a canned reply after the simulated latency."""
+        delay = self.latency_ms * random.uniform(1 - self.jitter, 1 + self.jitter)
+        await asyncio.sleep(max(delay, 0) / 1000)
+        prompt_chars = sum(len(str(m.get("content") or "")) for m in messages)
+        content = ("ok " * (self.reply_chars // 3 + 1))[:self.reply_chars]
+        return LLMResponse(
+            content=content,
+            usage={
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (prompt_chars + len(content)) // 4,
+            },
+        )
+    
+    def get_default_model(self) -> str:
+        return self.default_model
@@ -1,12 +1,22 @@
 """LiteLLM provider implementation for multi-provider support."""
 
+import json
 import os
-from typing import Any
+from typing import Any, AsyncIterator
 
 import litellm
 from litellm import acompletion
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk, ToolCallRequest
+
+# Error text fragments that indicate the prompt did not fit the context window
+_CONTEXT_OVERFLOW_MARKERS = (
+    "context_length_exceeded",
+    "maximum context length",
+    "context window",
+    "prompt is too long",
+    "too many tokens",
+)
 
 
 class LiteLLMProvider(LLMProvider):
@@ -97,6 +107,99 @@ class LiteLLMProvider(LLMProvider):
         Returns:
             LLMResponse with content and/or tool calls.
         """
+        kwargs = self._build_request(messages, tools, model, max_tokens, temperature)
+        
+        try:
+            response = await acompletion(**kwargs)
+            return self._parse_response(response)
+        except Exception as e:
+            # Return error as content for graceful handling
+            return self._error_response(e)
+    
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Stream a chat completion via LiteLLM.
+        
+        Yields content deltas and tool-call fragments as they arrive; the
+        final chunk carries the assembled LLMResponse.
+        """
+        kwargs = self._build_request(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+        
+        content_parts: list[str] = []
+        # Tool calls arrive as fragments keyed by index
+        tool_parts: dict[int, dict[str, str]] = {}
+        finish_reason = "stop"
+        usage: dict[str, int] = {}
+        
+        try:
+            stream = await acompletion(**kwargs)
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = self._parse_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                delta = choice.delta
+                if delta is None:
+                    continue
+                
+                if delta.content:
+                    content_parts.append(delta.content)
+                    yield LLMStreamChunk(delta=delta.content)
+                
+                for tc in getattr(delta, "tool_calls", None) or []:
+                    index = tc.index if tc.index is not None else len(tool_parts)
+                    part = tool_parts.setdefault(index, {"id": "", "name": "", "arguments": ""})
+                    fragment = {"index": index}
+                    if tc.id:
+                        part["id"] = tc.id
+                        fragment["id"] = tc.id
+                    if tc.function and tc.function.name:
+                        part["name"] += tc.function.name
+                        fragment["name"] = tc.function.name
+                    if tc.function and tc.function.arguments:
+                        part["arguments"] += tc.function.arguments
+                        fragment["arguments"] = tc.function.arguments
+                    yield LLMStreamChunk(tool_call_delta=fragment)
+        except Exception as e:
+            yield LLMStreamChunk(response=self._error_response(e))
+            return
+        
+        tool_calls = [
+            ToolCallRequest(
+                id=part["id"],
+                name=part["name"],
+                arguments=self._parse_arguments(part["arguments"] or "{}"),
+            )
+            for _, part in sorted(tool_parts.items())
+        ]
+        yield LLMStreamChunk(response=LLMResponse(
+            content="".join(content_parts) or None,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason,
+            usage=usage,
+        ))
+    
+    def _build_request(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build the LiteLLM completion kwargs (model prefixing, endpoint options)."""
         model = model or self.default_model
         
         # Auto-prefix model names for known providers
@@ -144,15 +247,58 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
         
-        try:
-            response = await acompletion(**kwargs)
-            return self._parse_response(response)
-        except Exception as e:
-            # Return error as content for graceful handling
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+        if self._uses_cache_control(model):
+            kwargs["messages"], kwargs["tools"] = self._apply_cache_control(messages, tools)
+            if not tools:
+                del kwargs["tools"]
+        
+        return kwargs
+    
+    def supports_prompt_caching(self, model: str | None = None) -> bool:
+        """Anthropic models take explicit cache-control breakpoints."""
+        return self._uses_cache_control(model or self.default_model)
+    
+    def _uses_cache_control(self, model: str) -> bool:
+        """Check if cache_control markers can be sent for the model."""
+        if self.is_aihubmix or self.is_vllm:
+            return False
+        model_lower = model.lower()
+        return "anthropic" in model_lower or "claude" in model_lower
+    
+    @staticmethod
+    def _apply_cache_control(
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
+        """
+        Add cache breakpoints to copies of the messages and tools.
+        
+        Breakpoints go on the last tool definition, the first (stable) block
+        of the system prompt and the last message, so repeated calls within a
+        tool loop and across turns reuse the cached prefix.
+        """
+        marker = {"type": "ephemeral"}
+        
+        def mark(message: dict[str, Any], first_block: bool) -> dict[str, Any]:
+            content = message.get("content")
+            if isinstance(content, str) and content:
+                blocks = [{"type": "text", "text": content}]
+            elif isinstance(content, list) and content:
+                blocks = [dict(block) for block in content]
+            else:
+                return message
+            blocks[0 if first_block else -1]["cache_control"] = marker
+            return {**message, "content": blocks}
+        
+        messages = list(messages)
+        if messages and messages[0].get("role") == "system":
+            messages[0] = mark(messages[0], first_block=True)
+        if len(messages) > 1 and messages[-1].get("role") in ("user", "tool"):
+            messages[-1] = mark(messages[-1], first_block=False)
+        
+        if tools:
+            tools = [*tools[:-1], {**tools[-1], "cache_control": marker}]
+        return messages, tools
     
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -163,13 +309,7 @@ class LiteLLMProvider(LLMProvider):
         if hasattr(message, "tool_calls") and message.tool_calls:
             for tc in message.tool_calls:
                 # Parse arguments from JSON string if needed
-                args = tc.function.arguments
-                if isinstance(args, str):
-                    import json
-                    try:
-                        args = json.loads(args)
-                    except json.JSONDecodeError:
-                        args = {"raw": args}
+                args = self._parse_arguments(tc.function.arguments)
                 
                 tool_calls.append(ToolCallRequest(
                     id=tc.id,
@@ -179,11 +319,7 @@ class LiteLLMProvider(LLMProvider):
         
         usage = {}
         if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+            usage = self._parse_usage(response.usage)
         
         return LLMResponse(
             content=message.content,
@@ -192,6 +328,73 @@ class LiteLLMProvider(LLMProvider):
             usage=usage,
         )
     
+    @staticmethod
+    def _error_response(error: Exception) -> LLMResponse:
+        """Wrap a request error; context overflows get finish_reason "context_length"."""
+        message = str(error)
+        overflow = isinstance(error, litellm.ContextWindowExceededError) or any(
+            marker in message.lower() for marker in _CONTEXT_OVERFLOW_MARKERS
+        )
+        return LLMResponse(
+            content=f"Error calling LLM: {message}",
+            finish_reason="context_length" if overflow else "error",
+        )
+    
+    @staticmethod
+    def _parse_arguments(args: Any) -> dict[str, Any]:
+        """Parse tool-call arguments from a JSON string if needed."""
+        if isinstance(args, str):
+            try:
+                return json.loads(args)
+            except json.JSONDecodeError:
+                return {"raw": args}
+        return args
+    
+    @staticmethod
+    def _parse_usage(usage: Any) -> dict[str, int]:
+        """Extract token counts (including prompt-cache reads/writes) from a LiteLLM usage object."""
+        cache_read = getattr(usage, "cache_read_input_tokens", None)
+        if cache_read is None:
+            # OpenAI-style automatic prefix caching
+            details = getattr(usage, "prompt_tokens_details", None)
+            cache_read = getattr(details, "cached_tokens", None)
+        return {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+            "cache_read_tokens": cache_read or 0,
+            "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+        }
+    
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        """Count tokens with the model's tokenizer (via LiteLLM), falling back to an estimate."""
+        try:
+            return litellm.token_counter(model=model or self.default_model, text=text)
+        except Exception:
+            return super().count_tokens(text, model)
+    
+    def get_context_window(self, model: str | None = None) -> int | None:
+        """Get the model's maximum input tokens from LiteLLM's model registry."""
+        try:
+            info = litellm.get_model_info(model or self.default_model)
+        except Exception:
+            return None
+        return info.get("max_input_tokens") or info.get("max_tokens")
+    
+    def estimate_cost(self, usage: dict[str, int], model: str | None = None) -> float | None:
+        """Estimate the cost of a call from LiteLLM's model price table."""
+        if not usage:
+            return None
+        try:
+            prompt_cost, completion_cost = litellm.cost_per_token(
+                model=model or self.default_model,
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+            )
+        except Exception:
+            return None
+        return prompt_cost + completion_cost
+    
     def get_default_model(self) -> str:
         """Get the default model."""
         return self.default_model
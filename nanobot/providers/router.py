@@ -0,0 +1,177 @@
+"""Per-workload model routing on top of the LLM providers."""
+
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk
+from nanobot.tracing import tracer
+
+# Workload classes: user chat, subagent result announcements, cron jobs,
+# heartbeat checks, subagent tasks, session summaries and memory consolidation
+ROUTES = ("interactive", "announce", "cron", "heartbeat", "subagent", "compaction", "consolidation")
+
+_route: ContextVar[str] = ContextVar("llm_route", default="interactive")
+
+# Phrases that mark a tool-less answer as a candidate for escalation
+_UNSURE = re.compile(
+    r"\b(i'?m not sure|i am not sure|not certain|i don'?t know|i do not know|"
+    r"i can'?t (?:help|determine|tell)|i cannot (?:help|determine|tell)|unable to)\b",
+    re.IGNORECASE,
+)
+
+
+def set_route(route: str) -> None:
+    """Set the workload class of LLM calls made by the current task."""
+    _route.set(route)
+
+
+def current_route() -> str:
+    """Get the workload class of the current task."""
+    return _route.get()
+
+
+@dataclass
+class RoutePolicy:
+    """Model choice for one workload class."""
+    model: str
+    escalate_to: str | None = None  # Retry on this model when the answer looks unsure
+
+
+def looks_unsure(response: LLMResponse) -> bool:
+    """Check if a response should be retried on a larger model."""
+    if response.finish_reason == "error":
+        return True
+    if response.has_tool_calls:
+        return False
+    return not (response.content or "").strip() or bool(_UNSURE.search(response.content))
+
+
+class RoutingProvider(LLMProvider):
+    """
+    Sends each LLM call to the model configured for its workload class.
+    
+    The route is read from a context variable set at the start of a turn,
+    subagent task or summary, so callers keep passing their usual model;
+    routes without a policy use the caller's model unchanged. A policy may
+    name a larger model to retry on when the first answer calls no tools
+    and looks unsure (streamed calls on such routes are answered in one
+    piece).
+    
+    The route, the model actually used, escalations and the estimated cost
+    are recorded on the enclosing "llm.chat" span.
+    """
+    
+    def __init__(
+        self,
+        default: LLMProvider,
+        policies: dict[str, RoutePolicy],
+        providers: dict[str, LLMProvider] | None = None,
+    ):
+        """
+        Args:
+            default: Provider for models without a dedicated one.
+            policies: Model policy per route.
+            providers: Providers by model, for models served by another backend.
+        """
+        super().__init__(default.api_key, default.api_base)
+        self.default = default
+        self.policies = policies
+        self.providers = providers or {}
+    
+    def _provider(self, model: str) -> LLMProvider:
+        return self.providers.get(model, self.default)
+    
+    def _policy(self) -> RoutePolicy | None:
+        return self.policies.get(current_route())
+    
+    def _resolve(self, model: str | None) -> str:
+        policy = self._policy()
+        return policy.model if policy else (model or self.default.get_default_model())
+    
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Send a chat request to the route's model, escalating if the policy says so."""
+        policy = self._policy()
+        model = self._resolve(model)
+        started = time.monotonic()
+        response = await self._provider(model).chat(messages, tools, model, max_tokens, temperature)
+        cost = self._cost(model, response)
+        
+        if policy and policy.escalate_to and looks_unsure(response):
+            logger.info(f"Route {current_route()}: escalating from {model} to {policy.escalate_to}")
+            model = policy.escalate_to
+            response = await self._provider(model).chat(messages, tools, model, max_tokens, temperature)
+            cost += self._cost(model, response)
+            self._record(model, cost, escalated=True)
+        else:
+            self._record(model, cost)
+        
+        logger.debug(f"Route {current_route()} -> {model} in {(time.monotonic() - started) * 1000:.0f} ms")
+        return response
+    
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Stream from the route's model (escalating routes answer in one chunk)."""
+        policy = self._policy()
+        if policy and policy.escalate_to:
+            async for chunk in super().chat_stream(messages, tools, model, max_tokens, temperature):
+                yield chunk
+            return
+        
+        model = self._resolve(model)
+        stream = self._provider(model).chat_stream(messages, tools, model, max_tokens, temperature)
+        async for chunk in stream:
+            if chunk.response is not None:
+                self._record(model, self._cost(model, chunk.response))
+            yield chunk
+    
+    def _cost(self, model: str, response: LLMResponse) -> float:
+        return self._provider(model).estimate_cost(response.usage, model) or 0.0
+    
+    @staticmethod
+    def _record(model: str, cost: float, escalated: bool = False) -> None:
+        """Attach routing details to the enclosing LLM span."""
+        span = tracer.current()
+        if span is None:
+            return
+        span.set(route=current_route(), model=model)
+        if cost:
+            span.set(cost_usd=round(cost, 6))
+        if escalated:
+            span.set(escalated=True)
+    
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        model = self._resolve(model)
+        return self._provider(model).count_tokens(text, model)
+    
+    def get_context_window(self, model: str | None = None) -> int | None:
+        model = self._resolve(model)
+        return self._provider(model).get_context_window(model)
+    
+    def supports_prompt_caching(self, model: str | None = None) -> bool:
+        model = self._resolve(model)
+        return self._provider(model).supports_prompt_caching(model)
+    
+    def estimate_cost(self, usage: dict[str, int], model: str | None = None) -> float | None:
+        model = model or self.default.get_default_model()
+        return self._provider(model).estimate_cost(usage, model)
+    
+    def get_default_model(self) -> str:
+        return self.default.get_default_model()
@@ -0,0 +1,124 @@
+"""SQLite index of session files for fast listing and partial loads."""
+
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+# A byte offset is recorded for every this many messages
+CHECKPOINT_EVERY = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    channel TEXT NOT NULL,
+    path TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT,
+    message_count INTEGER NOT NULL,
+    file_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    key TEXT NOT NULL,
+    message_index INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    PRIMARY KEY (key, message_index)
+);
+"""
+
+
+class SessionIndex:
+    """
+    Per-session summary rows plus byte offsets into the session files.
+
+    Kept up to date by SessionManager on every save, so listing sessions is
+    one query and a session can be loaded from the checkpoint before the
+    messages it needs instead of from the start of its file. The index is
+    only a cache: a row whose file size does not match the file on disk is
+    ignored and the file is read in full.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get the index row of a session."""
+        row = self._conn.execute("SELECT * FROM sessions WHERE key = ?", (key,)).fetchone()
+        return dict(row) if row else None
+
+    def checkpoint_before(self, key: str, message_index: int) -> tuple[int, int]:
+        """
+        Get the last checkpoint at or before a message.
+
+        Returns:
+            (message index, byte offset) to start reading at; (0, 0) if none.
+        """
+        row = self._conn.execute(
+            "SELECT message_index, offset FROM checkpoints WHERE key = ? AND message_index <= ? "
+            "ORDER BY message_index DESC LIMIT 1",
+            (key, message_index),
+        ).fetchone()
+        return (row["message_index"], row["offset"]) if row else (0, 0)
+
+    def update(
+        self,
+        key: str,
+        path: Path,
+        created_at: str,
+        updated_at: str,
+        message_count: int,
+        file_size: int,
+        checkpoints: list[tuple[int, int]],
+        replace: bool = False,
+    ) -> None:
+        """
+        Record a session's state after a save.
+
+        Args:
+            checkpoints: New (message index, byte offset) pairs.
+            replace: Drop the existing checkpoints first (the file was rewritten).
+        """
+        try:
+            with self._conn:
+                if replace:
+                    self._conn.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, key.split(":", 1)[0], str(path), created_at, updated_at, message_count, file_size),
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?)",
+                    [(key, index, offset) for index, offset in checkpoints],
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update session index for {key}: {e}")
+
+    def remove(self, key: str) -> None:
+        """Drop a session from the index."""
+        with self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+
+    def paths(self) -> dict[str, str]:
+        """Get the session file of every indexed session, by key."""
+        return {row[0]: row[1] for row in self._conn.execute("SELECT key, path FROM sessions")}
+
+    def list(self) -> list[dict[str, Any]]:
+        """Get all sessions, most recently updated first."""
+        rows = self._conn.execute(
+            "SELECT key, created_at, updated_at, path, message_count FROM sessions "
+            "ORDER BY updated_at DESC"
+        )
+        return [dict(row) for row in rows]
+
+    def count_by_channel(self) -> dict[str, int]:
+        """Get the number of sessions per channel."""
+        rows = self._conn.execute("SELECT channel, COUNT(*) FROM sessions GROUP BY channel ORDER BY channel")
+        return {row[0]: row[1] for row in rows}
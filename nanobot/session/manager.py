@@ -1,6 +1,7 @@
 """Session management for conversation history."""
 
 import json
+import os
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -8,6 +9,8 @@ from typing import Any
 
 from loguru import logger
 
+from nanobot.session.index import CHECKPOINT_EVERY, SessionIndex
+from nanobot.tracing import tracer
 from nanobot.utils.helpers import ensure_dir, safe_filename
 
 
@@ -17,6 +20,12 @@ class Session:
     A conversation session.
     
     Stores messages in JSONL format for easy reading and persistence.
+    Messages are only ever appended (or all cleared), which lets the
+    manager persist just the new ones.
+    
+    A session may be loaded without its oldest messages: ``offset`` is the
+    number of messages before ``messages[0]``, so absolute positions (like
+    the summary's ``summarized_upto``) are ``offset + index``.
     """
     
     key: str  # channel:chat_id
@@ -24,6 +33,15 @@ class Session:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Messages not loaded from the start of the session file
+    offset: int = 0
+    # Loaded messages already in the session file; -1 = the file must be rewritten
+    saved_count: int = field(default=0, repr=False, compare=False)
+    
+    @property
+    def message_count(self) -> int:
+        """Total number of messages, including those not loaded."""
+        return self.offset + len(self.messages)
     
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -40,41 +58,94 @@ class Session:
         """
         Get message history for LLM context.
         
+        If older turns have been folded into a running summary (see
+        SessionCompactor), the summary comes first, followed by the
+        messages after it.
+        
         Args:
-            max_messages: Maximum messages to return.
+            max_messages: Maximum messages to return (excluding the summary).
         
         Returns:
             List of messages in LLM format.
         """
-        # Get recent messages
-        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
+        # Get recent messages not yet covered by the summary
+        start = max(0, self.metadata.get("summarized_upto", 0) - self.offset)
+        unsummarized = self.messages[start:]
+        recent = unsummarized[-max_messages:] if len(unsummarized) > max_messages else unsummarized
         
         # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
+        history = [{"role": m["role"], "content": m["content"]} for m in recent]
+        
+        summary = self.metadata.get("summary")
+        if summary:
+            history.insert(0, {"role": "system", "content": f"## Summary of Earlier Conversation\n\n{summary}"})
+        return history
     
     def clear(self) -> None:
         """Clear all messages in the session."""
         self.messages = []
+        self.offset = 0
+        self.metadata.pop("summary", None)
+        self.metadata.pop("summarized_upto", None)
         self.updated_at = datetime.now()
+        self.saved_count = -1
 
 
 class SessionManager:
     """
     Manages conversation sessions.
     
-    Sessions are stored as JSONL files in the sessions directory.
+    Each session is an append-only JSONL file of messages plus a small
+    ``.meta.json`` sidecar (timestamps, metadata such as the summary). A
+    save appends only the messages added since the last one and replaces
+    the sidecar atomically, so its cost does not grow with the session.
+    
+    The message file is rewritten in full (to a temp file, then renamed)
+    only when needed: after ``Session.clear``, for files in the old
+    single-file format, or when the last line was left incomplete by a
+    crash (the loader skips such a line).
+    
+    A SQLite index (see SessionIndex) holds one row per session with byte
+    offsets into its file. Listing sessions is a single query, and with
+    ``tail_messages`` set a session is loaded from the checkpoint before
+    the messages its history needs rather than from the start.
     """
     
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        sessions_dir: Path | None = None,
+        tail_messages: int | None = None,
+        keep_unsummarized: bool = False,
+    ):
+        """
+        Args:
+            workspace: Agent workspace.
+            sessions_dir: Directory of the session files and their index
+                (defaults to ~/.nanobot/sessions).
+            tail_messages: Load only this many of the newest messages; None
+                loads everything.
+            keep_unsummarized: Also load the messages after the rolling
+                summary that are older than the tail (for compaction).
+        """
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
+        self.sessions_dir = ensure_dir(sessions_dir or Path.home() / ".nanobot" / "sessions")
+        self.tail_messages = tail_messages
+        self.keep_unsummarized = keep_unsummarized
         self._cache: dict[str, Session] = {}
+        self.index = SessionIndex(self.sessions_dir / "index.sqlite3")
+        self._sync_index()
     
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
         safe_key = safe_filename(key.replace(":", "_"))
         return self.sessions_dir / f"{safe_key}.jsonl"
     
+    @staticmethod
+    def _get_meta_path(path: Path) -> Path:
+        """Get the metadata sidecar of a session file."""
+        return path.with_suffix(".meta.json")
+    
     def get_or_create(self, key: str) -> Session:
         """
         Get an existing session or create a new one.
@@ -98,61 +169,217 @@ class SessionManager:
         return session
     
     def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
+        """Load a session from disk (only its tail, if the index allows)."""
         path = self._get_session_path(key)
         
         if not path.exists():
             return None
         
         try:
-            messages = []
-            metadata = {}
-            created_at = None
+            meta = self._read_meta(path)
+            metadata = meta.get("metadata", {})
+            
+            # Start at the checkpoint before the first message needed, if the
+            # index describes the file exactly as it is on disk
+            start_index, start_offset = 0, 0
+            row = self.index.get(key)
+            if self.tail_messages and row and row["file_size"] == path.stat().st_size and "key" in meta:
+                needed = row["message_count"] - self.tail_messages
+                if self.keep_unsummarized and "summarized_upto" in metadata:
+                    needed = min(needed, metadata["summarized_upto"])
+                start_index, start_offset = self.index.checkpoint_before(key, max(0, needed))
             
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    data = json.loads(line)
-                    
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                    else:
-                        messages.append(data)
+            messages, legacy, rewrite = self._read_messages(path, start_offset)
+            if legacy and "key" not in meta:
+                meta = legacy
+                metadata = meta.get("metadata", {})
+            created_at = meta.get("created_at")
+            updated_at = meta.get("updated_at")
             
             return Session(
                 key=key,
                 messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata
+                created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+                updated_at=datetime.fromisoformat(updated_at) if updated_at else datetime.now(),
+                metadata=metadata,
+                offset=start_index,
+                saved_count=-1 if rewrite else len(messages),
             )
         except Exception as e:
             logger.warning(f"Failed to load session {key}: {e}")
             return None
     
+    def _read_meta(self, path: Path) -> dict[str, Any]:
+        """Read a session's metadata sidecar (empty if there is none)."""
+        meta_path = self._get_meta_path(path)
+        if not meta_path.exists():
+            return {}
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    
+    @staticmethod
+    def _read_messages(path: Path, offset: int = 0) -> tuple[list[dict[str, Any]], dict[str, Any], bool]:
+        """
+        Read the messages of a session file from a byte offset.
+        
+        Returns:
+            The messages, the metadata line of an old-format file (or {}),
+            and whether the file must be rewritten before appending to it.
+        """
+        with open(path, "rb") as f:
+            f.seek(offset)
+            content = f.read().decode("utf-8")
+        # Appending needs the file to end with a complete line
+        rewrite = bool(content) and not content.endswith("\n")
+        lines = content.split("\n")
+        
+        messages = []
+        legacy: dict[str, Any] = {}
+        for i, line in enumerate(lines):
+            line = line.strip()
+            if not line:
+                continue
+            
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                if i == len(lines) - 1:
+                    # Last write was cut short by a crash
+                    logger.warning(f"Session file {path.name}: skipping incomplete last line")
+                    rewrite = True
+                    continue
+                raise
+            
+            if data.get("_type") == "metadata":
+                # Old format: metadata as the first line of the session file
+                legacy = data
+                rewrite = True
+            else:
+                messages.append(data)
+        return messages, legacy, rewrite
+    
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
+        """Save a session to disk (appending the messages added since the last save)."""
         path = self._get_session_path(session.key)
         
-        with open(path, "w") as f:
-            # Write metadata first
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata
-            }
-            f.write(json.dumps(metadata_line) + "\n")
+        with tracer.span("session.save", messages=session.message_count) as span:
+            saved = session.saved_count
+            rewrite = saved < 0 or saved > len(session.messages) or (saved > 0 and not path.exists())
+            if rewrite:
+                # Only reachable for fully loaded sessions (clear resets the offset)
+                checkpoints, size = self._rewrite(path, session.messages)
+                span.set(rewritten=True)
+            else:
+                new = session.messages[saved:]
+                size = path.stat().st_size if path.exists() else 0
+                checkpoints, data = self._encode(new, session.offset + saved, size)
+                if new:
+                    # One write call, so a crash leaves at most one incomplete line
+                    with open(path, "ab") as f:
+                        f.write(data)
+                    size += len(data)
+                span.set(appended=len(new))
+            session.saved_count = len(session.messages)
             
-            # Write messages
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
+            self._write_meta(path, session)
+            self.index.update(
+                session.key,
+                path,
+                created_at=session.created_at.isoformat(),
+                updated_at=session.updated_at.isoformat(),
+                message_count=session.message_count,
+                file_size=size,
+                checkpoints=checkpoints,
+                replace=rewrite,
+            )
         
         self._cache[session.key] = session
     
+    @staticmethod
+    def _encode(
+        messages: list[dict[str, Any]],
+        first_index: int,
+        first_offset: int,
+    ) -> tuple[list[tuple[int, int]], bytes]:
+        """
+        Serialize messages as JSONL.
+        
+        Returns:
+            The (message index, byte offset) checkpoints among them and the data.
+        """
+        checkpoints = []
+        lines = []
+        offset = first_offset
+        for i, msg in enumerate(messages, start=first_index):
+            line = (json.dumps(msg) + "\n").encode("utf-8")
+            if i % CHECKPOINT_EVERY == 0:
+                checkpoints.append((i, offset))
+            lines.append(line)
+            offset += len(line)
+        return checkpoints, b"".join(lines)
+    
+    def _rewrite(self, path: Path, messages: list[dict[str, Any]]) -> tuple[list[tuple[int, int]], int]:
+        """
+        Replace a session file with the given messages, atomically.
+        
+        Returns:
+            The checkpoints of the new file and its size.
+        """
+        checkpoints, data = self._encode(messages, 0, 0)
+        tmp = path.with_suffix(".jsonl.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return checkpoints, len(data)
+    
+    def _write_meta(self, path: Path, session: Session) -> None:
+        """Replace the metadata sidecar of a session, atomically."""
+        meta_path = self._get_meta_path(path)
+        tmp = meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "key": session.key,
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "messages": session.message_count,
+            "metadata": session.metadata,
+        }), encoding="utf-8")
+        os.replace(tmp, meta_path)
+    
+    def _sync_index(self) -> None:
+        """Index session files that are missing from the index and drop rows of deleted files."""
+        files = {str(p) for p in self.sessions_dir.glob("*.jsonl")}
+        indexed = self.index.paths()
+        for key, path in indexed.items():
+            if path not in files:
+                self.index.remove(key)
+        
+        missing = sorted(files - set(indexed.values()))
+        if missing:
+            logger.info(f"Indexing {len(missing)} session files")
+        for name in missing:
+            path = Path(name)
+            try:
+                messages, legacy, _ = self._read_messages(path)
+                meta = self._read_meta(path) or legacy
+                checkpoints, _ = self._encode(messages, 0, 0)
+                # Offsets are of the file as it is; for a legacy file they are
+                # dropped on its first save, which rewrites it
+                if legacy:
+                    checkpoints = []
+                self.index.update(
+                    meta.get("key") or path.stem.replace("_", ":"),
+                    path,
+                    created_at=meta.get("created_at"),
+                    updated_at=meta.get("updated_at"),
+                    message_count=len(messages),
+                    file_size=path.stat().st_size,
+                    checkpoints=checkpoints,
+                    replace=True,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to index session file {path.name}: {e}")
+    
     def delete(self, key: str) -> bool:
         """
         Delete a session.
@@ -163,11 +390,13 @@ class SessionManager:
         Returns:
             True if deleted, False if not found.
         """
-        # Remove from cache
+        # Remove from cache and index
         self._cache.pop(key, None)
+        self.index.remove(key)
         
-        # Remove file
+        # Remove files
         path = self._get_session_path(key)
+        self._get_meta_path(path).unlink(missing_ok=True)
         if path.exists():
             path.unlink()
             return True
@@ -178,25 +407,10 @@ class SessionManager:
         List all sessions.
         
         Returns:
-            List of session info dicts.
+            List of session info dicts (most recently updated first).
         """
-        sessions = []
-        
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path) as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            sessions.append({
-                                "key": path.stem.replace("_", ":"),
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
-                continue
-        
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+        return self.index.list()
+    
+    def count_sessions(self) -> dict[str, int]:
+        """Get the number of sessions per channel."""
+        return self.index.count_by_channel()
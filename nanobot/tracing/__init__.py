@@ -0,0 +1,6 @@
+"""Span tracing for agent turns."""
+
+from nanobot.tracing.exporter import JsonlExporter, read_spans
+from nanobot.tracing.tracer import Span, Tracer, tracer
+
+__all__ = ["Span", "Tracer", "tracer", "JsonlExporter", "read_spans"]
@@ -0,0 +1,83 @@
+"""Rotating JSONL export of finished spans."""
+
+import json
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from loguru import logger
+
+from nanobot.tracing.tracer import Span
+
+
+class JsonlExporter:
+    """
+    Appends finished spans to a JSONL file, one span per line.
+
+    When the file grows past ``max_bytes`` it is rotated to ``<name>.1``,
+    shifting older files up to ``backup_count``.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3):
+        """
+        Args:
+            path: Span file path (parent directories are created).
+            max_bytes: Size at which the file is rotated.
+            backup_count: Number of rotated files to keep.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file: TextIO | None = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, span: Span) -> None:
+        """Write a span (used as a tracer listener)."""
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            logger.warning(f"Failed to export span: {e}")
+
+    def close(self) -> None:
+        """Close the span file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        """Shift rotated files up by one and start a new span file."""
+        self.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                src.replace(self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backup_count > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+
+
+def read_spans(path: Path) -> Iterator[dict[str, Any]]:
+    """
+    Read exported spans, oldest file first, including rotated files.
+
+    Malformed lines (e.g. a partially written last line) are skipped.
+    """
+    rotated = sorted(
+        (p for p in path.parent.glob(f"{path.name}.*") if p.suffix[1:].isdigit()),
+        key=lambda p: int(p.suffix[1:]),
+        reverse=True,
+    )
+    for file in [*rotated, path]:
+        if not file.exists():
+            continue
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
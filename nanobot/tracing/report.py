@@ -0,0 +1,75 @@
+"""Aggregation of exported spans for the ``nanobot trace`` command."""
+
+from collections import defaultdict
+from typing import Any, Iterable
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Get the p-th percentile (0-100) of values by linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def group_traces(spans: Iterable[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    """Group spans by trace ID, each trace ordered by start time."""
+    traces: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for span in spans:
+        traces[span["trace_id"]].append(span)
+    for trace in traces.values():
+        trace.sort(key=lambda s: s["start"])
+    return dict(traces)
+
+
+def stage_label(span: dict[str, Any]) -> str:
+    """Get the stage a span is aggregated under (tools are split by name, LLM calls by route)."""
+    attrs = span.get("attributes", {})
+    detail = attrs.get("tool") or attrs.get("route")
+    return f"{span['name']}:{detail}" if detail else span["name"]
+
+
+def stage_stats(spans: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Compute duration statistics per stage.
+
+    Returns:
+        One row per stage (count, p50, p95, max in ms, estimated cost in USD),
+        slowest p95 first.
+    """
+    durations: dict[str, list[float]] = defaultdict(list)
+    costs: dict[str, float] = defaultdict(float)
+    for span in spans:
+        stage = stage_label(span)
+        durations[stage].append(span["duration_ms"])
+        costs[stage] += span.get("attributes", {}).get("cost_usd", 0)
+    rows = [
+        {
+            "stage": stage,
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "max": max(values),
+            "cost": costs[stage],
+        }
+        for stage, values in durations.items()
+    ]
+    rows.sort(key=lambda r: r["p95"], reverse=True)
+    return rows
+
+
+def span_depths(trace: list[dict[str, Any]]) -> dict[str, int]:
+    """Get the nesting depth of each span in a trace (root spans are 0)."""
+    parents = {s["span_id"]: s.get("parent_id") for s in trace}
+    depths: dict[str, int] = {}
+    for span_id in parents:
+        depth, parent = 0, parents[span_id]
+        # Spans whose parent was not exported count as roots
+        while parent in parents and depth < len(parents):
+            depth += 1
+            parent = parents[parent]
+        depths[span_id] = depth
+    return depths
@@ -0,0 +1,126 @@
+"""Lightweight span tracing for agent turns."""
+
+import asyncio
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from loguru import logger
+
+
+@dataclass
+class Span:
+    """A timed unit of work within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    start: float = 0.0  # Unix time in seconds
+    duration_ms: float = 0.0
+    status: str = "ok"  # ok, error, cancelled
+    error: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        """Add or update attributes on the span."""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the span for export."""
+        data: dict[str, Any] = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+SpanListener = Callable[[Span], None]
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to listeners.
+
+    The current span is tracked in a ContextVar, so nesting follows the
+    call stack within a task, and tasks created inside a span inherit it
+    as their parent.
+    """
+
+    def __init__(self):
+        self._current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+        self._listeners: list[SpanListener] = []
+
+    def add_listener(self, listener: SpanListener) -> None:
+        """Register a callback invoked with every finished span."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: SpanListener) -> None:
+        """Unregister a span callback."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def current(self) -> Span | None:
+        """Get the innermost active span of the current context."""
+        return self._current.get()
+
+    @contextmanager
+    def span(self, name: str, new_trace: bool = False, **attributes: Any) -> Iterator[Span]:
+        """
+        Time a block of code as a span.
+
+        Args:
+            name: Span name (the stage shown by ``nanobot trace``).
+            new_trace: Start a new trace instead of nesting under the current span.
+            **attributes: Initial span attributes.
+
+        Yields:
+            The span, for adding attributes while it runs.
+        """
+        parent = None if new_trace else self._current.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            start=time.time(),
+            attributes=attributes,
+        )
+        token = self._current.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except asyncio.CancelledError:
+            span.status = "cancelled"
+            raise
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - started) * 1000
+            self._current.reset(token)
+            self._emit(span)
+
+    def _emit(self, span: Span) -> None:
+        """Pass a finished span to all listeners."""
+        for listener in self._listeners:
+            try:
+                listener(span)
+            except Exception as e:
+                logger.warning(f"Span listener failed: {e}")
+
+
+# Process-wide tracer used by the instrumented components
+tracer = Tracer()
@@ -0,0 +1,73 @@
+"""Lightweight lexical search (BM25) without external dependencies."""
+
+import math
+import re
+from collections import Counter
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Words too common to say anything about relevance
+STOPWORDS = frozenset(
+    "a an and are as at be but by can could do does for from have how i if in into is it "
+    "its me my no not of on or our please so that the their then there these this to "
+    "us was we what when where which who why will with would you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric terms, without stopwords."""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 ranking over a fixed set of documents.
+
+    Documents are given as term lists (see ``tokenize``); repeat a field's
+    terms to weight it higher (e.g. a title over a body).
+    """
+
+    def __init__(self, documents: list[list[str]], k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            documents: Tokenized documents.
+            k1: Term frequency saturation.
+            b: Document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self._tf = [Counter(doc) for doc in documents]
+        self._len = [len(doc) for doc in documents]
+        self._avg_len = sum(self._len) / len(documents) if documents else 0.0
+        df: Counter[str] = Counter()
+        for tf in self._tf:
+            df.update(tf.keys())
+        n = len(documents)
+        self._idf = {term: math.log(1 + (n - f + 0.5) / (f + 0.5)) for term, f in df.items()}
+
+    def __len__(self) -> int:
+        return len(self._tf)
+
+    def scores(self, query: list[str]) -> list[float]:
+        """Score every document against a tokenized query."""
+        terms = [t for t in set(query) if t in self._idf]
+        result = []
+        for tf, length in zip(self._tf, self._len):
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_len) if self._avg_len else self.k1
+            score = 0.0
+            for term in terms:
+                f = tf.get(term)
+                if f:
+                    score += self._idf[term] * f * (self.k1 + 1) / (f + norm)
+            result.append(score)
+        return result
+
+    def top(self, query: list[str], k: int) -> list[tuple[int, float]]:
+        """
+        Get the best matching documents.
+
+        Returns:
+            Up to k (document index, score) pairs with a positive score, best first.
+        """
+        ranked = sorted(enumerate(self.scores(query)), key=lambda p: -p[1])
+        return [(i, s) for i, s in ranked[:k] if s > 0]